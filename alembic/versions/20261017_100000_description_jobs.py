@@ -0,0 +1,46 @@
+"""Create description_jobs table
+
+Revision ID: 20261017_100000
+Revises: 20250904_185917
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_100000'
+down_revision = '20250904_185917'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create description_jobs table
+    op.create_table('description_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('basic_info', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+        sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP'), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    
+    # Create indexes
+    op.create_index('ix_description_jobs_product_id', 'description_jobs', ['product_id'], unique=False)
+    op.create_index('ix_description_jobs_status', 'description_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop indexes
+    op.drop_index('ix_description_jobs_status', table_name='description_jobs')
+    op.drop_index('ix_description_jobs_product_id', table_name='description_jobs')
+    
+    # Drop table
+    op.drop_table('description_jobs')
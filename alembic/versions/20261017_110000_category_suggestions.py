@@ -0,0 +1,32 @@
+"""Create category_suggestions table
+
+Revision ID: 20261017_110000
+Revises: 20261017_100000
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_110000'
+down_revision = '20261017_100000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create category_suggestions table
+    op.create_table('category_suggestions',
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('suggestions', sa.Text(), nullable=False),
+        sa.Column('item_count', sa.Integer(), nullable=False),
+        sa.Column('generated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('category')
+    )
+
+
+def downgrade() -> None:
+    # Drop table
+    op.drop_table('category_suggestions')
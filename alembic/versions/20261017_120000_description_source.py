@@ -0,0 +1,44 @@
+"""Add products.description_source
+
+Revision ID: 20261017_120000
+Revises: 20261017_110000
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261017_120000'
+down_revision = '20261017_110000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows are assumed to be AI generated...
+    op.add_column('products',
+        sa.Column('description_source', sa.String(length=20), nullable=False, server_default='manual')
+    )
+    op.create_index(op.f('ix_products_description_source'), 'products', ['description_source'], unique=False)
+    
+    # ...except those still holding the plain "{brand} {name} - {category}" fallback
+    products = sa.table('products',
+        sa.column('name', sa.String),
+        sa.column('category', sa.String),
+        sa.column('brand', sa.String),
+        sa.column('description', sa.Text),
+        sa.column('description_source', sa.String)
+    )
+    op.execute(products.update().values(description_source='ai'))
+    op.execute(
+        products.update()
+        .where(products.c.description == products.c.brand + ' ' + products.c.name + ' - ' + products.c.category)
+        .values(description_source='fallback')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_products_description_source'), table_name='products')
+    op.drop_column('products', 'description_source')
@@ -1,21 +1,42 @@
-from typing import List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import AbstractContextManager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+from datetime import datetime
 from decimal import Decimal
+import asyncio
 import logging
-from app.domain.entities import Product
-from app.infrastructure.database import ProductRepository
+from app.domain.entities import CategorySuggestions, DescriptionJob, Product
+from app.infrastructure.database import CategorySuggestionRepository, DescriptionJobRepository, ProductRepository
+from app.infrastructure.ai_services import count_suggestion_items
 from app.infrastructure.external_services import GeminiAIService
 from app.infrastructure.exceptions import AIGenerationError
 
 logger = logging.getLogger(__name__)
 
+# Generations that outlive their request's latency budget keep running here
+_background_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ai-description")
+_background_tasks: Set[asyncio.Task] = set()
+
+RepositoryScope = Callable[[], AbstractContextManager]
+
 class ProductService:
     def __init__(
         self,
         product_repo: ProductRepository,
-        ai_service: GeminiAIService
+        ai_service: GeminiAIService,
+        repository_scope: Optional[RepositoryScope] = None,
+        job_repo: Optional[DescriptionJobRepository] = None,
+        suggestion_repo: Optional[CategorySuggestionRepository] = None,
+        suggestion_revalidator: Optional[Callable[[CategorySuggestions], None]] = None
     ):
         self.product_repo = product_repo
         self.ai_service = ai_service
+        # Opens a repository with its own session for work that outlives the request
+        self.repository_scope = repository_scope
+        self.job_repo = job_repo
+        # Precomputed suggestions; the revalidator refreshes stale ones in the background
+        self.suggestion_repo = suggestion_repo
+        self.suggestion_revalidator = suggestion_revalidator
 
     def create_product(
         self, 
@@ -25,9 +46,15 @@ class ProductService:
         brand: str,
         stock_quantity: int = 0,
         basic_info: Optional[str] = None,
-        auto_generate_description: bool = True
+        auto_generate_description: bool = True,
+        latency_budget: Optional[float] = None
     ) -> Product:
-        """Crear un nuevo producto con descripción generada por Gemini AI"""
+        """Crear un nuevo producto con descripción generada por Gemini AI.
+        
+        Con latency_budget (segundos), si Gemini no responde a tiempo el producto se
+        guarda con la descripción de fallback y la generación sigue en segundo plano,
+        actualizando el producto cuando termina.
+        """
         
         # Check if product already exists
         existing_product = self.product_repo.find_by_name(name)
@@ -35,14 +62,15 @@ class ProductService:
             raise ValueError(f"Product '{name}' already exists")
         
         # Generate description
-        description = self._generate_description(
-            name, category, brand, basic_info, auto_generate_description
+        description, source, pending = self._generate_description_within_budget(
+            name, category, brand, basic_info, auto_generate_description, latency_budget
         )
         
         # Create product entity
         product = Product(
             name=name,
             description=description,
+            description_source=source,
             price=price,
             category=category,
             brand=brand,
@@ -54,7 +82,75 @@ class ProductService:
             raise ValueError("Product data is invalid")
         
         logger.info(f"Creating product: {name}")
-        return self.product_repo.save(product)
+        saved = self.product_repo.save(product)
+        if pending is not None:
+            pending.add_done_callback(
+                lambda future: self._apply_late_description(saved.id, description, future)
+            )
+        return saved
+    
+    def _generate_description_within_budget(
+        self,
+        name: str,
+        category: str,
+        brand: str,
+        basic_info: Optional[str],
+        auto_generate: bool,
+        latency_budget: Optional[float]
+    ) -> Tuple[str, str, Optional[Future]]:
+        """Generate a description waiting at most latency_budget seconds.
+        
+        Returns the description, its source and, if the budget expired, the still-running generation.
+        """
+        if latency_budget is None or not auto_generate or not self.ai_service.is_available():
+            return (*self._generate_description(name, category, brand, basic_info, auto_generate), None)
+        
+        fallback = basic_info or f"{brand} {name} - {category}"
+        logger.info(f"Generating AI description for: {name} (budget {latency_budget}s)")
+        future = _background_executor.submit(
+            self.ai_service.generate_product_description,
+            name=name,
+            category=category,
+            brand=brand,
+            basic_info=basic_info
+        )
+        try:
+            return future.result(timeout=latency_budget), Product.DESCRIPTION_AI, None
+        except FutureTimeoutError:
+            logger.warning(f"AI description for {name} exceeded {latency_budget}s, saving fallback")
+            self.ai_service.record_fallback("product_description")
+            return fallback, Product.DESCRIPTION_FALLBACK, future
+        except AIGenerationError as e:
+            logger.warning(f"AI generation failed for {name}: {e}")
+            return self._fallback_description(name, category, brand, basic_info), Product.DESCRIPTION_FALLBACK, None
+        except Exception as e:
+            logger.error(f"Unexpected error generating description for {name}: {e}")
+            return self._fallback_description(name, category, brand, basic_info), Product.DESCRIPTION_FALLBACK, None
+
+    def _apply_late_description(self, product_id: int, fallback: str, future: Future) -> None:
+        """Store a generation that finished after its request returned"""
+        try:
+            description = future.result()
+        except Exception as e:
+            logger.warning(f"Background AI description for product {product_id} failed: {e}")
+            return
+        
+        if self.repository_scope is None:
+            logger.warning(f"No repository scope configured, late description for product {product_id} dropped")
+            return
+        
+        try:
+            with self.repository_scope() as repo:
+                product = repo.find_by_id(product_id)
+                # Do not overwrite a description that was edited in the meantime
+                if product is None or product.description != fallback:
+                    return
+                product.description = description
+                product.description_source = Product.DESCRIPTION_AI
+                repo.save(product)
+                logger.info(f"Late AI description stored for product {product_id}")
+        except Exception as e:
+            logger.error(f"Failed to store late description for product {product_id}: {e}")
     
     def _generate_description(
         self, 
@@ -63,25 +159,352 @@ class ProductService:
         brand: str, 
         basic_info: Optional[str], 
         auto_generate: bool
-    ) -> str:
-        """Generate product description using AI or fallback"""
+    ) -> Tuple[str, str]:
+        """Generate product description using AI or fallback; returns (description, source)"""
+        if not auto_generate:
+            return basic_info or f"{brand} {name} - {category}", Product.DESCRIPTION_MANUAL
+        
+        if not self.ai_service.is_available():
+            logger.warning(f"AI service unavailable (circuit open), using fallback for {name}")
+            return self._fallback_description(name, category, brand, basic_info), Product.DESCRIPTION_FALLBACK
+        
+        try:
+            logger.info(f"Generating AI description for: {name}")
+            description = self.ai_service.generate_product_description(
+                name=name,
+                category=category,
+                brand=brand,
+                basic_info=basic_info
+            )
+            return description, Product.DESCRIPTION_AI
+        except AIGenerationError as e:
+            logger.warning(f"AI generation failed for {name}: {e}")
+            return self._fallback_description(name, category, brand, basic_info), Product.DESCRIPTION_FALLBACK
+        except Exception as e:
+            logger.error(f"Unexpected error generating description for {name}: {e}")
+            return self._fallback_description(name, category, brand, basic_info), Product.DESCRIPTION_FALLBACK
+
+    def _fallback_description(self, name: str, category: str, brand: str, basic_info: Optional[str]) -> str:
+        """Plain description used when AI generation was wanted but is not possible"""
+        self.ai_service.record_fallback("product_description")
+        return basic_info or f"{brand} {name} - {category}"
+
+    def create_products(
+        self,
+        products: List[Dict[str, Any]]
+    ) -> Tuple[List[Product], List[Dict[str, Any]]]:
+        """Crear varios productos generando sus descripciones en prompts multi-producto.
+        
+        Cada elemento acepta los mismos campos que create_product. Devuelve los productos
+        creados y una lista de errores por índice; un error no aborta el resto del lote.
+        """
+        created: List[Product] = []
+        errors: List[Dict[str, Any]] = []
+        pending: List[Tuple[int, Dict[str, Any]]] = []
+        seen_names = set()
+        
+        for index, data in enumerate(products):
+            name = data["name"]
+            if name in seen_names or self.product_repo.find_by_name(name):
+                errors.append({"index": index, "name": name, "detail": f"Product '{name}' already exists"})
+                continue
+            seen_names.add(name)
+            pending.append((index, data))
+        
+        descriptions = self._generate_descriptions([data for _, data in pending])
+        
+        for (index, data), (description, source) in zip(pending, descriptions):
+            try:
+                product = Product(
+                    name=data["name"],
+                    description=description,
+                    description_source=source,
+                    price=data["price"],
+                    category=data["category"],
+                    brand=data["brand"],
+                    stock_quantity=data.get("stock_quantity", 0),
+                    is_active=True
+                )
+                if not product.is_valid():
+                    raise ValueError("Product data is invalid")
+                
+                logger.info(f"Creating product: {product.name}")
+                created.append(self.product_repo.save(product))
+            except Exception as e:
+                logger.error(f"Failed to create product {data['name']} in batch: {e}")
+                errors.append({"index": index, "name": data["name"], "detail": str(e)})
+        
+        return created, errors
+
+    def _generate_descriptions(self, products: List[Dict[str, Any]]) -> List[Tuple[str, str]]:
+        """Generate (description, source) for a batch; sections that fail to parse fall back individually"""
+        descriptions: List[Optional[Tuple[str, str]]] = [None] * len(products)
+        to_generate = [i for i, data in enumerate(products) if data.get("auto_generate_description", True)]
+        batch_failed = not self.ai_service.is_available()
+        
+        if to_generate and not batch_failed:
+            try:
+                logger.info(f"Generating AI descriptions for {len(to_generate)} products in batch")
+                generated = self.ai_service.generate_product_descriptions([
+                    {
+                        "name": products[i]["name"],
+                        "category": products[i]["category"],
+                        "brand": products[i]["brand"],
+                        "basic_info": products[i].get("basic_info")
+                    }
+                    for i in to_generate
+                ])
+                for i, description in zip(to_generate, generated):
+                    if description is not None:
+                        descriptions[i] = description, Product.DESCRIPTION_AI
+            except AIGenerationError as e:
+                # Whole request failed (e.g. Gemini unavailable): plain fallback for every item
+                logger.warning(f"Batch AI generation failed: {e}")
+                batch_failed = True
+            except Exception as e:
+                logger.error(f"Unexpected error in batch description generation: {e}")
+                batch_failed = True
+        
+        for i, data in enumerate(products):
+            if descriptions[i] is None and batch_failed and i in to_generate:
+                self.ai_service.record_fallback("product_descriptions_batch")
+                descriptions[i] = (
+                    data.get("basic_info") or f"{data['brand']} {data['name']} - {data['category']}",
+                    Product.DESCRIPTION_FALLBACK
+                )
+            if descriptions[i] is None:
+                descriptions[i] = self._generate_description(
+                    data["name"],
+                    data["category"],
+                    data["brand"],
+                    data.get("basic_info"),
+                    data.get("auto_generate_description", True)
+                )
+        return descriptions
+
+    async def create_product_async(
+        self, 
+        name: str, 
+        price: Decimal, 
+        category: str, 
+        brand: str,
+        stock_quantity: int = 0,
+        basic_info: Optional[str] = None,
+        auto_generate_description: bool = True,
+        latency_budget: Optional[float] = None
+    ) -> Product:
+        """Versión asíncrona de create_product: la llamada a Gemini es una corrutina
+        y el acceso a la base de datos (síncrono) se delega a un hilo"""
+        
+        existing_product = await asyncio.to_thread(self.product_repo.find_by_name, name)
+        if existing_product:
+            raise ValueError(f"Product '{name}' already exists")
+        
+        description, source, pending = await self._generate_description_within_budget_async(
+            name, category, brand, basic_info, auto_generate_description, latency_budget
+        )
+        
+        product = Product(
+            name=name,
+            description=description,
+            description_source=source,
+            price=price,
+            category=category,
+            brand=brand,
+            stock_quantity=stock_quantity,
+            is_active=True
+        )
+        
+        if not product.is_valid():
+            raise ValueError("Product data is invalid")
+        
+        logger.info(f"Creating product: {name}")
+        saved = await asyncio.to_thread(self.product_repo.save, product)
+        if pending is not None:
+            self._complete_in_background(saved.id, description, pending)
+        return saved
+
+    async def _generate_description_within_budget_async(
+        self,
+        name: str,
+        category: str,
+        brand: str,
+        basic_info: Optional[str],
+        auto_generate: bool,
+        latency_budget: Optional[float]
+    ) -> Tuple[str, str, Optional[asyncio.Task]]:
+        """Async twin of _generate_description_within_budget (the pending generation is a Task)"""
+        if latency_budget is None or not auto_generate or not self.ai_service.is_available():
+            description, source = await self._generate_description_async(name, category, brand, basic_info, auto_generate)
+            return description, source, None
+        
+        fallback = basic_info or f"{brand} {name} - {category}"
+        logger.info(f"Generating AI description for: {name} (budget {latency_budget}s)")
+        task = asyncio.create_task(self.ai_service.generate_product_description_async(
+            name=name,
+            category=category,
+            brand=brand,
+            basic_info=basic_info
+        ))
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=latency_budget), Product.DESCRIPTION_AI, None
+        except asyncio.TimeoutError:
+            logger.warning(f"AI description for {name} exceeded {latency_budget}s, saving fallback")
+            self.ai_service.record_fallback("product_description")
+            return fallback, Product.DESCRIPTION_FALLBACK, task
+        except AIGenerationError as e:
+            logger.warning(f"AI generation failed for {name}: {e}")
+            return self._fallback_description(name, category, brand, basic_info), Product.DESCRIPTION_FALLBACK, None
+        except Exception as e:
+            logger.error(f"Unexpected error generating description for {name}: {e}")
+            return self._fallback_description(name, category, brand, basic_info), Product.DESCRIPTION_FALLBACK, None
+
+    def _complete_in_background(self, product_id: int, fallback: str, task: asyncio.Task) -> None:
+        """Store the task's description once it finishes, without holding the request"""
+        async def complete() -> None:
+            future: Future = Future()
+            try:
+                future.set_result(await task)
+            except Exception as e:
+                future.set_exception(e)
+            await asyncio.to_thread(self._apply_late_description, product_id, fallback, future)
+        
+        background = asyncio.create_task(complete())
+        _background_tasks.add(background)
+        background.add_done_callback(_background_tasks.discard)
+
+    async def _generate_description_async(
+        self, 
+        name: str, 
+        category: str, 
+        brand: str, 
+        basic_info: Optional[str], 
+        auto_generate: bool
+    ) -> Tuple[str, str]:
+        """Generate product description using AI (async) or fallback; returns (description, source)"""
         if not auto_generate:
-            return basic_info or f"{brand} {name} - {category}"
+            return basic_info or f"{brand} {name} - {category}", Product.DESCRIPTION_MANUAL
+        
+        if not self.ai_service.is_available():
+            logger.warning(f"AI service unavailable (circuit open), using fallback for {name}")
+            return self._fallback_description(name, category, brand, basic_info), Product.DESCRIPTION_FALLBACK
         
         try:
             logger.info(f"Generating AI description for: {name}")
-            return self.ai_service.generate_product_description(
+            description = await self.ai_service.generate_product_description_async(
                 name=name,
                 category=category,
                 brand=brand,
                 basic_info=basic_info
             )
+            return description, Product.DESCRIPTION_AI
         except AIGenerationError as e:
             logger.warning(f"AI generation failed for {name}: {e}")
-            return basic_info or f"{brand} {name} - {category}"
+            return self._fallback_description(name, category, brand, basic_info), Product.DESCRIPTION_FALLBACK
         except Exception as e:
             logger.error(f"Unexpected error generating description for {name}: {e}")
-            return basic_info or f"{brand} {name} - {category}"
+            return self._fallback_description(name, category, brand, basic_info), Product.DESCRIPTION_FALLBACK
+
+    def create_product_deferred(
+        self,
+        name: str,
+        price: Decimal,
+        category: str,
+        brand: str,
+        stock_quantity: int = 0,
+        basic_info: Optional[str] = None
+    ) -> Tuple[Product, DescriptionJob]:
+        """Crear un producto con la descripción de fallback y encolar su generación con Gemini.
+        
+        El worker de descripciones (app.workers.description_worker) escribe el resultado.
+        """
+        if self.job_repo is None:
+            raise ValueError("Description job queue is not configured")
+        
+        existing_product = self.product_repo.find_by_name(name)
+        if existing_product:
+            raise ValueError(f"Product '{name}' already exists")
+        
+        product = Product(
+            name=name,
+            description=basic_info or f"{brand} {name} - {category}",
+            description_source=Product.DESCRIPTION_FALLBACK,
+            price=price,
+            category=category,
+            brand=brand,
+            stock_quantity=stock_quantity
+        )
+        
+        if not product.is_valid():
+            raise ValueError("Invalid product data")
+        
+        logger.info(f"Creating product with deferred description: {name}")
+        saved = self.product_repo.save(product)
+        job = self.job_repo.enqueue(saved.id, basic_info)
+        return saved, job
+
+    async def create_product_deferred_async(self, **product_data) -> Tuple[Product, DescriptionJob]:
+        """create_product_deferred without blocking the event loop (only database work)"""
+        return await asyncio.to_thread(self.create_product_deferred, **product_data)
+
+    def get_description_job(self, product_id: int) -> Optional[DescriptionJob]:
+        """Latest description job of a product"""
+        if self.job_repo is None:
+            raise ValueError("Description job queue is not configured")
+        
+        return self.job_repo.find_latest_by_product(product_id)
+
+    def run_description_job(self, job: DescriptionJob) -> None:
+        """Generate and store the description of a queued job.
+        
+        AI errors propagate so the worker can retry the job. Products whose description
+        no longer is the fallback set at creation (edited meanwhile) are left alone.
+        """
+        product = self.product_repo.find_by_id(job.product_id)
+        if product is None:
+            logger.warning(f"Product {job.product_id} no longer exists, skipping description job {job.id}")
+            return
+        
+        fallback = job.basic_info or f"{product.brand} {product.name} - {product.category}"
+        if product.description != fallback:
+            logger.info(f"Description of product {job.product_id} was edited, skipping description job {job.id}")
+            return
+        
+        product.description = self.ai_service.generate_product_description(
+            name=product.name,
+            category=product.category,
+            brand=product.brand,
+            basic_info=job.basic_info
+        )
+        product.description_source = Product.DESCRIPTION_AI
+        self.product_repo.save(product)
+        logger.info(f"✨ Description job {job.id} stored for product {product.id}")
+
+    def regenerate_fallback_description(self, product: Product) -> bool:
+        """Replace a fallback description with a Gemini one.
+        
+        AI errors propagate so the repair worker can stop until the service recovers.
+        Returns False if the product changed since it was listed (nothing is written).
+        """
+        current = self.product_repo.find_by_id(product.id)
+        if (
+            current is None
+            or current.description_source != Product.DESCRIPTION_FALLBACK
+            or current.description != product.description
+        ):
+            return False
+        
+        # A fallback made from basic_info is the best context we still have
+        basic_info = current.description if current.description != current.default_description() else None
+        current.description = self.ai_service.generate_product_description(
+            name=current.name,
+            category=current.category,
+            brand=current.brand,
+            basic_info=basic_info
+        )
+        current.description_source = Product.DESCRIPTION_AI
+        self.product_repo.save(current)
+        return True
 
     def get_product_by_id(self, product_id: int) -> Optional[Product]:
         """Obtener producto por ID"""
@@ -126,6 +549,7 @@ class ProductService:
             product.update_stock(stock_quantity)
         if description is not None:
             product.description = description
+            product.description_source = Product.DESCRIPTION_MANUAL
         
         if not product.is_valid():
             raise ValueError("Updated product data is invalid")
@@ -177,6 +601,7 @@ class ProductService:
             logger.info(f"Improving description for product: {product.name}")
             improved_description = self.ai_service.improve_product_description(product.description)
             product.description = improved_description
+            product.description_source = Product.DESCRIPTION_AI
             return self.product_repo.save(product)
         except AIGenerationError as e:
             logger.error(f"Failed to improve description for {product.name}: {e}")
@@ -185,15 +610,169 @@ class ProductService:
             logger.error(f"Unexpected error improving description for {product.name}: {e}")
             raise ValueError(f"Failed to improve description: {str(e)}")
 
+    async def improve_product_description_async(self, product_id: int) -> Product:
+        """Versión asíncrona de improve_product_description"""
+        product = await asyncio.to_thread(self._get_product_or_raise, product_id)
+        
+        if not product.description or not product.description.strip():
+            raise ValueError("Product has no description to improve")
+        
+        try:
+            logger.info(f"Improving description for product: {product.name}")
+            improved_description = await self.ai_service.improve_product_description_async(product.description)
+            product.description = improved_description
+            product.description_source = Product.DESCRIPTION_AI
+            return await asyncio.to_thread(self.product_repo.save, product)
+        except AIGenerationError as e:
+            logger.error(f"Failed to improve description for {product.name}: {e}")
+            raise ValueError(f"Failed to improve description: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unexpected error improving description for {product.name}: {e}")
+            raise ValueError(f"Failed to improve description: {str(e)}")
+
+    async def stream_improve_product_description_async(self, product_id: int) -> AsyncIterator[str]:
+        """Validar el producto y devolver un stream de la descripción mejorada.
+        
+        La descripción se persiste cuando el stream termina; un fallo durante el
+        stream se propaga como ValueError y no modifica el producto.
+        """
+        product = await asyncio.to_thread(self._get_product_or_raise, product_id)
+        
+        if not product.description or not product.description.strip():
+            raise ValueError("Product has no description to improve")
+        
+        return self._stream_and_save_description(product)
+
+    async def _stream_and_save_description(self, product: Product) -> AsyncIterator[str]:
+        """Yield improved-description chunks and save the product once complete"""
+        chunks: List[str] = []
+        try:
+            logger.info(f"Streaming improved description for product: {product.name}")
+            async for chunk in self.ai_service.stream_improve_product_description_async(product.description):
+                chunks.append(chunk)
+                yield chunk
+        except AIGenerationError as e:
+            logger.error(f"Failed to improve description for {product.name}: {e}")
+            raise ValueError(f"Failed to improve description: {str(e)}")
+        
+        product.description = "".join(chunks).strip()
+        product.description_source = Product.DESCRIPTION_AI
+        await asyncio.to_thread(self.product_repo.save, product)
+
     def get_category_suggestions(self, category: str, count: int = 5) -> str:
-        """Obtener sugerencias de productos para una categoría usando Gemini AI"""
+        """Obtener sugerencias de productos para una categoría usando Gemini AI.
+        
+        Con sugerencias precalculadas se sirven desde almacenamiento (stale-while-revalidate);
+        en un fallo se generan con el máximo de elementos y se guardan para las siguientes.
+        """
+        stored = self._stored_suggestions(category, count)
+        if stored is not None:
+            return stored
+        
         try:
             logger.info(f"Generating suggestions for category: {category}")
-            return self.ai_service.generate_product_suggestions(category, count)
+            if not self._precomputes(category):
+                return self.ai_service.generate_product_suggestions(category, count)
+            
+            generated = self.ai_service.generate_product_suggestions(category, CategorySuggestions.MAX_COUNT)
+            stored = self._store_suggestions(category, generated)
+            return stored.truncate(count) if stored is not None else generated
         except AIGenerationError as e:
             logger.error(f"Failed to generate suggestions for {category}: {e}")
             raise ValueError(f"Failed to generate suggestions: {str(e)}")
 
+    async def get_category_suggestions_async(self, category: str, count: int = 5) -> str:
+        """Versión asíncrona de get_category_suggestions"""
+        stored = await asyncio.to_thread(self._stored_suggestions, category, count)
+        if stored is not None:
+            return stored
+        
+        try:
+            logger.info(f"Generating suggestions for category: {category}")
+            if not self._precomputes(category):
+                return await self.ai_service.generate_product_suggestions_async(category, count)
+            
+            generated = await self.ai_service.generate_product_suggestions_async(
+                category, CategorySuggestions.MAX_COUNT
+            )
+            stored = await asyncio.to_thread(self._store_suggestions, category, generated)
+            return stored.truncate(count) if stored is not None else generated
+        except AIGenerationError as e:
+            logger.error(f"Failed to generate suggestions for {category}: {e}")
+            raise ValueError(f"Failed to generate suggestions: {str(e)}")
+
+    def refresh_category_suggestions(self, category: str) -> Optional[CategorySuggestions]:
+        """Regenerate and store the full suggestions list of a category (used by the refresher)"""
+        logger.info(f"Refreshing precomputed suggestions for category: {category}")
+        generated = self.ai_service.generate_product_suggestions(category, CategorySuggestions.MAX_COUNT)
+        return self._store_suggestions(category, generated)
+
+    def _stored_suggestions(self, category: str, count: int) -> Optional[str]:
+        """Precomputed suggestions truncated to count, scheduling a refresh when stale"""
+        if not self._precomputes(category):
+            return None
+        
+        try:
+            stored = self.suggestion_repo.find_by_category(category)
+        except Exception as e:
+            logger.warning(f"Could not read precomputed suggestions for {category}: {e}")
+            return None
+        if stored is None or stored.count < count:
+            return None
+        
+        if self.suggestion_revalidator is not None:
+            self.suggestion_revalidator(stored)
+        return stored.truncate(count)
+
+    def _precomputes(self, category: str) -> bool:
+        """Whether suggestions of this category are read from and kept in storage"""
+        return (
+            self.suggestion_repo is not None
+            and len(category) <= CategorySuggestions.MAX_CATEGORY_LENGTH
+        )
+
+    def _store_suggestions(self, category: str, suggestions: str) -> Optional[CategorySuggestions]:
+        """Persist a suggestions list with the number of items it really has; storage errors do not fail the request"""
+        count = count_suggestion_items(suggestions)
+        if count == 0:
+            logger.warning(f"Not storing suggestions for {category}: the answer has no numbered items")
+            return None
+        
+        entry = CategorySuggestions(
+            category=category,
+            suggestions=suggestions,
+            count=count,
+            generated_at=datetime.utcnow()
+        )
+        try:
+            self.suggestion_repo.save(entry)
+        except Exception as e:
+            self.suggestion_repo.session.rollback()
+            logger.warning(f"Could not store suggestions for {category}: {e}")
+        return entry
+
+    async def stream_category_suggestions_async(self, category: str, count: int = 5) -> AsyncIterator[str]:
+        """Emitir sugerencias de productos para una categoría a medida que se generan"""
+        stored = await asyncio.to_thread(self._stored_suggestions, category, count)
+        if stored is not None:
+            yield stored
+            return
+        
+        chunks: List[str] = []
+        try:
+            logger.info(f"Streaming suggestions for category: {category}")
+            async for chunk in self.ai_service.stream_product_suggestions_async(category, count):
+                chunks.append(chunk)
+                yield chunk
+        except AIGenerationError as e:
+            logger.error(f"Failed to generate suggestions for {category}: {e}")
+            raise ValueError(f"Failed to generate suggestions: {str(e)}")
+        
+        # Complete stream: keep it for later reads of up to count items
+        generated = "".join(chunks).strip()
+        if self._precomputes(category) and generated:
+            await asyncio.to_thread(self._store_suggestions, category, generated)
+
     def get_available_products(self) -> List[Product]:
         """Obtener solo productos disponibles (activos y con stock)"""
         all_products = self.product_repo.get_all_active()
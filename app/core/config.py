@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 import os
 from .secret_manager import get_secret_or_env
 
@@ -17,6 +17,132 @@ class Settings(BaseSettings):
     # AI Service Configuration - Only Gemini Direct API
     use_vertex_ai: bool = False  # Forced to False - only Gemini Direct allowed
     
+    # AI backend: "gemini" (Gemini API) or "fake" (local model, no network)
+    ai_backend: str = "gemini"
+    
+    # Gemini key/model pool: one member per (key, model); a single pair uses the plain client
+    google_api_keys: Optional[str] = None  # Extra API keys, comma separated
+    ai_models: str = "gemini-2.0-flash"  # Comma separated, first one is the default model
+    ai_pool_eviction_seconds: float = 30.0  # How long a member answering 429 is skipped
+    ai_pool_member_requests_per_minute: Optional[int] = None
+    ai_fake_latency_ms: float = 300.0  # Median latency of the fake model
+    ai_fake_latency_sigma: float = 0.5  # Log-normal spread
+    ai_fake_error_429_rate: float = 0.0
+    ai_fake_error_500_rate: float = 0.0
+    ai_fake_timeout_rate: float = 0.0
+    ai_fake_timeout_seconds: float = 30.0
+    ai_fake_seed: Optional[int] = None
+    ai_fake_connect_latency_ms: float = 0.0  # Cost of each new connection of the fake model
+    
+    # Gemini transport (connections of each model client)
+    ai_transport: str = "grpc"  # grpc (one multiplexed HTTP/2 channel) | rest (keep-alive HTTP pool)
+    ai_transport_pool_size: int = 10  # REST keep-alive connections per client
+    ai_transport_connect_timeout_seconds: float = 5.0
+    ai_transport_read_timeout_seconds: Optional[float] = 60.0  # Per model call (empty = SDK default)
+    ai_transport_keepalive_seconds: float = 30.0  # gRPC keep-alive pings so idle channels stay open
+    ai_transport_warmup_enabled: bool = True  # Open the connections at startup
+    
+    # AI Response Cache
+    ai_cache_enabled: bool = True
+    ai_cache_max_entries: int = 1024
+    ai_cache_ttl_seconds: int = 86400
+    ai_cache_db_path: Optional[str] = None  # SQLite file to persist the cache across restarts
+    ai_cache_shm_enabled: bool = False  # mmap segment shared by all workers on the host (replaces SQLite)
+    ai_cache_shm_path: Optional[str] = None  # Base name, geometry is appended (empty = /dev/shm/genai-ai-cache)
+    ai_cache_shm_slots: int = 4096  # Multiple of 8
+    ai_cache_shm_slot_bytes: int = 8192  # Responses larger than a slot are kept per worker only
+    
+    # AI Batch Generation
+    ai_batch_max_products: int = 10  # Products packed into a single Gemini prompt
+    ai_microbatch_enabled: bool = False  # Merge concurrent single-product generations
+    ai_microbatch_window_ms: float = 30
+    ai_microbatch_max_size: int = 10
+    
+    # Speculative descriptions for suggested products (background priority, stored in the AI cache)
+    ai_speculation_enabled: bool = False
+    ai_speculation_max_items: int = 10  # Suggested products pre-generated per suggestions answer
+    ai_speculation_max_pending: int = 50  # Products queued at once; extra ones are dropped
+    
+    # AI Quota Governor (shared by all workers on the host through file locks)
+    ai_quota_enabled: bool = False
+    ai_quota_requests_per_minute: int = 1000
+    ai_quota_tokens_per_minute: int = 1000000
+    ai_quota_max_concurrency: int = 16
+    ai_quota_max_wait_seconds: float = 10.0
+    ai_quota_state_dir: str = "/tmp/genai-ai-quota"
+    
+    # Adaptive concurrency limit (AIMD on observed latency, per worker)
+    ai_adaptive_limit_enabled: bool = False
+    ai_adaptive_limit_initial: int = 8
+    ai_adaptive_limit_min: int = 1
+    ai_adaptive_limit_max: int = 64
+    ai_adaptive_limit_latency_tolerance: float = 2.0
+    ai_adaptive_limit_max_wait_seconds: float = 10.0
+    
+    # Priority scheduling of AI calls (interactive / batch / background queues)
+    ai_scheduler_enabled: bool = False
+    ai_scheduler_max_concurrency: int = 16  # Model calls in flight across all classes
+    ai_scheduler_interactive_reserved: int = 4  # Slots only interactive calls may take
+    ai_scheduler_weight_interactive: float = 8.0
+    ai_scheduler_weight_batch: float = 3.0
+    ai_scheduler_weight_background: float = 1.0
+    ai_scheduler_max_wait_seconds: float = 30.0
+    
+    # Retries and circuit breaker
+    ai_retry_max_attempts: int = 3
+    ai_retry_base_delay_seconds: float = 0.25
+    ai_retry_max_delay_seconds: float = 4.0
+    ai_circuit_breaker_enabled: bool = True
+    ai_circuit_breaker_failure_threshold: int = 5
+    ai_circuit_breaker_recovery_seconds: float = 30.0
+    
+    # Hedged requests (duplicate slow calls, first answer wins)
+    ai_hedging_enabled: bool = False
+    ai_hedging_percentile: float = 0.95  # Hedge once a call outlives this latency percentile
+    ai_hedging_max_fraction: float = 0.05  # At most this share of calls is duplicated
+    ai_hedging_min_samples: int = 20
+    ai_hedging_max_threads: int = 64  # Sync hedged calls in flight; beyond it calls run unhedged
+    
+    # Prompt token budgets (inputs are trimmed, outputs capped per prompt type)
+    ai_prompt_basic_info_max_tokens: int = 256
+    ai_prompt_description_max_tokens: int = 768  # current_description fed to the improve prompt
+    ai_max_output_tokens_description: int = 768
+    ai_max_output_tokens_batch_per_product: int = 512
+    ai_max_output_tokens_per_suggestion: int = 64
+    ai_max_output_tokens_improve: int = 1024
+    
+    # Latency-tiered model routing (short operations on a lighter model, fallback on bad answers)
+    ai_routing_enabled: bool = False
+    ai_routing_light_model: str = "gemini-2.0-flash-lite"
+    ai_routing_light_slo_seconds: float = 2.0
+    ai_routing_light_max_output_tokens: Optional[int] = 512  # Cap on top of the prompt budget
+    ai_routing_light_operations: str = "product_suggestions,improve_description"  # Comma separated
+    ai_routing_standard_model: Optional[str] = None  # Empty = first of AI_MODELS
+    ai_routing_standard_slo_seconds: float = 6.0
+    
+    # Latency budgets per endpoint (seconds, empty = wait for Gemini)
+    ai_latency_budget_create_product_seconds: Optional[float] = None  # e.g. 8; opt-in, changes the POST response
+    
+    # Precomputed category suggestions (stale-while-revalidate)
+    ai_suggestions_precompute_enabled: bool = False
+    ai_suggestions_refresh_interval_seconds: float = 3600.0  # Scan for missing/stale categories
+    ai_suggestions_max_age_seconds: float = 86400.0  # Older suggestions are served and refreshed
+    ai_suggestions_lock_dir: str = "/tmp/genai-suggestions"  # Per-category locks shared by the workers on the host
+    
+    # Description job queue (POST /products/?defer_description=true)
+    description_worker_enabled: bool = True  # Run the worker inside the API process
+    description_worker_concurrency: int = 4
+    description_worker_lease_seconds: float = 120.0  # A crashed worker's job is retried after this
+    description_worker_max_attempts: int = 5
+    description_worker_poll_interval_seconds: float = 1.0
+    
+    # Repair of fallback descriptions once Gemini is healthy again
+    description_repair_enabled: bool = False  # In the web process; prefer python -m app.workers.description_repair
+    description_repair_interval_seconds: float = 60.0  # Scan for fallback descriptions
+    description_repair_batch_size: int = 20  # Products per scan
+    description_repair_per_minute: int = 30  # Regeneration rate limit
+    description_repair_min_age_seconds: float = 300.0  # Leave room for late/queued generations
+    
     # Security Configuration
     cors_origins: Optional[str] = None
     
@@ -33,6 +159,15 @@ class Settings(BaseSettings):
             )
         return self._google_api_key
     
+    def get_google_api_keys(self) -> List[str]:
+        """Primary API key followed by the extra pool keys (deduplicated)"""
+        keys = [self.get_google_api_key()] + (self.google_api_keys or "").split(",")
+        return list(dict.fromkeys(key.strip() for key in keys if key and key.strip()))
+    
+    def get_ai_models(self) -> List[str]:
+        """Configured Gemini model names"""
+        return [model.strip() for model in self.ai_models.split(",") if model.strip()]
+    
     def get_database_url(self) -> str:
         """Get database URL"""
         return f"mysql+pymysql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
@@ -1,17 +1,49 @@
+from contextlib import contextmanager
 from functools import lru_cache
+from typing import Iterator
 from fastapi import Depends
 from sqlalchemy.orm import Session
-from app.infrastructure.database import ProductRepository
+from app.infrastructure.database import CategorySuggestionRepository, DescriptionJobRepository, ProductRepository
 from app.infrastructure.external_services import GeminiAIService
+from app.infrastructure.ai_registry import ai_service_registry
 from app.application.product_service import ProductService
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.workers.suggestion_refresher import CategorySuggestionRefresher
 
-@lru_cache()
 def get_ai_service() -> GeminiAIService:
-    return GeminiAIService()
+    """Shared AI service from the process-wide registry (built once at startup)"""
+    return ai_service_registry.get()
+
+@lru_cache()
+def get_suggestion_refresher() -> CategorySuggestionRefresher:
+    return CategorySuggestionRefresher(
+        session_factory=SessionLocal,
+        ai_service=get_ai_service(),
+        interval_seconds=settings.ai_suggestions_refresh_interval_seconds,
+        max_age_seconds=settings.ai_suggestions_max_age_seconds,
+        lock_dir=settings.ai_suggestions_lock_dir
+    )
+
+@contextmanager
+def product_repository_scope() -> Iterator[ProductRepository]:
+    """Repository with its own session, for work that outlives the request (background updates)"""
+    session = SessionLocal()
+    try:
+        yield ProductRepository(session)
+    finally:
+        session.close()
 
 def get_product_service(db: Session = Depends(get_db)) -> ProductService:
     product_repo = ProductRepository(db)
     ai_service = get_ai_service()
+    precompute = settings.ai_suggestions_precompute_enabled
     
-    return ProductService(product_repo, ai_service)
\ No newline at end of file
+    return ProductService(
+        product_repo,
+        ai_service,
+        repository_scope=product_repository_scope,
+        job_repo=DescriptionJobRepository(db),
+        suggestion_repo=CategorySuggestionRepository(db) if precompute else None,
+        suggestion_revalidator=get_suggestion_refresher().revalidate if precompute else None
+    )
\ No newline at end of file
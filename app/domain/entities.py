@@ -1,12 +1,22 @@
 from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import ClassVar, Optional
 from decimal import Decimal
+import re
+
+# Numbered item of a suggestions list ("1. Producto - Marca - Descripción")
+SUGGESTION_ITEM_PATTERN = re.compile(r"^\s*\d+[.)]\s")
 
 class Product(BaseModel):
+    # Origin of the description (fallback ones are regenerated once Gemini recovers)
+    DESCRIPTION_AI: ClassVar[str] = "ai"
+    DESCRIPTION_FALLBACK: ClassVar[str] = "fallback"
+    DESCRIPTION_MANUAL: ClassVar[str] = "manual"
+    
     id: Optional[int] = None
     name: str = Field(..., min_length=1, max_length=255, description="Product name")
     description: str = Field(default="", max_length=2000, description="Product description")
+    description_source: str = Field(default="manual", description="ai | fallback | manual")
     price: Decimal = Field(..., gt=0, decimal_places=2, description="Product price")
     category: str = Field(..., min_length=1, max_length=100, description="Product category")
     brand: str = Field(..., min_length=1, max_length=100, description="Product brand")
@@ -41,6 +51,10 @@ class Product(BaseModel):
             raise ValueError("Stock quantity cannot be negative")
         self.stock_quantity = quantity
     
+    def default_description(self) -> str:
+        """Plain description used when there is neither AI text nor basic info"""
+        return f"{self.brand} {self.name} - {self.category}"
+    
     def deactivate(self) -> None:
         """Deactivate the product"""
         self.is_active = False
@@ -70,4 +84,58 @@ class Product(BaseModel):
                 
             return True
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+class DescriptionJob(BaseModel):
+    """Generación de descripción encolada para un producto"""
+    
+    PENDING: ClassVar[str] = "pending"
+    RUNNING: ClassVar[str] = "running"
+    SUCCEEDED: ClassVar[str] = "succeeded"
+    FAILED: ClassVar[str] = "failed"
+    
+    id: Optional[int] = None
+    product_id: int
+    status: str = Field(default="pending", description="pending | running | succeeded | failed")
+    basic_info: Optional[str] = None
+    attempts: int = Field(default=0, ge=0)
+    last_error: Optional[str] = None
+    locked_until: Optional[datetime] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    model_config = {"from_attributes": True}
+    
+    def is_finished(self) -> bool:
+        """True once the job succeeded or ran out of attempts"""
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+class CategorySuggestions(BaseModel):
+    """Sugerencias precalculadas para una categoría (generadas con el máximo de elementos)"""
+    
+    MAX_COUNT: ClassVar[int] = 10
+    MAX_CATEGORY_LENGTH: ClassVar[int] = 100
+    
+    category: str = Field(..., min_length=1, max_length=MAX_CATEGORY_LENGTH)
+    suggestions: str
+    count: int = Field(..., ge=1)
+    generated_at: datetime
+    
+    model_config = {"from_attributes": True}
+    
+    def truncate(self, count: int) -> str:
+        """Keep the first count numbered suggestions (a larger list serves smaller counts)"""
+        kept = []
+        items = 0
+        for line in self.suggestions.splitlines():
+            if SUGGESTION_ITEM_PATTERN.match(line):
+                items += 1
+                if items > count:
+                    break
+            kept.append(line)
+        return "\n".join(kept).strip()
+    
+    def is_stale(self, max_age_seconds: float, now: Optional[datetime] = None) -> bool:
+        """True once the suggestions are older than max_age_seconds"""
+        now = now or datetime.utcnow()
+        return (now - self.generated_at).total_seconds() > max_age_seconds
@@ -1,4 +1,8 @@
-from .database import ProductRepository
+from .database import CategorySuggestionRepository, DescriptionJobRepository, ProductRepository
 from .external_services import GeminiAIService
+from .ai_registry import AIServiceRegistry, ai_service_registry
 
-__all__ = ["ProductRepository", "GeminiAIService"]
\ No newline at end of file
+__all__ = [
+    "ProductRepository", "DescriptionJobRepository", "CategorySuggestionRepository", "GeminiAIService",
+    "AIServiceRegistry", "ai_service_registry"
+]
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Micro-batching transparente de generaciones de descripciones
+"""
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+import threading
+from .ai_services import BaseAIService
+
+logger = logging.getLogger(__name__)
+
+ProductInput = Dict[str, Optional[str]]
+
+class _PendingBatch:
+    """Items collected during one window (thread path)"""
+
+    def __init__(self):
+        self.items: List[Tuple[ProductInput, Future]] = []
+        self.full = threading.Event()
+
+class _AsyncPendingBatch:
+    """Items collected during one window (asyncio path)"""
+
+    def __init__(self):
+        self.items: List[Tuple[ProductInput, asyncio.Future]] = []
+        self.full = asyncio.Event()
+
+class DescriptionMicroBatcher:
+    """Merge concurrent description generations into multi-product requests"""
+
+    def __init__(self, ai_service: BaseAIService, window_ms: float = 30, max_batch_size: int = 10):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self._ai_service = ai_service
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._pending: Optional[_PendingBatch] = None
+        self._async_pending: Dict[int, _AsyncPendingBatch] = {}
+        self._async_tasks: Set[asyncio.Task] = set()
+        self._batches = 0
+        self._items = 0
+        self._cache_hits = 0
+
+    def submit(
+        self,
+        name: str,
+        category: str,
+        brand: str,
+        basic_info: Optional[str] = None
+    ) -> str:
+        """Generate a description, sharing a Gemini request with concurrent callers"""
+        self._ai_service._validate_inputs(name=name, category=category, brand=brand)
+        product = {"name": name, "category": category, "brand": brand, "basic_info": basic_info}
+
+        cached = self._ai_service.get_cached_description(product)
+        if cached is not None:
+            with self._lock:
+                self._cache_hits += 1
+            return cached.strip()
+
+        future: Future = Future()
+        with self._lock:
+            batch = self._pending
+            leader = batch is None
+            if leader:
+                batch = _PendingBatch()
+                self._pending = batch
+            batch.items.append((product, future))
+            if len(batch.items) >= self.max_batch_size:
+                self._pending = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window_seconds)
+            with self._lock:
+                if self._pending is batch:
+                    self._pending = None
+            self._flush(batch.items)
+
+        description = future.result()
+        if description is None:
+            # Section could not be parsed: fall back to an individual request
+            return self._ai_service.generate_product_description(**product)
+        return description
+
+    async def submit_async(
+        self,
+        name: str,
+        category: str,
+        brand: str,
+        basic_info: Optional[str] = None
+    ) -> str:
+        """Async twin of submit (batches are formed per event loop)"""
+        self._ai_service._validate_inputs(name=name, category=category, brand=brand)
+        product = {"name": name, "category": category, "brand": brand, "basic_info": basic_info}
+
+        cached = self._ai_service.get_cached_description(product)
+        if cached is not None:
+            with self._lock:
+                self._cache_hits += 1
+            return cached.strip()
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            batch = self._async_pending.get(id(loop))
+            leader = batch is None
+            if leader:
+                batch = _AsyncPendingBatch()
+                self._async_pending[id(loop)] = batch
+            batch.items.append((product, future))
+            if len(batch.items) >= self.max_batch_size:
+                self._async_pending.pop(id(loop), None)
+                batch.full.set()
+
+        if leader:
+            # The batch runs in its own task: cancelling the leader must not strand the followers
+            task = loop.create_task(self._run_batch_async(batch, id(loop)))
+            self._async_tasks.add(task)
+            task.add_done_callback(self._async_tasks.discard)
+
+        description = await asyncio.shield(future)
+        if description is None:
+            return await self._ai_service.generate_product_description_async(**product)
+        return description
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "window_ms": self.window_seconds * 1000,
+                "max_batch_size": self.max_batch_size,
+                "batches": self._batches,
+                "items": self._items,
+                "cache_hits": self._cache_hits,
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0
+            }
+
+    def _flush(self, items: List[Tuple[ProductInput, Future]]) -> None:
+        """Run one request for the collected items and resolve their futures"""
+        self._record(len(items))
+        products = [product for product, _ in items]
+        try:
+            if len(products) == 1:
+                descriptions = [self._ai_service.generate_product_description(**products[0])]
+            else:
+                descriptions = self._ai_service.generate_product_descriptions(products)
+                self._store(products, descriptions)
+        except BaseException as e:
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        for (_, future), description in zip(items, descriptions):
+            future.set_result(description)
+
+    async def _run_batch_async(self, batch: _AsyncPendingBatch, loop_id: int) -> None:
+        """Wait for the window (or a full batch), close the batch and flush it"""
+        try:
+            await asyncio.wait_for(batch.full.wait(), timeout=self.window_seconds)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                if self._async_pending.get(loop_id) is batch:
+                    del self._async_pending[loop_id]
+        await self._flush_async(batch.items)
+
+    async def _flush_async(self, items: List[Tuple[ProductInput, asyncio.Future]]) -> None:
+        """Async twin of _flush"""
+        self._record(len(items))
+        products = [product for product, _ in items]
+        try:
+            if len(products) == 1:
+                descriptions = [await self._ai_service.generate_product_description_async(**products[0])]
+            else:
+                descriptions = await self._ai_service.generate_product_descriptions_async(products)
+                self._store(products, descriptions)
+        except asyncio.CancelledError:
+            for _, future in items:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), description in zip(items, descriptions):
+            if not future.done():
+                future.set_result(description)
+
+    def _store(self, products: List[ProductInput], descriptions: List[Optional[str]]) -> None:
+        """Cache each batched result under its single-product prompt"""
+        for product, description in zip(products, descriptions):
+            if description is not None:
+                self._ai_service.store_cached_description(product, description)
+
+    def _record(self, size: int) -> None:
+        with self._lock:
+            self._batches += 1
+            self._items += size
+        logger.debug(f"Flushing micro-batch of {size} description(s)")
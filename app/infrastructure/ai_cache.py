@@ -0,0 +1,210 @@
+"""
+Cache de respuestas de AI direccionada por contenido
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any, Optional, Tuple
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def make_cache_key(prompt: str, model_name: str, generation_config: Any = None) -> str:
+    """Build a content-addressed key from prompt, model and generation config"""
+    if is_dataclass(generation_config):
+        config = asdict(generation_config)
+    elif isinstance(generation_config, dict):
+        config = generation_config
+    elif generation_config is None:
+        config = None
+    else:
+        config = repr(generation_config)
+
+    payload = json.dumps(
+        {"model": model_name, "config": config, "prompt": prompt},
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class CacheStore(ABC):
+    """Second-level store for cached AI responses"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return (value, expires_at) or None"""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        """Store a value until expires_at (epoch seconds)"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry"""
+        pass
+
+    def get_stats(self) -> dict:
+        return {"type": type(self).__name__}
+
+class SQLiteCacheStore(CacheStore):
+    """Persistent store on SQLite - survives restarts and is shared by workers on the same host"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ai_response_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM ai_response_cache WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM ai_response_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        return row[0], row[1]
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ai_response_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM ai_response_cache")
+            self._conn.commit()
+
+    def get_stats(self) -> dict:
+        return {"type": "sqlite", "path": self.path}
+
+class AIResponseCache:
+    """Bounded in-memory LRU with TTL eviction and an optional persistent store"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 86400,
+        store: Optional[CacheStore] = None
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._store = store
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._store_hits = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response or None (counts a hit or a miss)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+                self._evictions += 1
+
+        if self._store is not None:
+            try:
+                stored = self._store.get(key)
+            except Exception as e:
+                logger.warning(f"AI cache store read failed: {e}")
+                stored = None
+            if stored is not None and stored[1] > now:
+                with self._lock:
+                    self._put(key, stored[0], stored[1])
+                    self._hits += 1
+                    self._store_hits += 1
+                return stored[0]
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def contains(self, key: str) -> bool:
+        """True if a live response is cached (unlike get, counts no hit or miss)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                return True
+
+        if self._store is None:
+            return False
+        try:
+            stored = self._store.get(key)
+        except Exception as e:
+            logger.warning(f"AI cache store read failed: {e}")
+            return False
+        return stored is not None and stored[1] > now
+
+    def set(self, key: str, value: str) -> None:
+        """Store a response in memory and in the persistent store"""
+        expires_at = time.time() + self.ttl_seconds
+        with self._lock:
+            self._put(key, value, expires_at)
+
+        if self._store is not None:
+            try:
+                self._store.set(key, value, expires_at)
+            except Exception as e:
+                logger.warning(f"AI cache store write failed: {e}")
+
+    def clear(self) -> None:
+        """Remove every entry (memory and store)"""
+        with self._lock:
+            self._entries.clear()
+        if self._store is not None:
+            self._store.clear()
+
+    def get_stats(self) -> dict:
+        """Return hit/miss counters"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "store_hits": self._store_hits,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "persistent": self._store is not None,
+                "store": self._store.get_stats() if self._store is not None else None
+            }
+
+    def _put(self, key: str, value: str, expires_at: float) -> None:
+        """Insert under lock, evicting the least recently used entry if full"""
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
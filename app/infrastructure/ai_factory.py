@@ -1,5 +1,17 @@
+from typing import Any, Callable, List, Optional
 from app.core.config import settings
-from .ai_services import AIServiceInterface, GeminiDirectService
+from .ai_services import AIServiceInterface, CircuitBreaker, GeminiDirectService, RetryPolicy
+from .ai_cache import AIResponseCache, CacheStore, SQLiteCacheStore
+from .ai_shm_cache import SharedMemoryCacheStore, default_shm_path
+from .ai_quota import QuotaGovernor
+from .ai_limiter import AdaptiveConcurrencyLimiter
+from .ai_hedging import HedgingPolicy
+from .prompts import PromptBudget
+from .fake_gemini import FakeGeminiConfig, FakeGenerativeModel
+from .ai_pool import GeminiModelPool, build_gemini_pool
+from .ai_routing import ModelRoutingTable, ModelTier
+from .ai_scheduler import BACKGROUND, BATCH, INTERACTIVE, PriorityScheduler
+from .ai_transport import TransportConfig
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,15 +27,276 @@ class AIServiceFactory:
         Returns:
             AIServiceInterface: Instancia del servicio de Gemini Direct
         """
-        logger.info("🏭 Creating Gemini Direct service (only supported service)")
+        model_factory: Optional[Callable[[str], Any]] = None
+        if settings.ai_backend == "fake":
+            logger.info("🧪 Creating Gemini Direct service backed by the local fake model")
+            model = AIServiceFactory.create_fake_model()
+            model_factory = AIServiceFactory.create_fake_model
+        elif len(settings.get_google_api_keys()) * len(settings.get_ai_models()) > 1:
+            logger.info("🏭 Creating Gemini Direct service over a key/model pool")
+            model = AIServiceFactory.create_model_pool()
+            model_factory = lambda model_name: AIServiceFactory.create_model_pool([model_name])
+        else:
+            logger.info("🏭 Creating Gemini Direct service (only supported service)")
+            model = None
         
-        if not settings.get_google_api_key():
+        if model is None and not settings.get_google_api_key():
             raise ValueError(
                 "GOOGLE_API_KEY is required for Gemini Direct service. "
                 "Set GOOGLE_API_KEY environment variable."
             )
         
-        return GeminiDirectService(api_key=settings.get_google_api_key())
+        return GeminiDirectService(
+            api_key=settings.get_google_api_key() if model is None else "",
+            cache=AIServiceFactory.create_response_cache(),
+            quota=AIServiceFactory.create_quota_governor(),
+            limiter=AIServiceFactory.create_concurrency_limiter(),
+            retry_policy=RetryPolicy(
+                max_attempts=settings.ai_retry_max_attempts,
+                base_delay=settings.ai_retry_base_delay_seconds,
+                max_delay=settings.ai_retry_max_delay_seconds
+            ),
+            circuit_breaker=(
+                CircuitBreaker(
+                    failure_threshold=settings.ai_circuit_breaker_failure_threshold,
+                    recovery_timeout=settings.ai_circuit_breaker_recovery_seconds
+                )
+                if settings.ai_circuit_breaker_enabled else None
+            ),
+            hedging=AIServiceFactory.create_hedging_policy(),
+            prompt_budget=AIServiceFactory.create_prompt_budget(),
+            scheduler=AIServiceFactory.create_priority_scheduler(),
+            model=model,
+            model_name=(settings.get_ai_models() or ["gemini-2.0-flash"])[0],
+            routing=AIServiceFactory.create_routing_table(),
+            model_factory=model_factory,
+            transport=AIServiceFactory.create_transport_config()
+        )
+
+    @staticmethod
+    def create_transport_config() -> TransportConfig:
+        """
+        Crea la configuración de conexiones de los clientes de Gemini
+        
+        Returns:
+            TransportConfig: Transporte, pool keep-alive y timeouts configurados
+        """
+        return TransportConfig(
+            kind=settings.ai_transport,
+            pool_size=settings.ai_transport_pool_size,
+            connect_timeout_seconds=settings.ai_transport_connect_timeout_seconds,
+            read_timeout_seconds=settings.ai_transport_read_timeout_seconds,
+            keepalive_seconds=settings.ai_transport_keepalive_seconds
+        )
+
+    @staticmethod
+    def create_routing_table() -> Optional[ModelRoutingTable]:
+        """
+        Crea la tabla de enrutado por niveles de latencia (ligero -> estándar)
+        
+        Returns:
+            Optional[ModelRoutingTable]: Tabla configurada o None si está deshabilitada
+        """
+        if not settings.ai_routing_enabled:
+            return None
+        
+        standard_model = settings.ai_routing_standard_model or (settings.get_ai_models() or ["gemini-2.0-flash"])[0]
+        light_operations = [op.strip() for op in settings.ai_routing_light_operations.split(",") if op.strip()]
+        logger.info(f"🧭 AI routing: {', '.join(light_operations) or 'no operations'} on {settings.ai_routing_light_model}")
+        return ModelRoutingTable(
+            tiers=[
+                ModelTier(
+                    name="light",
+                    model_name=settings.ai_routing_light_model,
+                    latency_slo_seconds=settings.ai_routing_light_slo_seconds,
+                    max_output_tokens=settings.ai_routing_light_max_output_tokens,
+                    fallback="standard"
+                ),
+                ModelTier(
+                    name="standard",
+                    model_name=standard_model,
+                    latency_slo_seconds=settings.ai_routing_standard_slo_seconds
+                )
+            ],
+            operations={operation: "light" for operation in light_operations},
+            default_tier="standard"
+        )
+
+    @staticmethod
+    def create_response_cache() -> Optional[AIResponseCache]:
+        """
+        Crea la cache de respuestas de AI según la configuración
+        
+        Returns:
+            Optional[AIResponseCache]: Cache LRU/TTL (con memoria compartida o SQLite opcional) o None si está deshabilitada
+        """
+        if not settings.ai_cache_enabled:
+            return None
+        
+        store: Optional[CacheStore] = None
+        if settings.ai_cache_shm_enabled:
+            path = settings.ai_cache_shm_path or default_shm_path()
+            try:
+                store = SharedMemoryCacheStore(
+                    path,
+                    slot_count=settings.ai_cache_shm_slots,
+                    slot_size=settings.ai_cache_shm_slot_bytes
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ Could not open AI shared cache at {path}, using the per-worker cache: {e}")
+        elif settings.ai_cache_db_path:
+            try:
+                store = SQLiteCacheStore(settings.ai_cache_db_path)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not open AI cache store at {settings.ai_cache_db_path}: {e}")
+        
+        return AIResponseCache(
+            max_entries=settings.ai_cache_max_entries,
+            ttl_seconds=settings.ai_cache_ttl_seconds,
+            store=store
+        )
+
+    @staticmethod
+    def create_quota_governor() -> Optional[QuotaGovernor]:
+        """
+        Crea el gobernador de cuota compartido entre workers según la configuración
+        
+        Returns:
+            Optional[QuotaGovernor]: Gobernador de cuota o None si está deshabilitado
+        """
+        if not settings.ai_quota_enabled:
+            return None
+        
+        return QuotaGovernor(
+            state_dir=settings.ai_quota_state_dir,
+            requests_per_minute=settings.ai_quota_requests_per_minute,
+            tokens_per_minute=settings.ai_quota_tokens_per_minute,
+            max_concurrency=settings.ai_quota_max_concurrency,
+            max_wait_seconds=settings.ai_quota_max_wait_seconds
+        )
+
+    @staticmethod
+    def create_concurrency_limiter() -> Optional[AdaptiveConcurrencyLimiter]:
+        """
+        Crea el limitador de concurrencia adaptativo según la configuración
+        
+        Returns:
+            Optional[AdaptiveConcurrencyLimiter]: Limitador AIMD o None si está deshabilitado
+        """
+        if not settings.ai_adaptive_limit_enabled:
+            return None
+        
+        return AdaptiveConcurrencyLimiter(
+            initial_limit=settings.ai_adaptive_limit_initial,
+            min_limit=settings.ai_adaptive_limit_min,
+            max_limit=settings.ai_adaptive_limit_max,
+            latency_tolerance=settings.ai_adaptive_limit_latency_tolerance,
+            max_wait_seconds=settings.ai_adaptive_limit_max_wait_seconds
+        )
+
+    @staticmethod
+    def create_priority_scheduler() -> Optional[PriorityScheduler]:
+        """
+        Crea el planificador por prioridad (interactive / batch / background)
+        
+        Returns:
+            Optional[PriorityScheduler]: Planificador configurado o None si está deshabilitado
+        """
+        if not settings.ai_scheduler_enabled:
+            return None
+        
+        logger.info(
+            f"🚦 AI priority scheduler: {settings.ai_scheduler_max_concurrency} slots, "
+            f"{settings.ai_scheduler_interactive_reserved} reserved for interactive calls"
+        )
+        return PriorityScheduler(
+            max_concurrency=settings.ai_scheduler_max_concurrency,
+            weights={
+                INTERACTIVE: settings.ai_scheduler_weight_interactive,
+                BATCH: settings.ai_scheduler_weight_batch,
+                BACKGROUND: settings.ai_scheduler_weight_background
+            },
+            interactive_reserved=settings.ai_scheduler_interactive_reserved,
+            max_wait_seconds=settings.ai_scheduler_max_wait_seconds
+        )
+
+    @staticmethod
+    def create_hedging_policy() -> Optional[HedgingPolicy]:
+        """
+        Crea la política de hedged requests según la configuración
+        
+        Returns:
+            Optional[HedgingPolicy]: Política de hedging o None si está deshabilitada
+        """
+        if not settings.ai_hedging_enabled:
+            return None
+        
+        return HedgingPolicy(
+            percentile=settings.ai_hedging_percentile,
+            max_hedge_fraction=settings.ai_hedging_max_fraction,
+            min_samples=settings.ai_hedging_min_samples,
+            max_threads=settings.ai_hedging_max_threads
+        )
+
+    @staticmethod
+    def create_prompt_budget() -> PromptBudget:
+        """
+        Crea los límites de tokens de entrada/salida por tipo de prompt
+        
+        Returns:
+            PromptBudget: Presupuesto de tokens configurado
+        """
+        return PromptBudget(
+            basic_info_tokens=settings.ai_prompt_basic_info_max_tokens,
+            current_description_tokens=settings.ai_prompt_description_max_tokens,
+            description_output_tokens=settings.ai_max_output_tokens_description,
+            batch_output_tokens_per_product=settings.ai_max_output_tokens_batch_per_product,
+            suggestion_output_tokens_per_item=settings.ai_max_output_tokens_per_suggestion,
+            improve_output_tokens=settings.ai_max_output_tokens_improve
+        )
+
+    @staticmethod
+    def create_model_pool(model_names: Optional[List[str]] = None) -> GeminiModelPool:
+        """
+        Crea el pool de miembros (API key, modelo) con clientes independientes
+        
+        Args:
+            model_names: Modelos del pool (por defecto AI_MODELS)
+        
+        Returns:
+            GeminiModelPool: Pool con enrutado al miembro menos cargado
+        """
+        return build_gemini_pool(
+            api_keys=settings.get_google_api_keys(),
+            model_names=model_names or settings.get_ai_models(),
+            eviction_seconds=settings.ai_pool_eviction_seconds,
+            requests_per_minute=settings.ai_pool_member_requests_per_minute,
+            transport=AIServiceFactory.create_transport_config()
+        )
+
+    @staticmethod
+    def create_fake_model(model_name: str = "models/gemini-fake") -> FakeGenerativeModel:
+        """
+        Crea el modelo Gemini local (sin red) para pruebas de carga y benchmarks
+        
+        Args:
+            model_name: Nombre del modelo simulado
+        
+        Returns:
+            FakeGenerativeModel: Modelo con latencia y fallos configurables
+        """
+        return FakeGenerativeModel(FakeGeminiConfig(
+            latency_ms=settings.ai_fake_latency_ms,
+            latency_sigma=settings.ai_fake_latency_sigma,
+            error_429_rate=settings.ai_fake_error_429_rate,
+            error_500_rate=settings.ai_fake_error_500_rate,
+            timeout_rate=settings.ai_fake_timeout_rate,
+            timeout_seconds=settings.ai_fake_timeout_seconds,
+            connect_latency_ms=settings.ai_fake_connect_latency_ms,
+            connection_pool_size=settings.ai_transport_pool_size,
+            connection_idle_seconds=settings.ai_transport_keepalive_seconds,
+            seed=settings.ai_fake_seed
+        ), model_name=model_name)
 
     @staticmethod
     def get_service_info() -> dict:
@@ -35,7 +308,9 @@ class AIServiceFactory:
         """
         return {
             "service": "Gemini Direct API",
-            "model": "gemini-2.0-flash", 
+            "model": ",".join(settings.get_ai_models()) if settings.ai_backend != "fake" else "gemini-fake",
+            "api_keys": len(settings.get_google_api_keys()),
+            "backend": settings.ai_backend,
             "api_key_configured": bool(settings.get_google_api_key()),
             "use_vertex_ai": False,
             "note": "Only Gemini Direct API is supported in this configuration"
@@ -0,0 +1,89 @@
+"""
+Hedged requests para recortar la latencia de cola de Gemini
+"""
+from collections import deque
+from typing import Optional
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+class HedgingPolicy:
+    """Decides when (and whether) to send a duplicate request"""
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_hedge_fraction: float = 0.05,
+        min_samples: int = 20,
+        window_size: int = 200,
+        max_threads: int = 64
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        if not 0 <= max_hedge_fraction <= 1:
+            raise ValueError("max_hedge_fraction must be between 0 and 1")
+        if max_threads < 2:
+            raise ValueError("max_threads must be at least 2 (primary and hedge)")
+
+        self.percentile = percentile
+        self.max_hedge_fraction = max_hedge_fraction
+        self.min_samples = min_samples
+        self.max_threads = max_threads
+        self._latencies = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+        self._primary_wins = 0
+
+    def start(self) -> Optional[float]:
+        """Count a request and return the hedge delay (None until enough samples were seen)"""
+        with self._lock:
+            self._requests += 1
+            return self._threshold()
+
+    def try_hedge(self) -> bool:
+        """Reserve a hedge if the hedged fraction stays within the cap"""
+        with self._lock:
+            if self._hedged + 1 > self.max_hedge_fraction * self._requests:
+                return False
+            self._hedged += 1
+            return True
+
+    def record_latency(self, latency: float) -> None:
+        """Feed the latency of a successful call"""
+        with self._lock:
+            self._latencies.append(latency)
+
+    def record_win(self, hedge: bool) -> None:
+        """Record which request of a hedged pair answered first"""
+        with self._lock:
+            if hedge:
+                self._hedge_wins += 1
+            else:
+                self._primary_wins += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            threshold = self._threshold()
+            decided = self._hedge_wins + self._primary_wins
+            return {
+                "percentile": self.percentile,
+                "threshold_seconds": round(threshold, 4) if threshold is not None else None,
+                "samples": len(self._latencies),
+                "requests": self._requests,
+                "hedged": self._hedged,
+                "hedge_rate": round(self._hedged / self._requests, 4) if self._requests else 0.0,
+                "max_hedge_fraction": self.max_hedge_fraction,
+                "hedge_wins": self._hedge_wins,
+                "primary_wins": self._primary_wins,
+                "hedge_win_rate": round(self._hedge_wins / decided, 4) if decided else 0.0
+            }
+
+    def _threshold(self) -> Optional[float]:
+        """Percentile of the recent latencies (caller holds the lock)"""
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[int(self.percentile * (len(ordered) - 1))]
@@ -0,0 +1,132 @@
+"""
+Límite de concurrencia adaptativo para llamadas de AI (AIMD guiado por latencia)
+"""
+from collections import deque
+from statistics import median
+import asyncio
+import logging
+import threading
+import time
+from .exceptions import AIConcurrencyLimitError
+
+logger = logging.getLogger(__name__)
+
+OVERLOAD_STATUS_CODES = {429, 503, 504}
+
+def is_overload_error(error: BaseException) -> bool:
+    """Errors that signal Gemini is saturated: 429, 503, 504 and timeouts"""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)):
+        return True
+    code = getattr(error, "code", None)
+    return isinstance(code, int) and code in OVERLOAD_STATUS_CODES
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase / multiplicative-decrease limit on in-flight AI calls"""
+
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_tolerance: float = 2.0,
+        backoff_ratio: float = 0.9,
+        window_size: int = 100,
+        max_wait_seconds: float = 10.0
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff_ratio = backoff_ratio
+        self.max_wait_seconds = max_wait_seconds
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._latencies = deque(maxlen=window_size)
+        self._condition = threading.Condition()
+        self._increases = 0
+        self._decreases = 0
+        self._rejected = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def acquire(self) -> None:
+        """Block until an in-flight permit is available"""
+        deadline = time.monotonic() + self.max_wait_seconds
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._reject()
+                self._condition.wait(remaining)
+            self._in_flight += 1
+
+    async def acquire_async(self) -> None:
+        """Async twin of acquire (polls instead of blocking the event loop)"""
+        deadline = time.monotonic() + self.max_wait_seconds
+        while True:
+            with self._condition:
+                if self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return
+                if time.monotonic() >= deadline:
+                    self._reject()
+            await asyncio.sleep(0.01)
+
+    def cancel(self) -> None:
+        """Return a permit without feeding a latency sample (the call never happened)"""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def release(self, latency: float, overloaded: bool = False, neutral: bool = False) -> None:
+        """Return a permit and adapt the limit from the observed latency / outcome.
+        
+        neutral: the call failed for a reason unrelated to load, the limit is left as is.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if neutral and not overloaded:
+                self._condition.notify_all()
+                return
+            baseline = median(self._latencies) if self._latencies else None
+
+            if overloaded or (baseline is not None and latency > baseline * self.latency_tolerance):
+                new_limit = max(self.min_limit, self._limit * self.backoff_ratio)
+                if int(new_limit) < int(self._limit):
+                    logger.info(f"AI concurrency limit decreased to {int(new_limit)}")
+                    self._decreases += 1
+                self._limit = new_limit
+            elif self._in_flight + 1 >= int(self._limit) * 0.5:
+                # Only grow while the current limit is actually being used
+                new_limit = min(self.max_limit, self._limit + 1 / self._limit)
+                if int(new_limit) > int(self._limit):
+                    self._increases += 1
+                self._limit = new_limit
+
+            if not overloaded:
+                self._latencies.append(latency)
+            self._condition.notify_all()
+
+    def get_stats(self) -> dict:
+        with self._condition:
+            return {
+                "limit": int(self._limit),
+                "min_limit": self.min_limit,
+                "max_limit": self.max_limit,
+                "in_flight": self._in_flight,
+                "p50_latency_ms": round(median(self._latencies) * 1000, 2) if self._latencies else None,
+                "increases": self._increases,
+                "decreases": self._decreases,
+                "rejected": self._rejected
+            }
+
+    def _reject(self) -> None:
+        self._rejected += 1
+        raise AIConcurrencyLimitError(
+            f"No AI concurrency permit available (limit {int(self._limit)})",
+            "Adaptive Limiter"
+        )
@@ -0,0 +1,155 @@
+"""
+Contabilidad de tokens y latencia por operación de AI
+"""
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+import math
+import threading
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+TOKEN_BUCKETS = (32, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+SUCCESS = "success"
+EMPTY = "empty"
+ERROR = "error"
+FALLBACK = "fallback"
+CACHE_HIT = "cache_hit"
+REJECTED = "rejected"  # Answer failed validation (routed to a fallback model tier)
+OUTCOMES = (SUCCESS, EMPTY, ERROR, FALLBACK, CACHE_HIT, REJECTED)
+RECENT_LATENCY_SAMPLES = 50
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative, Prometheus style); not thread-safe on its own"""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self._counts[index] += 1
+        self._count += 1
+        self._sum += value
+        self._max = max(self._max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (the max for the overflow bucket)"""
+        if not self._count:
+            return None
+        rank = math.ceil(q * self._count)
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self._max
+        return self._max
+
+    def snapshot(self) -> dict:
+        cumulative = {}
+        seen = 0
+        for bound, count in zip(self.buckets, self._counts):
+            seen += count
+            cumulative[str(bound)] = seen
+        cumulative["+Inf"] = self._count
+        return {
+            "count": self._count,
+            "sum": round(self._sum, 4),
+            "mean": round(self._sum / self._count, 4) if self._count else None,
+            "max": round(self._max, 4) if self._count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": cumulative
+        }
+
+class _OperationMetrics:
+    def __init__(self):
+        self.outcomes = {outcome: 0 for outcome in OUTCOMES}
+        self.latency_seconds = Histogram(LATENCY_BUCKETS)
+        self.prompt_tokens = Histogram(TOKEN_BUCKETS)
+        self.output_tokens = Histogram(TOKEN_BUCKETS)
+        self.total_prompt_tokens = 0
+        self.total_output_tokens = 0
+
+class AIMetrics:
+    """Per-operation latency/token histograms and outcome counters"""
+
+    def __init__(self):
+        self._operations: Dict[str, _OperationMetrics] = {}
+        self._lock = threading.Lock()
+        self._recent_latencies = deque(maxlen=RECENT_LATENCY_SAMPLES)
+        self._last_success_at: Optional[datetime] = None
+        self._last_failure_at: Optional[datetime] = None
+
+    def record_call(self, operation: str, latency: float, outcome: str) -> None:
+        """Record the wall-clock latency and outcome of a generation (retries included)"""
+        with self._lock:
+            metrics = self._get(operation)
+            metrics.outcomes[outcome] += 1
+            metrics.latency_seconds.observe(latency)
+            self._recent_latencies.append(latency)
+            if outcome == SUCCESS:
+                self._last_success_at = datetime.utcnow()
+            else:
+                self._last_failure_at = datetime.utcnow()
+
+    def record_tokens(self, operation: str, prompt_tokens: Optional[int], output_tokens: Optional[int]) -> None:
+        """Record the usage_metadata of one model response"""
+        with self._lock:
+            metrics = self._get(operation)
+            if prompt_tokens is not None:
+                metrics.prompt_tokens.observe(prompt_tokens)
+                metrics.total_prompt_tokens += prompt_tokens
+            if output_tokens is not None:
+                metrics.output_tokens.observe(output_tokens)
+                metrics.total_output_tokens += output_tokens
+
+    def record_outcome(self, operation: str, outcome: str) -> None:
+        """Count an outcome that involved no model call (cache hit, fallback)"""
+        with self._lock:
+            self._get(operation).outcomes[outcome] += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                operation: {
+                    "outcomes": dict(metrics.outcomes),
+                    "latency_seconds": metrics.latency_seconds.snapshot(),
+                    "prompt_tokens": metrics.prompt_tokens.snapshot(),
+                    "output_tokens": metrics.output_tokens.snapshot(),
+                    "total_prompt_tokens": metrics.total_prompt_tokens,
+                    "total_output_tokens": metrics.total_output_tokens
+                }
+                for operation, metrics in sorted(self._operations.items())
+            }
+
+    def get_liveness(self) -> dict:
+        """Last success/failure of any model call and latency percentiles of the most recent ones"""
+        with self._lock:
+            latencies = sorted(self._recent_latencies)
+            last_success_at, last_failure_at = self._last_success_at, self._last_failure_at
+
+        def percentile(q: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, math.ceil(q * len(latencies)) - 1)], 4)
+
+        return {
+            "last_success_at": last_success_at.isoformat() if last_success_at else None,
+            "last_failure_at": last_failure_at.isoformat() if last_failure_at else None,
+            "recent_latency_seconds": {
+                "samples": len(latencies),
+                "p50": percentile(0.5),
+                "p95": percentile(0.95)
+            }
+        }
+
+    def _get(self, operation: str) -> _OperationMetrics:
+        """Metrics of an operation (caller holds the lock)"""
+        metrics = self._operations.get(operation)
+        if metrics is None:
+            metrics = self._operations[operation] = _OperationMetrics()
+        return metrics
@@ -0,0 +1,234 @@
+"""
+Pool de claves de API y modelos de Gemini
+"""
+from collections import deque
+from typing import Any, List, Optional, Sequence
+import hashlib
+import logging
+import threading
+import time
+from .ai_transport import TransportConfig, build_generative_async_client, build_generative_client
+from .exceptions import AIConfigurationError
+
+logger = logging.getLogger(__name__)
+
+UNHEALTHY_CONSECUTIVE_ERRORS = 3
+QUOTA_WINDOW_SECONDS = 60.0
+
+def is_rate_limited(error: BaseException) -> bool:
+    """True for 429 / RESOURCE_EXHAUSTED errors"""
+    return getattr(error, "code", None) == 429 or type(error).__name__ == "ResourceExhausted"
+
+def create_gemini_member_model(
+    api_key: str,
+    model_name: str,
+    transport: Optional[TransportConfig] = None,
+    allow_global_client: bool = True
+) -> Any:
+    """GenerativeModel bound to its own clients for api_key (no global configuration).
+    
+    Uses private SDK attributes (GenerativeModel._client/_async_client, _ClientManager and the
+    REST session) checked against the google-generativeai range pinned in pyproject.toml; if an
+    upgrade removes them the model falls back to the global genai.configure client, unless
+    allow_global_client is False (several keys cannot share one global client).
+    """
+    import google.generativeai as genai
+    from google.generativeai import client as genai_client
+
+    model = genai.GenerativeModel(model_name)
+    try:
+        if not hasattr(model, "_client") or not hasattr(model, "_async_client"):
+            raise AttributeError("GenerativeModel has no _client/_async_client")
+        if transport is not None:
+            client = build_generative_client(api_key, transport)
+            async_client_factory = lambda: build_generative_async_client(api_key, transport)
+        else:
+            manager = genai_client._ClientManager()
+            manager.configure(api_key=api_key)
+            client = manager.make_client("generative")
+            async_client_factory = lambda: manager.make_client("generative_async")
+    except AttributeError as e:
+        if not allow_global_client:
+            raise AIConfigurationError(
+                f"Unsupported google-generativeai internals ({e}): per-key clients cannot be "
+                "built, so a multi-key pool would send every call with the last configured key"
+            ) from e
+        logger.warning(f"⚠️ Unsupported google-generativeai internals ({e}), {model_name} uses the global client")
+        genai.configure(api_key=api_key, **({"transport": transport.kind} if transport is not None else {}))
+        return genai.GenerativeModel(model_name)
+
+    model._client = client
+    # grpc.aio channels bind to the running event loop: the async client is made on first async call
+    model._member_async_client_factory = async_client_factory
+    return model
+
+def bind_async_client(model: Any) -> None:
+    """Create the member's own async client if it does not have one yet"""
+    factory = getattr(model, "_member_async_client_factory", None)
+    if factory is not None and model._async_client is None:
+        model._async_client = factory()
+
+class PoolMember:
+    """One (API key, model) pair with its load, health and quota counters"""
+
+    def __init__(self, name: str, model: Any, requests_per_minute: Optional[int] = None):
+        self.name = name
+        self.model = model
+        self.requests_per_minute = requests_per_minute
+        self.in_flight = 0
+        self.successes = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.consecutive_errors = 0
+        self.evictions = 0
+        self.evicted_until = 0.0
+        self.latency_ewma: Optional[float] = None
+        self._window = deque()  # (timestamp, tokens) of recent requests
+
+    def is_evicted(self, now: float) -> bool:
+        return self.evicted_until > now
+
+    def requests_last_minute(self, now: float) -> int:
+        self._trim(now)
+        return len(self._window)
+
+    def has_quota(self, now: float) -> bool:
+        return self.requests_per_minute is None or self.requests_last_minute(now) < self.requests_per_minute
+
+    def record_request(self, now: float) -> None:
+        self._window.append([now, 0])
+
+    def record_tokens(self, tokens: Optional[int]) -> None:
+        if tokens and self._window:
+            self._window[-1][1] += tokens
+
+    def get_stats(self, now: float) -> dict:
+        self._trim(now)
+        return {
+            "member": self.name,
+            "in_flight": self.in_flight,
+            "successes": self.successes,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "evictions": self.evictions,
+            "evicted_for_seconds": round(max(self.evicted_until - now, 0.0), 2),
+            "latency_ewma_seconds": round(self.latency_ewma, 4) if self.latency_ewma is not None else None,
+            "requests_last_minute": len(self._window),
+            "tokens_last_minute": sum(tokens for _, tokens in self._window),
+            "requests_per_minute_limit": self.requests_per_minute
+        }
+
+    def _trim(self, now: float) -> None:
+        while self._window and self._window[0][0] <= now - QUOTA_WINDOW_SECONDS:
+            self._window.popleft()
+
+class GeminiModelPool:
+    """Routes generate_content calls across several API keys / models"""
+
+    def __init__(self, members: Sequence[PoolMember], eviction_seconds: float = 30.0):
+        if not members:
+            raise ValueError("A model pool needs at least one member")
+
+        self.members: List[PoolMember] = list(members)
+        self.eviction_seconds = eviction_seconds
+        self._lock = threading.Lock()
+        # Stable identity for cache keys: responses may differ between models
+        self.model_name = "pool:" + ",".join(sorted({
+            getattr(member.model, "model_name", member.name) for member in self.members
+        }))
+
+    def generate_content(self, contents: Any, *args, **kwargs) -> Any:
+        member, started = self._acquire()
+        try:
+            response = member.model.generate_content(contents, *args, **kwargs)
+        except Exception as e:
+            self._release(member, started, e, None)
+            raise
+        self._release(member, started, None, response)
+        return response
+
+    async def generate_content_async(self, contents: Any, *args, **kwargs) -> Any:
+        member, started = self._acquire()
+        try:
+            bind_async_client(member.model)
+            response = await member.model.generate_content_async(contents, *args, **kwargs)
+        except Exception as e:
+            self._release(member, started, e, None)
+            raise
+        self._release(member, started, None, response)
+        return response
+
+    def count_tokens(self, contents: Any, **kwargs) -> Any:
+        return self.members[0].model.count_tokens(contents, **kwargs)
+
+    async def count_tokens_async(self, contents: Any, **kwargs) -> Any:
+        return await self.members[0].model.count_tokens_async(contents, **kwargs)
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            members = [member.get_stats(now) for member in self.members]
+        return {
+            "members": members,
+            "available": sum(1 for m in members if not m["evicted_for_seconds"]),
+            "eviction_seconds": self.eviction_seconds
+        }
+
+    def _acquire(self):
+        """Pick the least-loaded healthy member and count the call against it"""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [m for m in self.members if not m.is_evicted(now) and m.has_quota(now)]
+            if not candidates:
+                # Everyone is evicted or out of quota: use whoever recovers first
+                candidates = [min(self.members, key=lambda m: m.evicted_until)]
+            member = min(candidates, key=lambda m: (
+                m.consecutive_errors >= UNHEALTHY_CONSECUTIVE_ERRORS,
+                m.in_flight,
+                m.latency_ewma or 0.0
+            ))
+            member.in_flight += 1
+            member.record_request(now)
+        return member, now
+
+    def _release(self, member: PoolMember, started: float, error: Optional[BaseException], response: Any) -> None:
+        now = time.monotonic()
+        with self._lock:
+            member.in_flight -= 1
+            if error is None:
+                member.successes += 1
+                member.consecutive_errors = 0
+                latency = now - started
+                member.latency_ewma = latency if member.latency_ewma is None else 0.8 * member.latency_ewma + 0.2 * latency
+                usage = getattr(response, "usage_metadata", None)
+                tokens = getattr(usage, "total_token_count", None)
+                member.record_tokens(tokens if isinstance(tokens, int) else None)
+                return
+
+            member.errors += 1
+            member.consecutive_errors += 1
+            if is_rate_limited(error):
+                member.rate_limited += 1
+                member.evictions += 1
+                member.evicted_until = now + self.eviction_seconds
+                logger.warning(f"Gemini pool member {member.name} rate limited, evicted for {self.eviction_seconds:.0f}s")
+
+def build_gemini_pool(
+    api_keys: Sequence[str],
+    model_names: Sequence[str],
+    eviction_seconds: float = 30.0,
+    requests_per_minute: Optional[int] = None,
+    transport: Optional[TransportConfig] = None
+) -> GeminiModelPool:
+    """One member per (API key, model) combination"""
+    single_key = len(set(api_keys)) <= 1
+    members = []
+    for api_key in api_keys:
+        key_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8]
+        for model_name in model_names:
+            members.append(PoolMember(
+                name=f"{model_name}@key-{key_id}",
+                model=create_gemini_member_model(api_key, model_name, transport, allow_global_client=single_key),
+                requests_per_minute=requests_per_minute
+            ))
+    return GeminiModelPool(members, eviction_seconds=eviction_seconds)
@@ -0,0 +1,217 @@
+"""
+Gobernador de cuota de Gemini compartido entre procesos
+"""
+from typing import IO, Any, Optional
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from .exceptions import AIQuotaExceededError
+from .prompts import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+SLOT_POLL_SECONDS = 0.05
+
+def estimate_request_tokens(prompt: str, generation_config: Any = None) -> int:
+    """Rough token cost of a request: prompt (~4 chars/token) plus the output ceiling"""
+    if isinstance(generation_config, dict):
+        max_output = generation_config.get("max_output_tokens")
+    else:
+        max_output = getattr(generation_config, "max_output_tokens", None)
+    return estimate_tokens(prompt) + (max_output or 0)
+
+class QuotaLease:
+    """Quota held by one in-flight request"""
+
+    def __init__(self, tokens: int, slot: IO):
+        self.tokens = tokens
+        self._slot = slot
+
+    def close(self) -> None:
+        if self._slot is not None:
+            fcntl.flock(self._slot, fcntl.LOCK_UN)
+            self._slot.close()
+            self._slot = None
+
+class QuotaGovernor:
+    """Requests/min and tokens/min token buckets plus a max-concurrency limit, shared via file locks"""
+
+    def __init__(
+        self,
+        state_dir: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int,
+        max_wait_seconds: float = 10.0
+    ):
+        if requests_per_minute <= 0 or tokens_per_minute <= 0 or max_concurrency <= 0:
+            raise ValueError("Quota limits must be positive")
+
+        os.makedirs(state_dir, exist_ok=True)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self.max_wait_seconds = max_wait_seconds
+        self._state_path = os.path.join(state_dir, "buckets.json")
+        self._lock_path = os.path.join(state_dir, "buckets.lock")
+        self._slot_paths = [os.path.join(state_dir, f"slot-{i}.lock") for i in range(max_concurrency)]
+        self._stats_lock = threading.Lock()
+        self._acquired = 0
+        self._throttled = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+
+    def acquire(self, tokens: int) -> QuotaLease:
+        """Block until a request of `tokens` fits the buckets and a concurrency slot is free"""
+        started = time.monotonic()
+        deadline = started + self.max_wait_seconds
+
+        while True:
+            wait = self._try_take(tokens)
+            if wait == 0:
+                break
+            self._wait_or_reject(wait, deadline)
+            time.sleep(min(wait, max(0.0, deadline - time.monotonic())))
+
+        while True:
+            slot = self._try_acquire_slot()
+            if slot is not None:
+                break
+            self._wait_or_reject(SLOT_POLL_SECONDS, deadline, refund=tokens)
+            time.sleep(SLOT_POLL_SECONDS)
+
+        self._record_acquired(time.monotonic() - started)
+        return QuotaLease(tokens, slot)
+
+    async def acquire_async(self, tokens: int) -> QuotaLease:
+        """Async twin of acquire: waits with asyncio.sleep instead of blocking the loop"""
+        started = time.monotonic()
+        deadline = started + self.max_wait_seconds
+
+        while True:
+            wait = self._try_take(tokens)
+            if wait == 0:
+                break
+            self._wait_or_reject(wait, deadline)
+            await asyncio.sleep(min(wait, max(0.0, deadline - time.monotonic())))
+
+        while True:
+            slot = self._try_acquire_slot()
+            if slot is not None:
+                break
+            self._wait_or_reject(SLOT_POLL_SECONDS, deadline, refund=tokens)
+            await asyncio.sleep(SLOT_POLL_SECONDS)
+
+        self._record_acquired(time.monotonic() - started)
+        return QuotaLease(tokens, slot)
+
+    def release(self, lease: QuotaLease, used_tokens: Optional[int] = None) -> None:
+        """Free the concurrency slot and return unused estimated tokens to the bucket"""
+        lease.close()
+        if used_tokens is not None and used_tokens < lease.tokens:
+            self._refund(lease.tokens - used_tokens)
+
+    def get_stats(self) -> dict:
+        state = self._read_state()
+        with self._stats_lock:
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "max_concurrency": self.max_concurrency,
+                "available_requests": round(state["requests"], 2),
+                "available_tokens": int(state["tokens"]),
+                "acquired": self._acquired,
+                "throttled": self._throttled,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_seconds / self._acquired * 1000, 2) if self._acquired else 0.0
+            }
+
+    def _wait_or_reject(self, wait: float, deadline: float, refund: int = 0) -> None:
+        """Raise if waiting `wait` more seconds would exceed the deadline"""
+        if time.monotonic() + wait > deadline:
+            if refund:
+                self._refund(refund, requests=1)
+            with self._stats_lock:
+                self._rejected += 1
+            raise AIQuotaExceededError(
+                f"Client-side Gemini quota exhausted (waited more than {self.max_wait_seconds}s)",
+                "Quota Governor"
+            )
+
+    def _record_acquired(self, waited: float) -> None:
+        with self._stats_lock:
+            self._acquired += 1
+            self._wait_seconds += waited
+            if waited > SLOT_POLL_SECONDS:
+                self._throttled += 1
+
+    def _try_take(self, tokens: int) -> float:
+        """Take one request and `tokens` from the shared buckets; return 0 or the seconds to wait"""
+        # A request bigger than the whole bucket could never pass: cap it at the capacity
+        tokens = min(tokens, self.tokens_per_minute)
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            state = self._refill(self._read_state())
+
+            if state["requests"] >= 1 and state["tokens"] >= tokens:
+                state["requests"] -= 1
+                state["tokens"] -= tokens
+                self._write_state(state)
+                return 0
+
+            self._write_state(state)
+            request_wait = max(0.0, 1 - state["requests"]) * 60 / self.requests_per_minute
+            token_wait = max(0.0, tokens - state["tokens"]) * 60 / self.tokens_per_minute
+            return max(request_wait, token_wait, 0.001)
+
+    def _refund(self, tokens: int, requests: int = 0) -> None:
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            state = self._refill(self._read_state())
+            state["tokens"] = min(self.tokens_per_minute, state["tokens"] + tokens)
+            state["requests"] = min(self.requests_per_minute, state["requests"] + requests)
+            self._write_state(state)
+
+    def _try_acquire_slot(self) -> Optional[IO]:
+        """Lock the first free concurrency slot file (non-blocking)"""
+        for path in self._slot_paths:
+            slot = open(path, "a")
+            try:
+                fcntl.flock(slot, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return slot
+            except BlockingIOError:
+                slot.close()
+        return None
+
+    def _refill(self, state: dict) -> dict:
+        now = time.time()
+        elapsed = max(0.0, now - state["updated_at"])
+        state["requests"] = min(
+            self.requests_per_minute, state["requests"] + elapsed * self.requests_per_minute / 60
+        )
+        state["tokens"] = min(
+            self.tokens_per_minute, state["tokens"] + elapsed * self.tokens_per_minute / 60
+        )
+        state["updated_at"] = now
+        return state
+
+    def _read_state(self) -> dict:
+        try:
+            with open(self._state_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {
+                "requests": float(self.requests_per_minute),
+                "tokens": float(self.tokens_per_minute),
+                "updated_at": time.time()
+            }
+
+    def _write_state(self, state: dict) -> None:
+        tmp_path = f"{self._state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._state_path)
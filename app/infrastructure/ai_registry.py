@@ -0,0 +1,83 @@
+"""
+Registro del servicio de AI compartido por todo el proceso
+"""
+from datetime import datetime
+from typing import Callable, Optional
+import logging
+import threading
+from .external_services import GeminiAIService
+
+logger = logging.getLogger(__name__)
+
+class AIServiceRegistry:
+    """Process-wide holder of the single GeminiAIService instance"""
+
+    def __init__(self, factory: Callable[[], GeminiAIService] = GeminiAIService):
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._service: Optional[GeminiAIService] = None
+        self._service_info: Optional[dict] = None
+        self._initialized_at: Optional[datetime] = None
+        self._init_error: Optional[str] = None
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._service is not None
+
+    def initialize(self) -> GeminiAIService:
+        """Build the service once; later calls return the same instance"""
+        with self._lock:
+            if self._service is None:
+                try:
+                    service = self._factory()
+                except Exception as e:
+                    self._init_error = str(e)
+                    raise
+                self._service_info = service.get_service_info()
+                self._initialized_at = datetime.utcnow()
+                self._init_error = None
+                self._service = service
+                logger.info(f"🧩 AI service registered: {self._service_info.get('model')}")
+            return self._service
+
+    def get(self) -> GeminiAIService:
+        """Shared instance (initialized lazily when startup did not do it, e.g. scripts)"""
+        service = self._service
+        return service if service is not None else self.initialize()
+
+    def health(self) -> dict:
+        """Liveness snapshot for /ai-status, built from cached state only"""
+        service = self._service
+        if service is None:
+            return {
+                "status": "error",
+                "message": (
+                    f"AI service error: {self._init_error}" if self._init_error
+                    else "AI service not initialized"
+                ),
+                "service": "Gemini Direct API"
+            }
+        
+        health = service.get_health()
+        breaker = health["circuit_breaker"]
+        degraded = breaker is not None and breaker["state"] != "closed"
+        return {
+            **self._service_info,
+            **health,
+            "status": "degraded" if degraded else "healthy",
+            "message": (
+                "Gemini AI service is failing, descriptions use the fallback"
+                if degraded else "Gemini AI service is working correctly"
+            ),
+            "initialized_at": self._initialized_at.isoformat()
+        }
+
+    def reset(self) -> None:
+        """Drop the instance (tests, configuration reloads)"""
+        with self._lock:
+            self._service = None
+            self._service_info = None
+            self._initialized_at = None
+            self._init_error = None
+
+ai_service_registry = AIServiceRegistry()
@@ -0,0 +1,112 @@
+"""
+Enrutado de operaciones de AI por niveles de latencia
+"""
+from dataclasses import dataclass, is_dataclass, replace
+from typing import Any, Dict, List, Optional, Sequence
+import threading
+from .ai_metrics import Histogram, LATENCY_BUCKETS
+
+@dataclass(frozen=True)
+class ModelTier:
+    """A model with its generation overrides and latency objective"""
+    name: str
+    model_name: str
+    latency_slo_seconds: float
+    max_output_tokens: Optional[int] = None  # Cap on top of the PromptBudget value
+    temperature: Optional[float] = None
+    fallback: Optional[str] = None  # Tier used when this tier's answer fails validation
+
+class _TierMetrics:
+    def __init__(self):
+        self.latency_seconds = Histogram(LATENCY_BUCKETS)
+        self.calls = 0
+        self.errors = 0
+        self.slo_breaches = 0
+        self.fallbacks = 0
+
+class ModelRoutingTable:
+    """Operation -> tier mapping with per-tier latency accounting"""
+
+    def __init__(self, tiers: Sequence[ModelTier], operations: Dict[str, str], default_tier: str):
+        self._tiers = {tier.name: tier for tier in tiers}
+        if len(self._tiers) != len(tiers):
+            raise ValueError("Tier names must be unique")
+        for name in [default_tier, *operations.values()]:
+            if name not in self._tiers:
+                raise ValueError(f"Unknown model tier: {name}")
+        for tier in tiers:
+            self._check_fallback_chain(tier)
+
+        self._operations = dict(operations)
+        self.default_tier = default_tier
+        self._metrics = {name: _TierMetrics() for name in self._tiers}
+        self._lock = threading.Lock()
+
+    @property
+    def tiers(self) -> List[ModelTier]:
+        return list(self._tiers.values())
+
+    def tier_for(self, operation: str) -> ModelTier:
+        return self._tiers[self._operations.get(operation, self.default_tier)]
+
+    def fallback_for(self, tier: ModelTier) -> Optional[ModelTier]:
+        return self._tiers[tier.fallback] if tier.fallback else None
+
+    def config_for(self, tier: ModelTier, config: Any) -> Any:
+        """Apply the tier's overrides to a GenerationConfig"""
+        if not is_dataclass(config):
+            return config
+        overrides = {}
+        if tier.max_output_tokens is not None and config.max_output_tokens is not None:
+            overrides["max_output_tokens"] = min(config.max_output_tokens, tier.max_output_tokens)
+        if tier.temperature is not None:
+            overrides["temperature"] = tier.temperature
+        return replace(config, **overrides) if overrides else config
+
+    def record_latency(self, tier_name: str, latency: float, success: bool) -> None:
+        """Record one model call served by a tier"""
+        tier = self._tiers[tier_name]
+        with self._lock:
+            metrics = self._metrics[tier_name]
+            metrics.calls += 1
+            metrics.latency_seconds.observe(latency)
+            if not success:
+                metrics.errors += 1
+            if latency > tier.latency_slo_seconds:
+                metrics.slo_breaches += 1
+
+    def record_fallback(self, tier_name: str) -> None:
+        with self._lock:
+            self._metrics[tier_name].fallbacks += 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            tiers = {
+                name: {
+                    "model": tier.model_name,
+                    "latency_slo_seconds": tier.latency_slo_seconds,
+                    "max_output_tokens": tier.max_output_tokens,
+                    "fallback": tier.fallback,
+                    "calls": self._metrics[name].calls,
+                    "errors": self._metrics[name].errors,
+                    "slo_breaches": self._metrics[name].slo_breaches,
+                    "fallbacks": self._metrics[name].fallbacks,
+                    "latency_seconds": self._metrics[name].latency_seconds.snapshot()
+                }
+                for name, tier in self._tiers.items()
+            }
+        return {
+            "default_tier": self.default_tier,
+            "operations": dict(self._operations),
+            "tiers": tiers
+        }
+
+    def _check_fallback_chain(self, tier: ModelTier) -> None:
+        seen = {tier.name}
+        while tier.fallback:
+            if tier.fallback not in self._tiers:
+                raise ValueError(f"Unknown fallback tier: {tier.fallback}")
+            if tier.fallback in seen:
+                raise ValueError(f"Fallback cycle through tier: {tier.fallback}")
+            seen.add(tier.fallback)
+            tier = self._tiers[tier.fallback]
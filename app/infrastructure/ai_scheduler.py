@@ -0,0 +1,212 @@
+"""
+Planificador de llamadas de AI por prioridad
+"""
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, Optional
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from .ai_metrics import Histogram
+from .exceptions import AIConcurrencyLimitError
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BATCH, BACKGROUND)
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_priority: contextvars.ContextVar[str] = contextvars.ContextVar("ai_priority", default=INTERACTIVE)
+
+def get_current_priority() -> str:
+    return _current_priority.get()
+
+@contextmanager
+def ai_priority(priority: Optional[str]) -> Iterator[None]:
+    """Run the AI calls of the block with the given priority (None keeps the current one)"""
+    if priority is None:
+        yield
+        return
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown AI priority: {priority}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+class _Waiter:
+    """A queued acquire; granted by whichever thread releases a slot"""
+
+    def __init__(self, priority: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self._loop = loop
+        self._event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+
+    def grant(self) -> None:
+        self.granted = True
+        if self._loop is None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._resolve)
+
+    def wait(self, timeout: float) -> None:
+        self._event.wait(timeout)
+
+    def _resolve(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+class _PriorityClass:
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.queue: Deque[_Waiter] = deque()
+        self.virtual_time = 0.0
+        self.in_flight = 0
+        self.dispatched = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self.wait_seconds = Histogram(WAIT_BUCKETS)
+
+class PriorityScheduler:
+    """Weighted fair admission of AI calls with a reserved interactive share"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        weights: Optional[Dict[str, float]] = None,
+        interactive_reserved: int = 4,
+        max_wait_seconds: float = 30.0
+    ):
+        weights = weights or {INTERACTIVE: 8.0, BATCH: 3.0, BACKGROUND: 1.0}
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer")
+        if not 0 <= interactive_reserved < max_concurrency:
+            raise ValueError("interactive_reserved must be between 0 and max_concurrency - 1")
+        if set(weights) != set(PRIORITIES) or any(weight <= 0 for weight in weights.values()):
+            raise ValueError(f"weights needs a positive weight for each of {', '.join(PRIORITIES)}")
+
+        self.max_concurrency = max_concurrency
+        self.interactive_reserved = interactive_reserved
+        self.max_wait_seconds = max_wait_seconds
+        self._classes = {priority: _PriorityClass(weights[priority]) for priority in PRIORITIES}
+        self._virtual_time = 0.0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, priority: Optional[str] = None) -> None:
+        """Block until the scheduler admits a call of this priority"""
+        waiter = self._enqueue(priority)
+        if waiter is None:
+            return
+        waiter.wait(self.max_wait_seconds)
+        if not waiter.granted:
+            self._abandon(waiter)
+
+    async def acquire_async(self, priority: Optional[str] = None) -> None:
+        """Async twin of acquire (waits on a future instead of blocking the event loop)"""
+        waiter = self._enqueue(priority, asyncio.get_running_loop())
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+        except asyncio.CancelledError:
+            self._abandon(waiter, cancelled=True)
+            raise
+
+    def release(self, priority: Optional[str] = None) -> None:
+        """Return the slot taken by acquire() and admit the next waiters"""
+        with self._lock:
+            self._in_flight -= 1
+            self._classes[priority or get_current_priority()].in_flight -= 1
+            self._dispatch()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "interactive_reserved": self.interactive_reserved,
+                "in_flight": self._in_flight,
+                "classes": {
+                    priority: {
+                        "weight": cls.weight,
+                        "queue_depth": len(cls.queue),
+                        "max_queue_depth": cls.max_depth,
+                        "in_flight": cls.in_flight,
+                        "dispatched": cls.dispatched,
+                        "rejected": cls.rejected,
+                        "wait_seconds": cls.wait_seconds.snapshot()
+                    }
+                    for priority, cls in self._classes.items()
+                }
+            }
+
+    def _enqueue(self, priority: Optional[str], loop: Optional[asyncio.AbstractEventLoop] = None) -> Optional[_Waiter]:
+        """Admit immediately (returns None) or queue a waiter"""
+        priority = priority or get_current_priority()
+        with self._lock:
+            cls = self._classes[priority]
+            if not cls.queue:
+                # An idle class starts at the current virtual time (no credit saved while idle)
+                cls.virtual_time = max(cls.virtual_time, self._virtual_time)
+            waiter = _Waiter(priority, loop)
+            cls.queue.append(waiter)
+            cls.max_depth = max(cls.max_depth, len(cls.queue))
+            self._dispatch()
+            if waiter.granted:
+                return None
+            return waiter
+
+    def _dispatch(self) -> None:
+        """Grant free slots to the eligible class with the lowest virtual time (lock held)"""
+        while self._in_flight < self.max_concurrency:
+            shared_full = self._in_flight >= self.max_concurrency - self.interactive_reserved
+            candidates = [
+                (cls.virtual_time, index, priority)
+                for index, (priority, cls) in enumerate(self._classes.items())
+                if cls.queue and (priority == INTERACTIVE or not shared_full)
+            ]
+            if not candidates:
+                return
+            _, _, priority = min(candidates)
+            cls = self._classes[priority]
+            waiter = cls.queue.popleft()
+            cls.virtual_time += 1.0 / cls.weight
+            self._virtual_time = cls.virtual_time
+            cls.in_flight += 1
+            cls.dispatched += 1
+            cls.wait_seconds.observe(time.monotonic() - waiter.enqueued_at)
+            self._in_flight += 1
+            waiter.grant()
+
+    def _abandon(self, waiter: _Waiter, cancelled: bool = False) -> None:
+        """Drop a waiter that gave up; a slot granted in the meantime is returned"""
+        with self._lock:
+            cls = self._classes[waiter.priority]
+            if waiter.granted:
+                if not cancelled:
+                    return  # Granted right at the deadline: keep the slot
+                self._in_flight -= 1
+                cls.in_flight -= 1
+                self._dispatch()
+                return
+            cls.queue.remove(waiter)
+            if cancelled:
+                return
+            cls.rejected += 1
+            depth = len(cls.queue)
+        logger.warning(f"AI {waiter.priority} call waited over {self.max_wait_seconds:.0f}s for a slot ({depth} queued)")
+        raise AIConcurrencyLimitError(
+            f"No {waiter.priority} AI slot available within {self.max_wait_seconds:.0f}s",
+            "Priority Scheduler"
+        )
@@ -1,16 +1,291 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import is_dataclass, replace
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 import asyncio
+import contextvars
+import json
 import logging
+import random
+import threading
+import time
 from .prompts import (
+    DEFAULT_PROMPT_BUDGET,
+    PromptBudget,
     format_product_description_prompt,
+    format_batch_product_description_prompt,
     format_product_suggestions_prompt,
     format_improve_description_prompt
 )
-from .exceptions import AIGenerationError, AIConfigurationError, AIValidationError
+from .exceptions import (
+    AIGenerationError,
+    AIEmptyResponseError,
+    AIQualityError,
+    AIConfigurationError,
+    AIValidationError,
+    AICircuitOpenError,
+    AIConcurrencyLimitError,
+    AIQuotaExceededError
+)
+from .ai_cache import AIResponseCache, make_cache_key
+from .ai_quota import QuotaGovernor, QuotaLease, estimate_request_tokens
+from .ai_limiter import AdaptiveConcurrencyLimiter, is_overload_error
+from .ai_hedging import HedgingPolicy
+from .ai_metrics import AIMetrics, CACHE_HIT, EMPTY, ERROR, FALLBACK, REJECTED, SUCCESS
+from .ai_pool import GeminiModelPool, bind_async_client, create_gemini_member_model
+from .ai_routing import ModelRoutingTable, ModelTier
+from .ai_scheduler import PriorityScheduler, get_current_priority
+from .ai_transport import TransportConfig, warm_up_model
+from app.domain.entities import SUGGESTION_ITEM_PATTERN
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Operation (prompt type) of the generation running in the current context, for metrics
+_current_operation: contextvars.ContextVar[str] = contextvars.ContextVar("ai_operation", default="generate")
+
+# Model tier serving the current generation (None = the service's default model)
+_current_tier: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("ai_model_tier", default=None)
+
+def count_suggestion_items(text: str) -> int:
+    """Number of numbered items in a suggestions answer"""
+    return sum(1 for line in text.splitlines() if SUGGESTION_ITEM_PATTERN.match(line))
+
+class SingleFlight:
+    """Collapse concurrent identical calls (threads) into one in-flight execution"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._calls = 0
+        self._collapsed = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        """Run fn for key, or wait for the call already in flight and share its result"""
+        with self._lock:
+            self._calls += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self._collapsed += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "executions": self._calls - self._collapsed,
+                "collapsed": self._collapsed,
+                "in_flight": len(self._in_flight)
+            }
+
+class AsyncSingleFlight:
+    """Collapse concurrent identical coroutines into one in-flight execution per event loop"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple[int, str], asyncio.Task] = {}
+        self._calls = 0
+        self._collapsed = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Await fn for key, or await the call already in flight and share its result"""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+
+        with self._lock:
+            self._calls += 1
+            task = self._in_flight.get(flight_key)
+            if task is None:
+                # Own task: a caller that is cancelled (client gone) does not cancel the shared call
+                task = loop.create_task(fn())
+                task.add_done_callback(lambda t: self._finish(flight_key, t))
+                self._in_flight[flight_key] = task
+            else:
+                self._collapsed += 1
+
+        return await asyncio.shield(task)
+
+    def _finish(self, flight_key: Tuple[int, str], task: asyncio.Task) -> None:
+        with self._lock:
+            if self._in_flight.get(flight_key) is task:
+                del self._in_flight[flight_key]
+        # Avoid "exception was never retrieved" when every caller went away
+        task.cancelled() or task.exception()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "executions": self._calls - self._collapsed,
+                "collapsed": self._collapsed,
+                "in_flight": len(self._in_flight)
+            }
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+def is_retryable_error(error: BaseException) -> bool:
+    """Transient errors (timeouts, 429, 5xx) that are worth retrying"""
+    if isinstance(error, AIGenerationError):
+        if error.original_error is None:
+            return False
+        error = error.original_error
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    code = getattr(error, "code", None)
+    return isinstance(code, int) and code in RETRYABLE_STATUS_CODES
+
+class RetryPolicy:
+    """Exponential backoff with full jitter"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.25, max_delay: float = 4.0):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retry number `attempt` (0-based)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker around the AI service"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._last_probe_at = 0.0
+        self._opened_count = 0
+        self._short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def is_open(self) -> bool:
+        """True while calls are being short-circuited (does not consume a half-open probe)"""
+        return self.state == self.OPEN
+
+    def allow_request(self) -> bool:
+        """Whether a call may proceed; in half-open only a limited number of probes pass"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                self._last_probe_at = time.monotonic()
+                return True
+            self._short_circuited += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("🟢 AI circuit breaker closed")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._half_open_calls = 0
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe whose call never reached the model"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_failure(self) -> None:
+        with self._lock:
+            state = self._current_state()
+            self._failures += 1
+            if state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if state != self.OPEN:
+                    logger.warning(f"🔴 AI circuit breaker opened after {self._failures} failure(s)")
+                    self._opened_count += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._half_open_calls = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "recovery_timeout_seconds": self.recovery_timeout,
+                "times_opened": self._opened_count,
+                "short_circuited": self._short_circuited
+            }
+
+    def _current_state(self) -> str:
+        """State under lock, moving open -> half-open once the recovery timeout elapsed"""
+        now = time.monotonic()
+        if self._state == self.OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+        elif (
+            self._state == self.HALF_OPEN
+            and self._half_open_calls >= self.half_open_max_calls
+            and now - self._last_probe_at >= self.recovery_timeout
+        ):
+            # A probe never reported back (e.g. an abandoned stream): allow a new one
+            self._half_open_calls = 0
+        return self._state
+
+class _CallContext:
+    """Resources and outcome of one model call"""
+
+    def __init__(self, lease: Optional[QuotaLease] = None, operation: str = "generate", priority: Optional[str] = None):
+        self.lease = lease
+        self.operation = operation
+        self.priority = priority  # Scheduler class holding a slot (None without scheduler)
+        self.started = time.monotonic()
+        self.used_tokens: Optional[int] = None
+        self.prompt_tokens: Optional[int] = None
+        self.output_tokens: Optional[int] = None
+        self.error: Optional[BaseException] = None
+
+    def record_usage(self, response: Any) -> None:
+        """Take the token counts from a response's usage_metadata, when present"""
+        usage = getattr(response, "usage_metadata", None)
+        for attribute, field in (
+            ("used_tokens", "total_token_count"),
+            ("prompt_tokens", "prompt_token_count"),
+            ("output_tokens", "candidates_token_count")
+        ):
+            value = getattr(usage, field, None)
+            if isinstance(value, int):
+                setattr(self, attribute, value)
+
 class AIServiceInterface(ABC):
     """Interface común para servicios de AI"""
     
@@ -25,6 +300,11 @@ class AIServiceInterface(ABC):
         """Generate product description"""
         pass
 
+    @abstractmethod
+    def generate_product_descriptions(self, products: List[Dict[str, Optional[str]]]) -> List[Optional[str]]:
+        """Generate descriptions for several products in one request (None where a section failed)"""
+        pass
+
     @abstractmethod 
     def generate_product_suggestions(self, category: str, count: int = 5) -> str:
         """Generate product suggestions for a category"""
@@ -43,29 +323,818 @@ class AIServiceInterface(ABC):
             if key == 'count' and (not isinstance(value, int) or value <= 0):
                 raise AIValidationError("Parameter 'count' must be a positive integer")
 
-class BaseAIService(AIServiceInterface):
+class AsyncAIServiceInterface(ABC):
+    """Interface asíncrona para servicios de AI (gemela de AIServiceInterface)"""
+
+    @abstractmethod
+    async def generate_product_description_async(
+        self,
+        name: str,
+        category: str,
+        brand: str,
+        basic_info: Optional[str] = None
+    ) -> str:
+        """Generate product description without blocking the event loop"""
+        pass
+
+    @abstractmethod
+    async def generate_product_descriptions_async(
+        self,
+        products: List[Dict[str, Optional[str]]]
+    ) -> List[Optional[str]]:
+        """Generate descriptions for several products in one request without blocking the event loop"""
+        pass
+
+    @abstractmethod
+    async def generate_product_suggestions_async(self, category: str, count: int = 5) -> str:
+        """Generate product suggestions for a category without blocking the event loop"""
+        pass
+
+    @abstractmethod
+    async def improve_product_description_async(self, current_description: str) -> str:
+        """Improve existing product description without blocking the event loop"""
+        pass
+
+    @abstractmethod
+    def stream_product_suggestions_async(self, category: str, count: int = 5) -> AsyncIterator[str]:
+        """Stream product suggestions as text chunks while the model generates them"""
+        pass
+
+    @abstractmethod
+    def stream_improve_product_description_async(self, current_description: str) -> AsyncIterator[str]:
+        """Stream an improved description as text chunks while the model generates it"""
+        pass
+
+class BaseAIService(AIServiceInterface, AsyncAIServiceInterface):
     """Base implementation with common functionality"""
     
-    def __init__(self, service_name: str):
+    def __init__(
+        self,
+        service_name: str,
+        cache: Optional[AIResponseCache] = None,
+        quota: Optional[QuotaGovernor] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        metrics: Optional[AIMetrics] = None,
+        prompt_budget: Optional[PromptBudget] = None,
+        routing: Optional[ModelRoutingTable] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        transport: Optional[TransportConfig] = None
+    ):
         self.service_name = service_name
         self._model = None
+        self._routing = routing
+        self._tier_models: Dict[str, Any] = {}
         self._generation_config = None
+        self._batch_generation_config = None
+        self._cache = cache
+        self._quota = quota
+        self._limiter = limiter
+        self._scheduler = scheduler
+        self._transport = transport
+        # Per-request timeout sent with every model call
+        request_options = transport.request_options() if transport is not None else {}
+        self._request_kwargs = {"request_options": request_options} if request_options else {}
+        self._warmup: Optional[Dict[str, dict]] = None
+        self._retry_policy = retry_policy or RetryPolicy(max_attempts=1)
+        self._breaker = circuit_breaker
+        self._hedging = hedging
+        # Runs both requests of a hedged pair (a losing blocking call finishes there); made on first hedge
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self._hedge_threads: Optional[threading.Semaphore] = None
+        self._hedge_pool_lock = threading.Lock()
+        self._metrics = metrics or AIMetrics()
+        self._prompt_budget = prompt_budget or DEFAULT_PROMPT_BUDGET
+        self._single_flight = SingleFlight()
+        self._async_single_flight = AsyncSingleFlight()
+
+    @property
+    def model_name(self) -> str:
+        """Name of the underlying model (part of the cache key)"""
+        return getattr(self._model, "model_name", None) or self.service_name
+
+    def _cache_key(self, prompt: str, generation_config: Any = None, model_name: Optional[str] = None) -> str:
+        """Content-addressed key for a prompt with the model (default: current one) and config"""
+        return make_cache_key(prompt, model_name or self.model_name, generation_config or self._generation_config)
+
+    def _model_for(self, tier_name: Optional[str]) -> Any:
+        """Model serving a tier (the default model without routing)"""
+        return self._tier_models.get(tier_name, self._model) if tier_name is not None else self._model
+
+    def _tier_model_name(self, tier: Optional[ModelTier]) -> Optional[str]:
+        if tier is None:
+            return None
+        return getattr(self._model_for(tier.name), "model_name", None) or tier.model_name
+
+    def get_stats(self) -> dict:
+        """Runtime counters of the AI layer"""
+        return {
+            "service": self.service_name,
+            "model": self.model_name,
+            "cache": self._cache.get_stats() if self._cache is not None else None,
+            "single_flight": {
+                "sync": self._single_flight.get_stats(),
+                "async": self._async_single_flight.get_stats()
+            },
+            "quota": self._quota.get_stats() if self._quota is not None else None,
+            "scheduler": self._scheduler.get_stats() if self._scheduler is not None else None,
+            "adaptive_limit": self._limiter.get_stats() if self._limiter is not None else None,
+            "model_pool": self._model.get_stats() if isinstance(self._model, GeminiModelPool) else None,
+            "circuit_breaker": self._breaker.get_stats() if self._breaker is not None else None,
+            "hedging": self._hedging.get_stats() if self._hedging is not None else None,
+            "routing": self._routing.get_stats() if self._routing is not None else None,
+            "transport": self._get_transport_stats(),
+            "operations": self._metrics.get_stats()
+        }
+
+    def get_health(self) -> dict:
+        """Cheap liveness snapshot (no model call): availability, breaker state and recent calls"""
+        return {
+            "service": self.service_name,
+            "model": self.model_name,
+            "available": self.is_available(),
+            "circuit_breaker": self._breaker.get_stats() if self._breaker is not None else None,
+            **self._metrics.get_liveness()
+        }
+
+    def record_fallback(self, operation: str) -> None:
+        """Count a caller falling back to a non-AI result for an operation"""
+        self._metrics.record_outcome(operation, FALLBACK)
+
+    def is_available(self) -> bool:
+        """False while the circuit breaker is open (callers should fall back immediately)"""
+        return self._breaker is None or not self._breaker.is_open()
     
-    def _generate_sync(self, prompt: str) -> str:
-        """Generate content synchronously"""
+    def warm_up(self, connections: Optional[int] = None) -> Dict[str, dict]:
+        """Open the model connections before the first request (count_tokens on every model / pool member).
+        
+        By default one connection per model with gRPC (calls share the HTTP/2 channel) and
+        pool_size connections with REST.
+        """
+        transport = self._transport
+        if connections is None:
+            connections = transport.pool_size if transport is not None and transport.kind == "rest" else 1
+        timeout = transport.connect_timeout_seconds if transport is not None else None
+        results: Dict[str, dict] = {}
+        for name, model in self._warmup_targets():
+            try:
+                results[name] = {"seconds": round(warm_up_model(model, connections, timeout), 4)}
+            except Exception as e:
+                logger.warning(f"⚠️ Could not warm up {name}: {e}")
+                results[name] = {"error": str(e)}
+        self._warmup = results
+        warmed = sum(1 for result in results.values() if "seconds" in result)
+        logger.info(f"🔌 Warmed up {warmed}/{len(results)} model connection(s) of {self.service_name}")
+        return results
+
+    def _warmup_targets(self) -> List[Tuple[str, Any]]:
+        """Distinct models behind the service, pools expanded to their members"""
+        targets: List[Tuple[str, Any]] = []
+        seen = set()
+        for model in [self._model, *self._tier_models.values()]:
+            if model is None:
+                continue
+            if isinstance(model, GeminiModelPool):
+                members = [(member.name, member.model) for member in model.members]
+            else:
+                members = [(getattr(model, "model_name", None) or self.service_name, model)]
+            for name, member in members:
+                if id(member) not in seen:
+                    seen.add(id(member))
+                    targets.append((name, member))
+        return targets
+
+    def _get_transport_stats(self) -> Optional[dict]:
+        if self._transport is None:
+            return None
+        return {
+            "kind": self._transport.kind,
+            "pool_size": self._transport.pool_size,
+            "connect_timeout_seconds": self._transport.connect_timeout_seconds,
+            "read_timeout_seconds": self._transport.read_timeout_seconds,
+            "keepalive_seconds": self._transport.keepalive_seconds,
+            "warmup": self._warmup
+        }
+
+    def get_cached(self, prompt: str, generation_config: Any = None, model_name: Optional[str] = None) -> Optional[str]:
+        """Return the cached response for a prompt, if any"""
+        if self._cache is None:
+            return None
+        return self._cache.get(self._cache_key(prompt, generation_config, model_name))
+
+    def has_cached(self, prompt: str, generation_config: Any = None, model_name: Optional[str] = None) -> bool:
+        """Whether a response is cached for a prompt, without counting a cache lookup"""
+        if self._cache is None:
+            return False
+        return self._cache.contains(self._cache_key(prompt, generation_config, model_name))
+
+    def store_cached(
+        self,
+        prompt: str,
+        text: str,
+        generation_config: Any = None,
+        model_name: Optional[str] = None
+    ) -> None:
+        """Store a response generated elsewhere (e.g. in a batch) under a prompt's key"""
+        if self._cache is not None:
+            self._cache.set(self._cache_key(prompt, generation_config, model_name), text)
+
+    def get_cached_description(self, product: Dict[str, Optional[str]]) -> Optional[str]:
+        """Cached single-product description (same prompt, model and config as generate_product_description)"""
+        config, tier = self._route("product_description")
+        return self.get_cached(
+            format_product_description_prompt(**product, budget=self._prompt_budget),
+            config,
+            self._tier_model_name(tier)
+        )
+
+    def has_cached_description(self, product: Dict[str, Optional[str]]) -> bool:
+        """Whether get_cached_description would find a description (no hit or miss counted)"""
+        config, tier = self._route("product_description")
+        return self.has_cached(
+            format_product_description_prompt(**product, budget=self._prompt_budget),
+            config,
+            self._tier_model_name(tier)
+        )
+
+    def store_cached_description(self, product: Dict[str, Optional[str]], text: str) -> None:
+        """Cache a description generated elsewhere under its single-product prompt"""
+        config, tier = self._route("product_description")
+        self.store_cached(
+            format_product_description_prompt(**product, budget=self._prompt_budget),
+            text,
+            config,
+            self._tier_model_name(tier)
+        )
+
+    def _output_config(self, operation: str, count: int = 1, base: Any = None) -> Any:
+        """Generation config with the operation's max_output_tokens"""
+        base = base or self._generation_config
+        if not is_dataclass(base):
+            return base
+        return replace(base, max_output_tokens=self._prompt_budget.max_output_tokens(operation, count))
+
+    def _route(
+        self,
+        operation: str,
+        count: int = 1,
+        base: Any = None,
+        tier: Optional[ModelTier] = None
+    ) -> Tuple[Any, Optional[ModelTier]]:
+        """Generation config and model tier of an operation (tier None without routing)"""
+        config = self._output_config(operation, count, base)
+        if self._routing is None:
+            return config, None
+        tier = tier or self._routing.tier_for(operation)
+        return self._routing.config_for(tier, config), tier
+
+    def _generate_routed(
+        self,
+        prompt: str,
+        operation: str,
+        count: int = 1,
+        base: Any = None,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """Generate on the operation's tier, moving to the fallback tier on empty or invalid answers"""
+        config, tier = self._route(operation, count, base)
+        while True:
+            fallback = self._routing.fallback_for(tier) if tier is not None else None
+            try:
+                return self._generate_sync(
+                    prompt, config, operation, tier=tier, validate=validate if fallback is not None else None
+                )
+            except (AIEmptyResponseError, AIQualityError) as e:
+                if fallback is None:
+                    raise
+                logger.warning(f"{operation} answer from tier {tier.name} rejected ({e}), retrying on {fallback.name}")
+                self._routing.record_fallback(tier.name)
+                config, tier = self._route(operation, count, base, fallback)
+
+    async def _generate_routed_async(
+        self,
+        prompt: str,
+        operation: str,
+        count: int = 1,
+        base: Any = None,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """Async twin of _generate_routed"""
+        config, tier = self._route(operation, count, base)
+        while True:
+            fallback = self._routing.fallback_for(tier) if tier is not None else None
+            try:
+                return await self._generate_async(
+                    prompt, config, operation, tier=tier, validate=validate if fallback is not None else None
+                )
+            except (AIEmptyResponseError, AIQualityError) as e:
+                if fallback is None:
+                    raise
+                logger.warning(f"{operation} answer from tier {tier.name} rejected ({e}), retrying on {fallback.name}")
+                self._routing.record_fallback(tier.name)
+                config, tier = self._route(operation, count, base, fallback)
+
+    def _validate_batch(self, products: List[Dict[str, Optional[str]]]) -> None:
+        """Validate every product of a batch request"""
+        if not products:
+            raise AIValidationError("Parameter 'products' cannot be empty")
+        for product in products:
+            self._validate_inputs(
+                name=product.get("name") or "",
+                category=product.get("category") or "",
+                brand=product.get("brand") or ""
+            )
+
+    def _parse_batch_descriptions(self, response: str, count: int) -> List[Optional[str]]:
+        """Split a JSON batch response back per product; unparseable sections become None"""
+        text = response.strip()
+        if text.startswith("```"):
+            text = text.strip("`")
+            text = text[text.find("\n") + 1:] if "\n" in text else text
+        
+        try:
+            data = json.loads(text)
+        except ValueError:
+            logger.warning(f"Batch response from {self.service_name} is not valid JSON")
+            return [None] * count
+        
+        if isinstance(data, dict):
+            data = data.get("descriptions") or data.get("products") or []
+        
+        descriptions: List[Optional[str]] = [None] * count
+        if not isinstance(data, list):
+            return descriptions
+        
+        for position, item in enumerate(data):
+            if isinstance(item, str):
+                index, description = position, item
+            elif isinstance(item, dict):
+                index, description = item.get("index", position), item.get("description")
+            else:
+                continue
+            if (
+                isinstance(index, int) and 0 <= index < count
+                and isinstance(description, str) and description.strip()
+            ):
+                descriptions[index] = description.strip()
+        return descriptions
+
+    def _generate_sync(
+        self,
+        prompt: str,
+        generation_config: Any = None,
+        operation: str = "generate",
+        tier: Optional[ModelTier] = None,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """Generate content synchronously (answers failing validate raise AIQualityError and are not cached)"""
         if not self._model:
             raise AIGenerationError("Model not initialized", self.service_name)
         
+        generation_config = generation_config or self._generation_config
+        cache_key = self._cache_key(prompt, generation_config, self._tier_model_name(tier))
+        if self._cache is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"AI cache hit in {self.service_name}")
+                self._metrics.record_outcome(operation, CACHE_HIT)
+                return cached
+        
+        token = _current_operation.set(operation)
+        tier_token = _current_tier.set(tier.name if tier is not None else None)
+        try:
+            return self._single_flight.do(
+                self._flight_key(cache_key),
+                lambda: self._generate_uncached(prompt, cache_key, generation_config, validate)
+            )
+        finally:
+            _current_tier.reset(tier_token)
+            _current_operation.reset(token)
+
+    @staticmethod
+    def _flight_key(cache_key: str) -> str:
+        """Single-flight key: callers only share a call scheduled at their own priority"""
+        return f"{get_current_priority()}:{cache_key}"
+
+    def _generate_uncached(
+        self,
+        prompt: str,
+        cache_key: str,
+        generation_config: Any,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """Call the model and populate the cache (runs once per in-flight prompt)"""
+        started = time.monotonic()
         try:
-            response = self._model.generate_content(
+            text = self._call_with_retry(prompt, generation_config)
+            self._check_quality(text, validate)
+        except BaseException as e:
+            self._record_call(started, e)
+            raise
+        self._record_call(started, None)
+        if self._cache is not None:
+            self._cache.set(cache_key, text)
+        return text
+
+    def _check_quality(self, text: str, validate: Optional[Callable[[str], bool]]) -> None:
+        if validate is not None and not validate(text):
+            raise AIQualityError("Response failed validation", self.service_name)
+
+    def _record_call(self, started: float, error: Optional[BaseException]) -> None:
+        """Record latency and outcome of a generation for the current operation"""
+        if isinstance(error, AIEmptyResponseError):
+            outcome = EMPTY
+        elif isinstance(error, AIQualityError):
+            outcome = REJECTED
+        elif error is not None:
+            outcome = ERROR
+        else:
+            outcome = SUCCESS
+        latency = time.monotonic() - started
+        self._metrics.record_call(_current_operation.get(), latency, outcome)
+        tier_name = _current_tier.get()
+        if tier_name is not None and self._routing is not None:
+            self._routing.record_latency(tier_name, latency, outcome == SUCCESS)
+
+    def _call_with_retry(self, prompt: str, generation_config: Any) -> str:
+        """Call the model through the circuit breaker, retrying transient errors with jittered backoff"""
+        self._check_breaker()
+        for attempt in range(self._retry_policy.max_attempts):
+            try:
+                text = self._call_model_hedged(prompt, generation_config)
+            except AIGenerationError as e:
+                if self._should_retry(e, attempt):
+                    delay = self._retry_policy.delay(attempt)
+                    logger.warning(f"Retrying {self.service_name} call in {delay:.2f}s after: {e}")
+                    time.sleep(delay)
+                    continue
+                self._record_outcome(e)
+                raise
+            self._record_outcome(None)
+            return text
+
+    async def _call_with_retry_async(self, prompt: str, generation_config: Any) -> str:
+        """Async twin of _call_with_retry"""
+        self._check_breaker()
+        for attempt in range(self._retry_policy.max_attempts):
+            try:
+                text = await self._call_model_hedged_async(prompt, generation_config)
+            except AIGenerationError as e:
+                if self._should_retry(e, attempt):
+                    delay = self._retry_policy.delay(attempt)
+                    logger.warning(f"Retrying {self.service_name} call in {delay:.2f}s after: {e}")
+                    await asyncio.sleep(delay)
+                    continue
+                self._record_outcome(e)
+                raise
+            self._record_outcome(None)
+            return text
+
+    def _check_breaker(self) -> None:
+        if self._breaker is not None and not self._breaker.allow_request():
+            raise AICircuitOpenError("Circuit breaker is open", self.service_name)
+
+    def _should_retry(self, error: AIGenerationError, attempt: int) -> bool:
+        return attempt + 1 < self._retry_policy.max_attempts and is_retryable_error(error)
+
+    def _record_outcome(self, error: Optional[BaseException]) -> None:
+        """Only transient (server-side) failures trip the breaker and only successes close it"""
+        if self._breaker is None:
+            return
+        if error is None:
+            self._breaker.record_success()
+        elif is_retryable_error(error):
+            self._breaker.record_failure()
+        else:
+            # Rejected client-side or a bad answer (empty, invalid request): says nothing about recovery
+            self._breaker.release_probe()
+
+    def _call_model_hedged(self, prompt: str, generation_config: Any) -> str:
+        """Call the model, sending a duplicate if the first call outlives the hedge threshold"""
+        delay = self._hedging.start() if self._hedging is not None else None
+        if delay is None or not self._acquire_hedge_thread():
+            # Every hedge thread busy: run unhedged here rather than queue behind other hedged calls
+            return self._call_model_timed(prompt, generation_config)
+        
+        primary = self._submit_hedge_call(prompt, generation_config)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._acquire_hedge_thread():
+            return primary.result()
+        if not self._hedging.try_hedge():
+            self._hedge_threads.release()
+            return primary.result()
+        
+        logger.debug(f"Hedging {self.service_name} call after {delay:.2f}s")
+        hedge = self._submit_hedge_call(prompt, generation_config)
+        pending = {primary: False, hedge: True}
+        error: Optional[BaseException] = None
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in done:
+                is_hedge = pending.pop(future)
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    self._hedging.record_win(is_hedge)
+                    return future.result()
+                error = error or future.exception()
+        raise error
+
+    def _acquire_hedge_thread(self) -> bool:
+        """Take a free thread of the hedge pool without waiting"""
+        with self._hedge_pool_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(
+                    max_workers=self._hedging.max_threads, thread_name_prefix="ai-hedge"
+                )
+                self._hedge_threads = threading.Semaphore(self._hedging.max_threads)
+        return self._hedge_threads.acquire(blocking=False)
+
+    def _submit_hedge_call(self, prompt: str, generation_config: Any) -> Future:
+        """Run one request of a hedged pair on a thread taken with _acquire_hedge_thread"""
+        future = self._hedge_pool.submit(
+            contextvars.copy_context().run, self._call_model_timed, prompt, generation_config
+        )
+        future.add_done_callback(lambda _: self._hedge_threads.release())
+        return future
+
+    async def _call_model_hedged_async(self, prompt: str, generation_config: Any) -> str:
+        """Async twin of _call_model_hedged; the losing task is cancelled"""
+        delay = self._hedging.start() if self._hedging is not None else None
+        if delay is None:
+            return await self._call_model_timed_async(prompt, generation_config)
+        
+        primary = asyncio.ensure_future(self._call_model_timed_async(prompt, generation_config))
+        pending = {primary: False}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._hedging.try_hedge():
+                return await primary
+            
+            logger.debug(f"Hedging {self.service_name} call after {delay:.2f}s")
+            hedge = asyncio.ensure_future(self._call_model_timed_async(prompt, generation_config))
+            pending[hedge] = True
+            error: Optional[BaseException] = None
+            while pending:
+                done, _ = await asyncio.wait(set(pending), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    is_hedge = pending.pop(task)
+                    if task.exception() is None:
+                        self._hedging.record_win(is_hedge)
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _call_model_timed(self, prompt: str, generation_config: Any) -> str:
+        """_call_model feeding successful latencies to the hedging policy"""
+        started = time.monotonic()
+        text = self._call_model(prompt, generation_config)
+        if self._hedging is not None:
+            self._hedging.record_latency(time.monotonic() - started)
+        return text
+
+    async def _call_model_timed_async(self, prompt: str, generation_config: Any) -> str:
+        """Async twin of _call_model_timed"""
+        started = time.monotonic()
+        text = await self._call_model_async(prompt, generation_config)
+        if self._hedging is not None:
+            self._hedging.record_latency(time.monotonic() - started)
+        return text
+
+    def _call_model(self, prompt: str, generation_config: Any) -> str:
+        """Call the model (blocking) and return the response text"""
+        call = self._begin_call(prompt, generation_config)
+        try:
+            response = self._model_for(_current_tier.get()).generate_content(
                 prompt,
-                generation_config=self._generation_config
+                generation_config=generation_config,
+                **self._request_kwargs
             )
+            call.record_usage(response)
             if not response or not response.text:
-                raise AIGenerationError("Empty response from AI service", self.service_name)
+                raise AIEmptyResponseError("Empty response from AI service", self.service_name)
             return response.text
+        except AIGenerationError:
+            raise
         except Exception as e:
+            call.error = e
             raise AIGenerationError(f"Content generation failed: {str(e)}", self.service_name, e)
+        finally:
+            self._end_call(call)
+
+    def _begin_call(self, prompt: str, generation_config: Any) -> "_CallContext":
+        """Acquire the scheduler slot, the adaptive-limiter permit and the quota lease for one model call"""
+        priority = get_current_priority() if self._scheduler is not None else None
+        if priority is not None:
+            self._scheduler.acquire(priority)
+        try:
+            if self._limiter is not None:
+                self._limiter.acquire()
+            try:
+                lease = (
+                    self._quota.acquire(estimate_request_tokens(prompt, generation_config))
+                    if self._quota is not None else None
+                )
+            except BaseException:
+                if self._limiter is not None:
+                    self._limiter.cancel()
+                raise
+        except BaseException:
+            if priority is not None:
+                self._scheduler.release(priority)
+            raise
+        return _CallContext(lease, _current_operation.get(), priority)
+
+    async def _begin_call_async(self, prompt: str, generation_config: Any) -> "_CallContext":
+        """Async twin of _begin_call"""
+        priority = get_current_priority() if self._scheduler is not None else None
+        if priority is not None:
+            await self._scheduler.acquire_async(priority)
+        try:
+            if self._limiter is not None:
+                await self._limiter.acquire_async()
+            try:
+                lease = (
+                    await self._quota.acquire_async(estimate_request_tokens(prompt, generation_config))
+                    if self._quota is not None else None
+                )
+            except BaseException:
+                if self._limiter is not None:
+                    self._limiter.cancel()
+                raise
+        except BaseException:
+            if priority is not None:
+                self._scheduler.release(priority)
+            raise
+        return _CallContext(lease, _current_operation.get(), priority)
+
+    def _end_call(self, call: "_CallContext") -> None:
+        """Release the quota lease and feed the call's latency/outcome to the limiter"""
+        latency = time.monotonic() - call.started
+        if call.prompt_tokens is not None or call.output_tokens is not None:
+            self._metrics.record_tokens(call.operation, call.prompt_tokens, call.output_tokens)
+        if call.lease is not None:
+            self._quota.release(call.lease, call.used_tokens)
+        if self._limiter is not None:
+            overloaded = call.error is not None and is_overload_error(call.error)
+            self._limiter.release(latency, overloaded=overloaded, neutral=call.error is not None)
+        if call.priority is not None:
+            self._scheduler.release(call.priority)
+
+    async def _generate_async(
+        self,
+        prompt: str,
+        generation_config: Any = None,
+        operation: str = "generate",
+        tier: Optional[ModelTier] = None,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """Generate content asynchronously using the SDK's native coroutine"""
+        if not self._model:
+            raise AIGenerationError("Model not initialized", self.service_name)
+        
+        generation_config = generation_config or self._generation_config
+        cache_key = self._cache_key(prompt, generation_config, self._tier_model_name(tier))
+        if self._cache is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"AI cache hit in {self.service_name}")
+                self._metrics.record_outcome(operation, CACHE_HIT)
+                return cached
+        
+        token = _current_operation.set(operation)
+        tier_token = _current_tier.set(tier.name if tier is not None else None)
+        try:
+            return await self._async_single_flight.do(
+                self._flight_key(cache_key),
+                lambda: self._generate_uncached_async(prompt, cache_key, generation_config, validate)
+            )
+        finally:
+            _current_tier.reset(tier_token)
+            _current_operation.reset(token)
+
+    async def _generate_uncached_async(
+        self,
+        prompt: str,
+        cache_key: str,
+        generation_config: Any,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """Call the model (async) and populate the cache (runs once per in-flight prompt)"""
+        started = time.monotonic()
+        try:
+            text = await self._call_with_retry_async(prompt, generation_config)
+            self._check_quality(text, validate)
+        except BaseException as e:
+            self._record_call(started, e)
+            raise
+        self._record_call(started, None)
+        if self._cache is not None:
+            self._cache.set(cache_key, text)
+        return text
+
+    async def _call_model_async(self, prompt: str, generation_config: Any) -> str:
+        """Call the model with generate_content_async and return the response text"""
+        call = await self._begin_call_async(prompt, generation_config)
+        try:
+            model = self._model_for(_current_tier.get())
+            bind_async_client(model)
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                **self._request_kwargs
+            )
+            call.record_usage(response)
+            if not response or not response.text:
+                raise AIEmptyResponseError("Empty response from AI service", self.service_name)
+            return response.text
+        except AIGenerationError:
+            raise
+        except Exception as e:
+            call.error = e
+            raise AIGenerationError(f"Content generation failed: {str(e)}", self.service_name, e)
+        finally:
+            self._end_call(call)
+
+    async def _stream_async(
+        self,
+        prompt: str,
+        generation_config: Any = None,
+        operation: str = "generate",
+        tier: Optional[ModelTier] = None
+    ) -> AsyncIterator[str]:
+        """Yield text chunks as the model produces them (stream=True); the full text is cached at the end.
+        
+        Streams stay on their tier: chunks already sent cannot be replaced by a fallback answer.
+        """
+        if not self._model:
+            raise AIGenerationError("Model not initialized", self.service_name)
+        
+        generation_config = generation_config or self._generation_config
+        cache_key = self._cache_key(prompt, generation_config, self._tier_model_name(tier))
+        if self._cache is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._metrics.record_outcome(operation, CACHE_HIT)
+                yield cached
+                return
+        
+        self._check_breaker()
+        try:
+            call = await self._begin_call_async(prompt, generation_config)
+        except BaseException as e:
+            # Rejected before reaching the model (quota, limiter, scheduler): free the half-open probe
+            if isinstance(e, AIGenerationError):
+                self._record_outcome(e)
+            elif self._breaker is not None:
+                self._breaker.release_probe()
+            raise
+        call.operation = operation
+        chunks: List[str] = []
+        try:
+            model = self._model_for(tier.name if tier is not None else None)
+            bind_async_client(model)
+            response = await model.generate_content_async(
+                prompt,
+                generation_config=generation_config,
+                stream=True,
+                **self._request_kwargs
+            )
+            async for chunk in response:
+                call.record_usage(chunk)
+                text = chunk.text
+                if text:
+                    chunks.append(text)
+                    yield text
+        except (asyncio.CancelledError, GeneratorExit):
+            # Consumer went away mid-stream: the outcome is unknown, free the probe
+            if self._breaker is not None:
+                self._breaker.release_probe()
+            raise
+        except Exception as e:
+            call.error = e
+            self._record_outcome(e)
+            self._metrics.record_call(operation, time.monotonic() - call.started, ERROR)
+            if tier is not None:
+                self._routing.record_latency(tier.name, time.monotonic() - call.started, False)
+            raise AIGenerationError(f"Content streaming failed: {str(e)}", self.service_name, e)
+        finally:
+            self._end_call(call)
+        empty = None if chunks else AIEmptyResponseError("Empty response from AI service", self.service_name)
+        self._record_outcome(empty)
+        self._metrics.record_call(operation, time.monotonic() - call.started, SUCCESS if chunks else EMPTY)
+        if tier is not None:
+            self._routing.record_latency(tier.name, time.monotonic() - call.started, bool(chunks))
+        
+        if empty is not None:
+            raise empty
+        if self._cache is not None:
+            self._cache.set(cache_key, "".join(chunks))
 
     def generate_product_description(
         self, 
@@ -79,8 +1148,8 @@ class BaseAIService(AIServiceInterface):
             self._validate_inputs(name=name, category=category, brand=brand)
             
             logger.info(f"Generating product description with {self.service_name} for: {name}")
-            prompt = format_product_description_prompt(name, category, brand, basic_info)
-            response = self._generate_sync(prompt)
+            prompt = format_product_description_prompt(name, category, brand, basic_info, self._prompt_budget)
+            response = self._generate_routed(prompt, "product_description")
             
             logger.info(f"Successfully generated description with {self.service_name}")
             return response.strip()
@@ -91,6 +1160,34 @@ class BaseAIService(AIServiceInterface):
             logger.error(f"Error generating description with {self.service_name}: {str(e)}")
             raise AIGenerationError(f"Failed to generate description: {str(e)}", self.service_name, e)
 
+    def generate_product_descriptions(self, products: List[Dict[str, Optional[str]]]) -> List[Optional[str]]:
+        """Generate descriptions for several products packed into one JSON-mode prompt"""
+        try:
+            self._validate_batch(products)
+            
+            logger.info(f"Generating {len(products)} product descriptions in one request with {self.service_name}")
+            prompt = format_batch_product_description_prompt(products, self._prompt_budget)
+            response = self._generate_routed(
+                prompt,
+                "product_descriptions_batch",
+                len(products),
+                self._batch_generation_config,
+                validate=lambda text: any(d is not None for d in self._parse_batch_descriptions(text, len(products)))
+            )
+            
+            descriptions = self._parse_batch_descriptions(response, len(products))
+            logger.info(
+                f"Successfully generated {sum(d is not None for d in descriptions)}/{len(products)} "
+                f"descriptions with {self.service_name}"
+            )
+            return descriptions
+            
+        except AIValidationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating batch descriptions with {self.service_name}: {str(e)}")
+            raise AIGenerationError(f"Failed to generate batch descriptions: {str(e)}", self.service_name, e)
+
     def generate_product_suggestions(self, category: str, count: int = 5) -> str:
         """Generate product suggestions for a category"""
         try:
@@ -98,7 +1195,9 @@ class BaseAIService(AIServiceInterface):
             
             logger.info(f"Generating {count} product suggestions with {self.service_name} for category: {category}")
             prompt = format_product_suggestions_prompt(category, count)
-            response = self._generate_sync(prompt)
+            response = self._generate_routed(
+                prompt, "product_suggestions", count, validate=lambda text: count_suggestion_items(text) >= count
+            )
             
             logger.info(f"Successfully generated suggestions with {self.service_name}")
             return response.strip()
@@ -115,8 +1214,101 @@ class BaseAIService(AIServiceInterface):
             self._validate_inputs(current_description=current_description)
             
             logger.info(f"Improving product description with {self.service_name}")
-            prompt = format_improve_description_prompt(current_description)
-            response = self._generate_sync(prompt)
+            prompt = format_improve_description_prompt(current_description, self._prompt_budget)
+            response = self._generate_routed(prompt, "improve_description")
+            
+            logger.info(f"Successfully improved description with {self.service_name}")
+            return response.strip()
+            
+        except AIValidationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error improving description with {self.service_name}: {str(e)}")
+            raise AIGenerationError(f"Failed to improve description: {str(e)}", self.service_name, e)
+
+    async def generate_product_description_async(
+        self, 
+        name: str, 
+        category: str, 
+        brand: str, 
+        basic_info: Optional[str] = None
+    ) -> str:
+        """Generate product description using AI (async)"""
+        try:
+            self._validate_inputs(name=name, category=category, brand=brand)
+            
+            logger.info(f"Generating product description with {self.service_name} for: {name}")
+            prompt = format_product_description_prompt(name, category, brand, basic_info, self._prompt_budget)
+            response = await self._generate_routed_async(prompt, "product_description")
+            
+            logger.info(f"Successfully generated description with {self.service_name}")
+            return response.strip()
+            
+        except AIValidationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating description with {self.service_name}: {str(e)}")
+            raise AIGenerationError(f"Failed to generate description: {str(e)}", self.service_name, e)
+
+    async def generate_product_descriptions_async(
+        self,
+        products: List[Dict[str, Optional[str]]]
+    ) -> List[Optional[str]]:
+        """Generate descriptions for several products packed into one JSON-mode prompt (async)"""
+        try:
+            self._validate_batch(products)
+            
+            logger.info(f"Generating {len(products)} product descriptions in one request with {self.service_name}")
+            prompt = format_batch_product_description_prompt(products, self._prompt_budget)
+            response = await self._generate_routed_async(
+                prompt,
+                "product_descriptions_batch",
+                len(products),
+                self._batch_generation_config,
+                validate=lambda text: any(d is not None for d in self._parse_batch_descriptions(text, len(products)))
+            )
+            
+            descriptions = self._parse_batch_descriptions(response, len(products))
+            logger.info(
+                f"Successfully generated {sum(d is not None for d in descriptions)}/{len(products)} "
+                f"descriptions with {self.service_name}"
+            )
+            return descriptions
+            
+        except AIValidationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating batch descriptions with {self.service_name}: {str(e)}")
+            raise AIGenerationError(f"Failed to generate batch descriptions: {str(e)}", self.service_name, e)
+
+    async def generate_product_suggestions_async(self, category: str, count: int = 5) -> str:
+        """Generate product suggestions for a category (async)"""
+        try:
+            self._validate_inputs(category=category, count=count)
+            
+            logger.info(f"Generating {count} product suggestions with {self.service_name} for category: {category}")
+            prompt = format_product_suggestions_prompt(category, count)
+            response = await self._generate_routed_async(
+                prompt, "product_suggestions", count, validate=lambda text: count_suggestion_items(text) >= count
+            )
+            
+            logger.info(f"Successfully generated suggestions with {self.service_name}")
+            return response.strip()
+            
+        except AIValidationError:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating suggestions with {self.service_name}: {str(e)}")
+            raise AIGenerationError(f"Failed to generate suggestions: {str(e)}", self.service_name, e)
+
+    async def improve_product_description_async(self, current_description: str) -> str:
+        """Improve existing product description (async)"""
+        try:
+            self._validate_inputs(current_description=current_description)
+            
+            logger.info(f"Improving product description with {self.service_name}")
+            prompt = format_improve_description_prompt(current_description, self._prompt_budget)
+            response = await self._generate_routed_async(prompt, "improve_description")
             
             logger.info(f"Successfully improved description with {self.service_name}")
             return response.strip()
@@ -127,26 +1319,92 @@ class BaseAIService(AIServiceInterface):
             logger.error(f"Error improving description with {self.service_name}: {str(e)}")
             raise AIGenerationError(f"Failed to improve description: {str(e)}", self.service_name, e)
 
+    async def stream_product_suggestions_async(self, category: str, count: int = 5) -> AsyncIterator[str]:
+        """Stream product suggestions for a category"""
+        self._validate_inputs(category=category, count=count)
+        
+        logger.info(f"Streaming {count} product suggestions with {self.service_name} for category: {category}")
+        prompt = format_product_suggestions_prompt(category, count)
+        config, tier = self._route("product_suggestions", count)
+        async for chunk in self._stream_async(prompt, config, operation="product_suggestions", tier=tier):
+            yield chunk
+        logger.info(f"Successfully streamed suggestions with {self.service_name}")
+
+    async def stream_improve_product_description_async(self, current_description: str) -> AsyncIterator[str]:
+        """Stream an improved product description"""
+        self._validate_inputs(current_description=current_description)
+        
+        logger.info(f"Streaming improved product description with {self.service_name}")
+        prompt = format_improve_description_prompt(current_description, self._prompt_budget)
+        config, tier = self._route("improve_description")
+        async for chunk in self._stream_async(prompt, config, operation="improve_description", tier=tier):
+            yield chunk
+        logger.info(f"Successfully streamed improved description with {self.service_name}")
+
 class GeminiDirectService(BaseAIService):
     """Servicio usando Gemini API directamente"""
     
-    def __init__(self, api_key: str):
-        super().__init__("Gemini Direct")
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[AIResponseCache] = None,
+        quota: Optional[QuotaGovernor] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        prompt_budget: Optional[PromptBudget] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        model: Any = None,
+        model_name: str = "gemini-2.0-flash",
+        routing: Optional[ModelRoutingTable] = None,
+        model_factory: Optional[Callable[[str], Any]] = None,
+        transport: Optional[TransportConfig] = None
+    ):
+        super().__init__(
+            "Gemini Direct",
+            cache=cache,
+            quota=quota,
+            limiter=limiter,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            hedging=hedging,
+            prompt_budget=prompt_budget,
+            routing=routing,
+            scheduler=scheduler,
+            transport=transport
+        )
         
-        if not api_key or not api_key.strip():
+        # An injected model (GeminiModelPool, FakeGenerativeModel) replaces the global client
+        if model is None and (not api_key or not api_key.strip()):
             raise AIConfigurationError("Google API key is required")
         
         try:
             import google.generativeai as genai
             
-            genai.configure(api_key=api_key)
-            self._model = genai.GenerativeModel('gemini-2.0-flash')
+            # Each model gets its own client for api_key (tuned by the TransportConfig, if any)
+            if model_factory is None:
+                model_factory = lambda name: create_gemini_member_model(api_key, name, transport)
+            
+            self._model = model if model is not None else model_factory(model_name)
             
+            # One model per routing tier (model_factory builds fake/pooled models for injected backends)
+            if routing is not None:
+                self._tier_models = {tier.name: model_factory(tier.model_name) for tier in routing.tiers}
+            
+            # max_output_tokens is set per prompt type from the PromptBudget
             self._generation_config = genai.types.GenerationConfig(
                 temperature=0.7,
                 top_p=0.8,
                 top_k=40,
-                max_output_tokens=1024,
+                max_output_tokens=self._prompt_budget.description_output_tokens,
+            )
+            self._batch_generation_config = genai.types.GenerationConfig(
+                temperature=0.7,
+                top_p=0.8,
+                top_k=40,
+                max_output_tokens=self._prompt_budget.max_output_tokens_limit,
+                response_mime_type="application/json",
             )
             
             logger.info(f"🚀 {self.service_name} initialized successfully")
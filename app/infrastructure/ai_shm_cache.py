@@ -0,0 +1,223 @@
+"""
+Store de respuestas de AI en memoria compartida entre workers
+"""
+from contextlib import ExitStack
+from typing import List, Optional, Tuple
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from .ai_cache import CacheStore
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"GAICACHE"
+VERSION = 1
+WAYS = 8
+READ_RETRIES = 3
+THREAD_LOCK_STRIPES = 64
+
+# magic, version, slot_count, slot_size (padded to HEADER_SIZE)
+_HEADER = struct.Struct("<8sIII")
+HEADER_SIZE = 64
+# seq, key digest, expires_at, last_access_ns, value length (padded to SLOT_HEADER_SIZE)
+_SLOT = struct.Struct("<I32sdQI")
+_SEQ = struct.Struct("<I")
+_ACCESS = struct.Struct("<Q")
+_ACCESS_OFFSET = 4 + 32 + 8
+SLOT_HEADER_SIZE = 64
+
+def default_shm_path() -> str:
+    """Base name in /dev/shm (RAM-backed) when available, else in the temp directory"""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else "/tmp"
+    return os.path.join(directory, "genai-ai-cache")
+
+class SharedMemoryCacheStore(CacheStore):
+    """Fixed-slot, set-associative key/value segment shared by every worker on the host
+    
+    path is a base name: the segment lives in {path}-{slot_count}x{slot_size}-v{VERSION}.
+    """
+
+    def __init__(self, path: str, slot_count: int = 4096, slot_size: int = 8192):
+        if slot_count < WAYS or slot_count % WAYS:
+            raise ValueError(f"slot_count must be a positive multiple of {WAYS}")
+        if slot_size <= SLOT_HEADER_SIZE:
+            raise ValueError(f"slot_size must be larger than {SLOT_HEADER_SIZE} bytes")
+
+        self.path = f"{path}-{slot_count}x{slot_size}-v{VERSION}"
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.set_count = slot_count // WAYS
+        self.value_capacity = slot_size - SLOT_HEADER_SIZE
+        self._size = HEADER_SIZE + slot_count * slot_size
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._initialize()
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._mm = mmap.mmap(self._fd, self._size)
+        self._thread_locks = [threading.Lock() for _ in range(THREAD_LOCK_STRIPES)]
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+        self._too_large = 0
+        self._read_conflicts = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        digest = self._digest(key)
+        base = self._set_offset(digest)
+        for way in range(WAYS):
+            offset = base + way * self.slot_size
+            found, entry = self._read_slot(offset, digest)
+            if found:
+                self._count("_hits" if entry is not None else "_read_conflicts")
+                if entry is not None:
+                    _ACCESS.pack_into(self._mm, offset + _ACCESS_OFFSET, time.monotonic_ns())
+                    return entry
+                break
+        self._count("_misses")
+        return None
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        data = value.encode("utf-8")
+        if len(data) > self.value_capacity:
+            self._count("_too_large")
+            return
+
+        digest = self._digest(key)
+        base = self._set_offset(digest)
+        set_index = (base - HEADER_SIZE) // (WAYS * self.slot_size)
+        with self._thread_locks[set_index % THREAD_LOCK_STRIPES]:
+            self._lock_range(fcntl.LOCK_EX, set_index)
+            try:
+                offset, evicted = self._choose_slot(base, digest)
+                self._write_slot(offset, digest, data, expires_at)
+            finally:
+                self._lock_range(fcntl.LOCK_UN, set_index)
+        with self._stats_lock:
+            self._writes += 1
+            self._evictions += evicted
+
+    def clear(self) -> None:
+        with ExitStack() as stack:
+            for lock in self._thread_locks:
+                stack.enter_context(lock)
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                for slot in range(self.slot_count):
+                    offset = HEADER_SIZE + slot * self.slot_size
+                    if _SLOT.unpack_from(self._mm, offset)[4]:
+                        self._write_slot(offset, bytes(32), b"", 0.0)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def get_stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "type": "shared_memory",
+                "path": self.path,
+                "slots": self.slot_count,
+                "slot_bytes": self.slot_size,
+                "used_slots": self._used_slots(),
+                "hits": self._hits,
+                "misses": self._misses,
+                "writes": self._writes,
+                "evictions": self._evictions,
+                "too_large": self._too_large,
+                "read_conflicts": self._read_conflicts
+            }
+
+    def close(self) -> None:
+        self._mm.close()
+        os.close(self._fd)
+
+    def _initialize(self) -> None:
+        """Format a new segment, attach to a matching one, refuse anything else (never resized while mapped)"""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            expected = (MAGIC, VERSION, self.slot_count, self.slot_size)
+            if len(header) == _HEADER.size and _HEADER.unpack(header) == expected:
+                if os.fstat(self._fd).st_size < self._size:
+                    raise ValueError(f"AI shared cache at {self.path} is truncated")
+                return
+            if os.fstat(self._fd).st_size:
+                raise ValueError(f"AI shared cache at {self.path} has another layout, not attaching to it")
+            os.ftruncate(self._fd, self._size)
+            os.pwrite(self._fd, _HEADER.pack(*expected), 0)
+            logger.info(f"🧠 AI shared cache formatted at {self.path} ({self._size // (1024 * 1024)} MiB)")
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def _read_slot(self, offset: int, digest: bytes) -> Tuple[bool, Optional[Tuple[str, float]]]:
+        """Seqlock read: (key matched, entry); entry None if a writer kept racing the read"""
+        for _ in range(READ_RETRIES):
+            seq, slot_digest, expires_at, _, length = _SLOT.unpack_from(self._mm, offset)
+            if slot_digest != digest:
+                return False, None
+            if seq & 1:
+                continue
+            start = offset + SLOT_HEADER_SIZE
+            data = self._mm[start:start + min(length, self.value_capacity)]
+            if _SEQ.unpack_from(self._mm, offset)[0] == seq:
+                try:
+                    return True, (data.decode("utf-8"), expires_at)
+                except UnicodeDecodeError:
+                    return True, None
+        return True, None
+
+    def _choose_slot(self, base: int, digest: bytes) -> Tuple[int, int]:
+        """Slot for a write (lock held): same key, else empty/expired, else least recently used"""
+        now = time.time()
+        candidates: List[Tuple[int, int, int]] = []
+        for way in range(WAYS):
+            offset = base + way * self.slot_size
+            _, slot_digest, expires_at, last_access, length = _SLOT.unpack_from(self._mm, offset)
+            if slot_digest == digest:
+                return offset, 0
+            live = 1 if length and expires_at > now else 0
+            candidates.append((live, last_access, offset))
+        live, _, offset = min(candidates)
+        return offset, live
+
+    def _write_slot(self, offset: int, digest: bytes, data: bytes, expires_at: float) -> None:
+        """Seqlock write (lock held): odd sequence while the slot is inconsistent"""
+        writing = _SEQ.unpack_from(self._mm, offset)[0] | 1
+        _SEQ.pack_into(self._mm, offset, writing)
+        start = offset + SLOT_HEADER_SIZE
+        self._mm[start:start + len(data)] = data
+        _SLOT.pack_into(
+            self._mm, offset, writing, digest, expires_at, time.monotonic_ns() if data else 0, len(data)
+        )
+        _SEQ.pack_into(self._mm, offset, (writing + 1) & 0xFFFFFFFF)
+
+    def _set_offset(self, digest: bytes) -> int:
+        set_index = int.from_bytes(digest[:8], "little") % self.set_count
+        return HEADER_SIZE + set_index * WAYS * self.slot_size
+
+    def _lock_range(self, operation: int, set_index: int) -> None:
+        """Cross-process lock on one byte per set (fcntl locks do not exclude threads)"""
+        fcntl.lockf(self._fd, operation, 1, set_index)
+
+    def _used_slots(self) -> int:
+        now = time.time()
+        used = 0
+        for slot in range(self.slot_count):
+            _, _, expires_at, _, length = _SLOT.unpack_from(self._mm, HEADER_SIZE + slot * self.slot_size)
+            used += 1 if length and expires_at > now else 0
+        return used
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        return hashlib.sha256(key.encode("utf-8")).digest()
@@ -0,0 +1,130 @@
+"""
+Pre-generación especulativa de descripciones de productos sugeridos
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+import threading
+from app.domain.entities import SUGGESTION_ITEM_PATTERN
+from .ai_scheduler import BACKGROUND, ai_priority
+from .ai_services import BaseAIService
+from .exceptions import AIGenerationError
+
+logger = logging.getLogger(__name__)
+
+ProductInput = Dict[str, Optional[str]]
+
+def parse_suggested_products(suggestions: str) -> List[Tuple[str, str]]:
+    """(name, brand) of each numbered "Producto - Marca - Descripción" line"""
+    products = []
+    for line in suggestions.splitlines():
+        match = SUGGESTION_ITEM_PATTERN.match(line)
+        if not match:
+            continue
+        parts = [part.strip(" *_") for part in line[match.end():].split(" - ")]
+        if len(parts) < 2 or not parts[0] or not parts[1]:
+            continue
+        name, brand = parts[0], parts[1]
+        if len(name) <= 255 and len(brand) <= 100:
+            products.append((name, brand))
+    return products
+
+class SpeculativeDescriptionGenerator:
+    """Background, low-priority description generation for suggested products"""
+
+    def __init__(
+        self,
+        ai_service: BaseAIService,
+        max_items: int = 10,
+        batch_size: int = 10,
+        max_pending: int = 50
+    ):
+        if max_items <= 0 or batch_size <= 0 or max_pending <= 0:
+            raise ValueError("max_items, batch_size and max_pending must be positive integers")
+
+        self._ai_service = ai_service
+        self.max_items = max_items
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-speculation")
+        self._lock = threading.Lock()
+        self._pending: Set[Tuple[str, str, str]] = set()
+        self._scheduled = 0
+        self._generated = 0
+        self._already_cached = 0
+        self._dropped = 0
+        self._failed = 0
+
+    def submit(self, category: str, suggestions: str) -> int:
+        """Schedule the suggested products not pending yet; returns how many.
+
+        The cache is checked on the speculation thread, so cached products are
+        skipped there and the caller never waits on the cache store.
+        """
+        if not self._ai_service.is_available():
+            return 0
+
+        products: List[ProductInput] = [
+            {"name": name, "category": category, "brand": brand, "basic_info": None}
+            for name, brand in parse_suggested_products(suggestions)[:self.max_items]
+        ]
+
+        with self._lock:
+            products = [p for p in products if self._key(p) not in self._pending]
+            room = self.max_pending - len(self._pending)
+            if len(products) > room:
+                self._dropped += len(products) - max(room, 0)
+                products = products[:max(room, 0)]
+            self._pending.update(self._key(p) for p in products)
+            self._scheduled += len(products)
+
+        if products:
+            logger.debug(f"Speculatively generating {len(products)} description(s) for {category}")
+            self._executor.submit(self._generate, products)
+        return len(products)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "scheduled": self._scheduled,
+                "generated": self._generated,
+                "already_cached": self._already_cached,
+                "dropped": self._dropped,
+                "failed": self._failed
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _generate(self, products: List[ProductInput]) -> None:
+        try:
+            missing = [p for p in products if not self._ai_service.has_cached_description(p)]
+            with self._lock:
+                self._already_cached += len(products) - len(missing)
+            for start in range(0, len(missing), self.batch_size):
+                chunk = missing[start:start + self.batch_size]
+                try:
+                    with ai_priority(BACKGROUND):
+                        descriptions = self._ai_service.generate_product_descriptions(chunk)
+                except AIGenerationError as e:
+                    # Speculation is best effort: the create call will generate on its own
+                    logger.debug(f"Speculative descriptions failed: {e}")
+                    with self._lock:
+                        self._failed += len(chunk)
+                    continue
+                stored = 0
+                for product, description in zip(chunk, descriptions):
+                    if description is not None:
+                        self._ai_service.store_cached_description(product, description)
+                        stored += 1
+                with self._lock:
+                    self._generated += stored
+                    self._failed += len(chunk) - stored
+        finally:
+            with self._lock:
+                self._pending.difference_update(self._key(p) for p in products)
+
+    @staticmethod
+    def _key(product: ProductInput) -> Tuple[str, str, str]:
+        return product["name"], product["category"], product["brand"]
@@ -0,0 +1,100 @@
+"""
+Transporte de las llamadas a Gemini
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import time
+from requests.adapters import HTTPAdapter
+
+TRANSPORT_KINDS = ("grpc", "rest")
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """Connection settings of the Gemini clients"""
+    kind: str = "grpc"
+    pool_size: int = 10  # REST keep-alive connections; gRPC multiplexes on one channel
+    connect_timeout_seconds: float = 5.0
+    read_timeout_seconds: Optional[float] = 60.0  # Per request (None = SDK default)
+    keepalive_seconds: float = 30.0
+
+    def __post_init__(self):
+        if self.kind not in TRANSPORT_KINDS:
+            raise ValueError(f"Unknown AI transport: {self.kind} (expected one of {', '.join(TRANSPORT_KINDS)})")
+        if self.pool_size <= 0:
+            raise ValueError("pool_size must be a positive integer")
+
+    def request_options(self) -> Dict[str, Any]:
+        """request_options for generate_content / count_tokens"""
+        return {"timeout": self.read_timeout_seconds} if self.read_timeout_seconds else {}
+
+    def grpc_channel_options(self) -> List[Tuple[str, int]]:
+        return [
+            ("grpc.keepalive_time_ms", int(self.keepalive_seconds * 1000)),
+            ("grpc.keepalive_timeout_ms", int(self.connect_timeout_seconds * 1000)),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0)
+        ]
+
+class _TimeoutAdapter(HTTPAdapter):
+    """Keep-alive pool that adds a connect timeout to every request (the SDK only passes one timeout)"""
+
+    def __init__(self, connect_timeout: float, **kwargs):
+        self.connect_timeout = connect_timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if not isinstance(timeout, tuple):
+            timeout = (self.connect_timeout, timeout)
+        return super().send(request, timeout=timeout, **kwargs)
+
+def _channel_factory(create_channel: Callable[..., Any], config: TransportConfig) -> Callable[..., Any]:
+    """Wrap a transport's create_channel to add the keep-alive options"""
+    def create(host, options=(), **kwargs):
+        return create_channel(host, options=[*options, *config.grpc_channel_options()], **kwargs)
+    return create
+
+def build_generative_client(api_key: str, config: TransportConfig) -> Any:
+    """Sync GenerativeServiceClient for api_key with the configured transport (AttributeError if the SDK changed)"""
+    from google.ai import generativelanguage as glm
+    from google.ai.generativelanguage_v1beta.services.generative_service.transports import (
+        GenerativeServiceGrpcTransport
+    )
+
+    if config.kind == "rest":
+        client = glm.GenerativeServiceClient(client_options={"api_key": api_key}, transport="rest")
+        session = getattr(getattr(client, "_transport", None), "_session", None)
+        if session is None:
+            raise AttributeError("GenerativeServiceRestTransport has no _session")
+        session.mount("https://", _TimeoutAdapter(
+            config.connect_timeout_seconds, pool_connections=1, pool_maxsize=config.pool_size
+        ))
+        return client
+
+    channel = _channel_factory(GenerativeServiceGrpcTransport.create_channel, config)
+    return glm.GenerativeServiceClient(
+        client_options={"api_key": api_key},
+        transport=lambda **kwargs: GenerativeServiceGrpcTransport(channel=channel, **kwargs)
+    )
+
+def build_generative_async_client(api_key: str, config: TransportConfig) -> Any:
+    """Async client (always gRPC: the SDK has no async REST transport); needs a running event loop"""
+    from google.ai import generativelanguage as glm
+    from google.ai.generativelanguage_v1beta.services.generative_service.transports import (
+        GenerativeServiceGrpcAsyncIOTransport
+    )
+
+    channel = _channel_factory(GenerativeServiceGrpcAsyncIOTransport.create_channel, config)
+    return glm.GenerativeServiceAsyncClient(
+        client_options={"api_key": api_key},
+        transport=lambda **kwargs: GenerativeServiceGrpcAsyncIOTransport(channel=channel, **kwargs)
+    )
+
+def warm_up_model(model: Any, connections: int = 1, timeout: Optional[float] = None) -> float:
+    """Open connections with cheap count_tokens calls (in parallel); returns the seconds it took"""
+    options = {"request_options": {"timeout": timeout}} if timeout else {}
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="ai-warmup") as executor:
+        for future in [executor.submit(model.count_tokens, "ping", **options) for _ in range(connections)]:
+            future.result()
+    return time.monotonic() - started
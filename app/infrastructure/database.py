@@ -1,9 +1,12 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, func
 from typing import List, Optional
+from datetime import datetime, timedelta
 from decimal import Decimal
 from app.models.product import Product as ProductModel
-from app.domain.entities import Product
+from app.models.description_job import DescriptionJob as DescriptionJobModel
+from app.models.category_suggestion import CategorySuggestion as CategorySuggestionModel
+from app.domain.entities import CategorySuggestions, DescriptionJob, Product
 
 class ProductRepository:
     def __init__(self, session: Session):
@@ -15,6 +18,7 @@ class ProductRepository:
             if db_product:
                 db_product.name = product.name
                 db_product.description = product.description
+                db_product.description_source = product.description_source
                 db_product.price = product.price
                 db_product.category = product.category
                 db_product.brand = product.brand
@@ -26,6 +30,7 @@ class ProductRepository:
             db_product = ProductModel(
                 name=product.name,
                 description=product.description,
+                description_source=product.description_source,
                 price=product.price,
                 category=product.category,
                 brand=product.brand,
@@ -53,6 +58,7 @@ class ProductRepository:
             id=db_product.id,
             name=db_product.name,
             description=db_product.description,
+            description_source=db_product.description_source or Product.DESCRIPTION_MANUAL,
             price=db_product.price,
             category=db_product.category,
             brand=db_product.brand,
@@ -75,6 +81,7 @@ class ProductRepository:
             id=db_product.id,
             name=db_product.name,
             description=db_product.description,
+            description_source=db_product.description_source or Product.DESCRIPTION_MANUAL,
             price=db_product.price,
             category=db_product.category,
             brand=db_product.brand,
@@ -102,6 +109,52 @@ class ProductRepository:
         
         return [self._map_to_domain(product) for product in db_products]
 
+    def get_page(self, after_id: int = 0, limit: int = 100, category: Optional[str] = None) -> List[Product]:
+        """Active products with id > after_id in id order (keyset paging for bulk jobs)"""
+        conditions = [ProductModel.is_active == True, ProductModel.id > after_id]
+        if category is not None:
+            conditions.append(ProductModel.category == category)
+        result = self.session.execute(
+            select(ProductModel).where(and_(*conditions)).order_by(ProductModel.id).limit(limit)
+        )
+        db_products = result.scalars().all()
+        
+        return [self._map_to_domain(product) for product in db_products]
+
+    def count_active(self, category: Optional[str] = None) -> int:
+        conditions = [ProductModel.is_active == True]
+        if category is not None:
+            conditions.append(ProductModel.category == category)
+        return self.session.execute(
+            select(func.count()).select_from(ProductModel).where(and_(*conditions))
+        ).scalar_one()
+
+    def claim_fallback_descriptions(self, limit: int, min_age_seconds: float) -> List[Product]:
+        """Lock active products still holding a fallback description, untouched for min_age_seconds.
+        
+        Age is measured on the database clock (the one that sets updated_at). Claimed rows get
+        updated_at = now, a lease that hides them from other workers until they age again.
+        """
+        now = self.session.execute(select(func.now())).scalar_one()
+        result = self.session.execute(
+            select(ProductModel)
+            .where(and_(
+                ProductModel.is_active == True,
+                ProductModel.description_source == Product.DESCRIPTION_FALLBACK,
+                ProductModel.updated_at <= now - timedelta(seconds=min_age_seconds)
+            ))
+            .order_by(ProductModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        db_products = result.scalars().all()
+        
+        for db_product in db_products:
+            db_product.updated_at = now
+        products = [self._map_to_domain(product) for product in db_products]
+        self.session.commit()
+        return products
+
     def search_by_name_or_description(self, search_term: str) -> List[Product]:
         search_pattern = f"%{search_term}%"
         result = self.session.execute(
@@ -117,6 +170,15 @@ class ProductRepository:
         
         return [self._map_to_domain(product) for product in db_products]
 
+    def get_categories(self) -> List[str]:
+        result = self.session.execute(
+            select(ProductModel.category)
+            .where(ProductModel.is_active == True)
+            .distinct()
+            .order_by(ProductModel.category)
+        )
+        return list(result.scalars().all())
+
     def delete(self, product_id: int) -> bool:
         db_product = self.session.get(ProductModel, product_id)
         if db_product:
@@ -131,6 +193,7 @@ class ProductRepository:
             id=db_product.id,
             name=db_product.name,
             description=db_product.description,
+            description_source=db_product.description_source or Product.DESCRIPTION_MANUAL,
             price=db_product.price,
             category=db_product.category,
             brand=db_product.brand,
@@ -138,4 +201,144 @@ class ProductRepository:
             is_active=db_product.is_active,
             created_at=db_product.created_at,
             updated_at=db_product.updated_at
-        )
\ No newline at end of file
+        )
+
+
+class DescriptionJobRepository:
+    """Cola de generación de descripciones persistida en la tabla description_jobs.
+    
+    Un job reclamado queda bloqueado hasta locked_until; si el worker muere antes de
+    terminarlo el lease expira y otro worker lo vuelve a reclamar (at-least-once).
+    """
+    def __init__(self, session: Session):
+        self.session = session
+
+    def enqueue(self, product_id: int, basic_info: Optional[str] = None) -> DescriptionJob:
+        db_job = DescriptionJobModel(
+            product_id=product_id,
+            status=DescriptionJob.PENDING,
+            basic_info=basic_info,
+            attempts=0
+        )
+        self.session.add(db_job)
+        self.session.commit()
+        self.session.refresh(db_job)
+        return self._map_to_domain(db_job)
+
+    def claim_next(self, lease_seconds: float) -> Optional[DescriptionJob]:
+        """Lock the oldest runnable job (pending, or running with an expired lease)"""
+        now = datetime.utcnow()
+        result = self.session.execute(
+            select(DescriptionJobModel)
+            .where(
+                or_(
+                    and_(
+                        DescriptionJobModel.status == DescriptionJob.PENDING,
+                        or_(DescriptionJobModel.locked_until.is_(None), DescriptionJobModel.locked_until <= now)
+                    ),
+                    and_(
+                        DescriptionJobModel.status == DescriptionJob.RUNNING,
+                        DescriptionJobModel.locked_until <= now
+                    )
+                )
+            )
+            .order_by(DescriptionJobModel.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        db_job = result.scalar_one_or_none()
+        
+        if not db_job:
+            self.session.rollback()
+            return None
+        
+        db_job.status = DescriptionJob.RUNNING
+        db_job.attempts = (db_job.attempts or 0) + 1
+        db_job.locked_until = now + timedelta(seconds=lease_seconds)
+        self.session.commit()
+        self.session.refresh(db_job)
+        return self._map_to_domain(db_job)
+
+    def mark_succeeded(self, job_id: int) -> None:
+        db_job = self.session.get(DescriptionJobModel, job_id)
+        if db_job:
+            db_job.status = DescriptionJob.SUCCEEDED
+            db_job.locked_until = None
+            db_job.last_error = None
+            self.session.commit()
+
+    def mark_failed(self, job_id: int, error: str, retry_delay: Optional[float] = None) -> None:
+        """Record a failed attempt; with retry_delay the job becomes runnable again after it"""
+        db_job = self.session.get(DescriptionJobModel, job_id)
+        if db_job:
+            db_job.last_error = error
+            if retry_delay is None:
+                db_job.status = DescriptionJob.FAILED
+                db_job.locked_until = None
+            else:
+                db_job.status = DescriptionJob.PENDING
+                db_job.locked_until = datetime.utcnow() + timedelta(seconds=retry_delay)
+            self.session.commit()
+
+    def find_latest_by_product(self, product_id: int) -> Optional[DescriptionJob]:
+        result = self.session.execute(
+            select(DescriptionJobModel)
+            .where(DescriptionJobModel.product_id == product_id)
+            .order_by(DescriptionJobModel.id.desc())
+            .limit(1)
+        )
+        db_job = result.scalar_one_or_none()
+        
+        if not db_job:
+            return None
+        
+        return self._map_to_domain(db_job)
+
+    def _map_to_domain(self, db_job: DescriptionJobModel) -> DescriptionJob:
+        return DescriptionJob(
+            id=db_job.id,
+            product_id=db_job.product_id,
+            status=db_job.status,
+            basic_info=db_job.basic_info,
+            attempts=db_job.attempts or 0,
+            last_error=db_job.last_error,
+            locked_until=db_job.locked_until,
+            created_at=db_job.created_at,
+            updated_at=db_job.updated_at
+        )
+
+
+class CategorySuggestionRepository:
+    """Sugerencias de productos precalculadas por categoría"""
+    def __init__(self, session: Session):
+        self.session = session
+
+    def find_by_category(self, category: str) -> Optional[CategorySuggestions]:
+        db_suggestions = self.session.get(CategorySuggestionModel, category)
+        
+        if not db_suggestions:
+            return None
+        
+        return CategorySuggestions(
+            category=db_suggestions.category,
+            suggestions=db_suggestions.suggestions,
+            count=db_suggestions.item_count,
+            generated_at=db_suggestions.generated_at
+        )
+
+    def save(self, suggestions: CategorySuggestions) -> CategorySuggestions:
+        db_suggestions = self.session.get(CategorySuggestionModel, suggestions.category)
+        if db_suggestions:
+            db_suggestions.suggestions = suggestions.suggestions
+            db_suggestions.item_count = suggestions.count
+            db_suggestions.generated_at = suggestions.generated_at
+        else:
+            self.session.add(CategorySuggestionModel(
+                category=suggestions.category,
+                suggestions=suggestions.suggestions,
+                item_count=suggestions.count,
+                generated_at=suggestions.generated_at
+            ))
+        
+        self.session.commit()
+        return suggestions
@@ -18,6 +18,26 @@ class AIGenerationError(AIServiceError):
         self.original_error = original_error
         super().__init__(f"{service_name}: {message}")
 
+class AIEmptyResponseError(AIGenerationError):
+    """The model answered without any text"""
+    pass
+
+class AIQualityError(AIGenerationError):
+    """The model answered, but the text failed the operation's validation (e.g. unparseable JSON)"""
+    pass
+
 class AIValidationError(AIServiceError):
     """Error in input validation"""
-    pass
\ No newline at end of file
+    pass
+
+class AIQuotaExceededError(AIGenerationError):
+    """Client-side quota could not be acquired in time"""
+    pass
+
+class AIConcurrencyLimitError(AIGenerationError):
+    """No adaptive concurrency permit became available in time"""
+    pass
+
+class AICircuitOpenError(AIGenerationError):
+    """The circuit breaker is open: the AI service is failing and calls are short-circuited"""
+    pass
@@ -1,5 +1,10 @@
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
 from app.core.config import settings
-from .ai_services import GeminiDirectService
+from .ai_factory import AIServiceFactory
+from .ai_batching import DescriptionMicroBatcher
+from .ai_scheduler import INTERACTIVE, ai_priority, get_current_priority
+from .ai_speculation import SpeculativeDescriptionGenerator
 from .exceptions import AIConfigurationError
 import logging
 
@@ -12,11 +17,29 @@ class GeminiAIService:
     
     def __init__(self):
         """Initialize Gemini Direct service"""
-        api_key = settings.get_google_api_key()
-        if not api_key:
+        # The local fake model (AI_BACKEND=fake) needs no credentials
+        if settings.ai_backend != "fake" and not settings.get_google_api_key():
             raise AIConfigurationError("GOOGLE_API_KEY is required for Gemini service")
         
-        self._ai_service = GeminiDirectService(api_key=api_key)
+        self._ai_service = AIServiceFactory.create_ai_service()
+        self._batcher = (
+            DescriptionMicroBatcher(
+                self._ai_service,
+                window_ms=settings.ai_microbatch_window_ms,
+                max_batch_size=settings.ai_microbatch_max_size
+            )
+            if settings.ai_microbatch_enabled else None
+        )
+        # Pre-generated descriptions are only useful if a later create can read them from the cache
+        self._speculator = (
+            SpeculativeDescriptionGenerator(
+                self._ai_service,
+                max_items=settings.ai_speculation_max_items,
+                batch_size=settings.ai_batch_max_products,
+                max_pending=settings.ai_speculation_max_pending
+            )
+            if settings.ai_speculation_enabled and settings.ai_cache_enabled else None
+        )
         logger.info("🚀 Gemini AI Service initialized successfully")
 
     def generate_product_description(
@@ -24,28 +47,157 @@ class GeminiAIService:
         name: str, 
         category: str, 
         brand: str, 
-        basic_info: str = None
+        basic_info: str = None,
+        priority: Optional[str] = None
     ) -> str:
-        """Genera una descripción detallada del producto usando Gemini"""
-        return self._ai_service.generate_product_description(
-            name=name,
-            category=category, 
-            brand=brand,
-            basic_info=basic_info
-        )
+        """Genera una descripción detallada del producto usando Gemini
+        (agrupada con otras llamadas concurrentes si el micro-batching está activo)"""
+        with ai_priority(priority):
+            if self._use_batcher():
+                return self._batcher.submit(name, category, brand, basic_info)
+            return self._ai_service.generate_product_description(
+                name=name,
+                category=category, 
+                brand=brand,
+                basic_info=basic_info
+            )
+
+    def generate_product_descriptions(
+        self,
+        products: List[Dict[str, Optional[str]]],
+        priority: Optional[str] = None
+    ) -> List[Optional[str]]:
+        """Genera descripciones para varios productos empaquetándolos en prompts de hasta
+        ai_batch_max_products productos (None donde una sección no se pudo parsear)"""
+        descriptions: List[Optional[str]] = []
+        with ai_priority(priority):
+            for chunk in self._chunk(products):
+                descriptions.extend(self._ai_service.generate_product_descriptions(chunk))
+        return descriptions
 
-    def generate_product_suggestions(self, category: str, count: int = 5) -> str:
-        """Genera sugerencias de productos para una categoría usando Gemini"""
-        return self._ai_service.generate_product_suggestions(category, count)
+    def generate_product_suggestions(self, category: str, count: int = 5, priority: Optional[str] = None) -> str:
+        """Genera sugerencias de productos para una categoría usando Gemini
+        (y pre-genera en segundo plano las descripciones de los productos sugeridos)"""
+        with ai_priority(priority):
+            suggestions = self._ai_service.generate_product_suggestions(category, count)
+        self._speculate(category, suggestions)
+        return suggestions
 
-    def improve_product_description(self, current_description: str) -> str:
+    def improve_product_description(self, current_description: str, priority: Optional[str] = None) -> str:
         """Mejora una descripción existente del producto usando Gemini"""
-        return self._ai_service.improve_product_description(current_description)
+        with ai_priority(priority):
+            return self._ai_service.improve_product_description(current_description)
+
+    async def generate_product_description_async(
+        self, 
+        name: str, 
+        category: str, 
+        brand: str, 
+        basic_info: str = None,
+        priority: Optional[str] = None
+    ) -> str:
+        """Versión asíncrona de generate_product_description (no ocupa un hilo del threadpool)"""
+        with ai_priority(priority):
+            if self._use_batcher():
+                return await self._batcher.submit_async(name, category, brand, basic_info)
+            return await self._ai_service.generate_product_description_async(
+                name=name,
+                category=category, 
+                brand=brand,
+                basic_info=basic_info
+            )
+
+    async def generate_product_descriptions_async(
+        self,
+        products: List[Dict[str, Optional[str]]],
+        priority: Optional[str] = None
+    ) -> List[Optional[str]]:
+        """Versión asíncrona de generate_product_descriptions (los lotes se generan en paralelo)"""
+        with ai_priority(priority):
+            results = await asyncio.gather(*[
+                self._ai_service.generate_product_descriptions_async(chunk)
+                for chunk in self._chunk(products)
+            ])
+        return [description for chunk in results for description in chunk]
+
+    async def generate_product_suggestions_async(
+        self,
+        category: str,
+        count: int = 5,
+        priority: Optional[str] = None
+    ) -> str:
+        """Versión asíncrona de generate_product_suggestions"""
+        with ai_priority(priority):
+            suggestions = await self._ai_service.generate_product_suggestions_async(category, count)
+        self._speculate(category, suggestions)
+        return suggestions
+
+    async def improve_product_description_async(
+        self,
+        current_description: str,
+        priority: Optional[str] = None
+    ) -> str:
+        """Versión asíncrona de improve_product_description"""
+        with ai_priority(priority):
+            return await self._ai_service.improve_product_description_async(current_description)
+    
+    async def stream_product_suggestions_async(self, category: str, count: int = 5) -> AsyncIterator[str]:
+        """Emite las sugerencias en fragmentos a medida que Gemini las genera"""
+        chunks: List[str] = []
+        async for chunk in self._ai_service.stream_product_suggestions_async(category, count):
+            chunks.append(chunk)
+            yield chunk
+        self._speculate(category, "".join(chunks))
+
+    def stream_improve_product_description_async(self, current_description: str) -> AsyncIterator[str]:
+        """Emite la descripción mejorada en fragmentos a medida que Gemini la genera"""
+        return self._ai_service.stream_improve_product_description_async(current_description)
+
+    def _speculate(self, category: str, suggestions: str) -> None:
+        """Hand the suggested products to the speculative generator (never fails the caller)"""
+        if self._speculator is None:
+            return
+        try:
+            self._speculator.submit(category, suggestions)
+        except Exception as e:
+            logger.warning(f"Could not schedule speculative descriptions for {category}: {e}")
+
+    def _use_batcher(self) -> bool:
+        """Only interactive calls are micro-batched (the batcher's thread would lose the priority)"""
+        return self._batcher is not None and get_current_priority() == INTERACTIVE
+
+    def _chunk(self, products: List[Dict[str, Optional[str]]]) -> List[List[Dict[str, Optional[str]]]]:
+        """Split products into prompt-sized batches"""
+        size = max(1, settings.ai_batch_max_products)
+        return [products[i:i + size] for i in range(0, len(products), size)]
+    
+    def is_available(self) -> bool:
+        """False mientras el circuit breaker está abierto (usar el fallback sin esperar)"""
+        return self._ai_service.is_available()
+    
+    def warm_up(self) -> dict:
+        """Abre las conexiones con Gemini antes de la primera petición"""
+        return self._ai_service.warm_up()
+    
+    def record_fallback(self, operation: str) -> None:
+        """Registra que el llamador usó un resultado sin AI para la operación"""
+        self._ai_service.record_fallback(operation)
+    
+    def get_stats(self) -> dict:
+        """Retorna métricas de ejecución de la capa de AI (cache, micro-batching, etc.)"""
+        stats = self._ai_service.get_stats()
+        stats["micro_batching"] = self._batcher.get_stats() if self._batcher is not None else None
+        stats["speculation"] = self._speculator.get_stats() if self._speculator is not None else None
+        return stats
+    
+    def get_health(self) -> dict:
+        """Estado de vida del servicio a partir de las llamadas recientes (no llama a Gemini)"""
+        return self._ai_service.get_health()
     
     def get_service_info(self) -> dict:
         """Retorna información sobre el servicio de Gemini"""
         return {
             "service": "Gemini Direct API",
-            "model": "gemini-2.0-flash",
+            "model": self._ai_service.model_name,
             "status": "active"
         }
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Gemini local para pruebas de carga y benchmarks sin red
+"""
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Iterator, List, Optional
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from google.api_core import exceptions as google_exceptions
+from .prompts import CHARS_PER_TOKEN, estimate_tokens
+
+_WORDS = (
+    "calidad", "diseño", "rendimiento", "versátil", "duradero", "innovador", "cómodo",
+    "eficiente", "elegante", "práctico", "resistente", "ligero", "potente", "ideal",
+    "moderno", "fiable", "intuitivo", "compacto", "premium", "equilibrado"
+)
+
+@dataclass
+class FakeGeminiConfig:
+    """Latency distribution and fault injection of the fake model"""
+    latency_ms: float = 300.0  # Median latency
+    latency_sigma: float = 0.5  # Log-normal spread (0 = constant latency)
+    error_429_rate: float = 0.0
+    error_500_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 30.0
+    stream_chunk_chars: int = 80
+    connect_latency_ms: float = 0.0  # Cost of opening a connection (0 = free)
+    connection_pool_size: int = 10  # Idle keep-alive connections kept (0 = new connection per call)
+    connection_idle_seconds: float = 60.0  # Idle connections older than this are closed
+    seed: Optional[int] = None
+
+class FakeGenerativeModel:
+    """Offline stand-in for genai.GenerativeModel"""
+
+    def __init__(self, config: Optional[FakeGeminiConfig] = None, model_name: str = "models/gemini-fake"):
+        self.config = config or FakeGeminiConfig()
+        self.model_name = model_name
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._idle_connections: List[float] = []  # Last use of each idle connection
+        self._connections_opened = 0
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def connections_opened(self) -> int:
+        return self._connections_opened
+
+    def generate_content(self, contents: Any, generation_config: Any = None, stream: bool = False, **kwargs) -> Any:
+        prompt = str(contents)
+        latency, fault = self._plan()
+        time.sleep(self._checkout())
+        try:
+            time.sleep(latency if fault != "timeout" else self.config.timeout_seconds)
+        finally:
+            self._checkin()
+        self._raise(fault)
+        text = self._text(prompt, generation_config)
+        if stream:
+            return self._stream_chunks(prompt, text)
+        return self._response(prompt, text)
+
+    async def generate_content_async(
+        self,
+        contents: Any,
+        generation_config: Any = None,
+        stream: bool = False,
+        **kwargs
+    ) -> Any:
+        prompt = str(contents)
+        latency, fault = self._plan()
+        await asyncio.sleep(self._checkout())
+        try:
+            await asyncio.sleep(latency if fault != "timeout" else self.config.timeout_seconds)
+        finally:
+            self._checkin()
+        self._raise(fault)
+        text = self._text(prompt, generation_config)
+        if stream:
+            return self._stream_chunks_async(prompt, text)
+        return self._response(prompt, text)
+
+    def count_tokens(self, contents: Any, **kwargs) -> Any:
+        time.sleep(self._checkout())
+        self._checkin()
+        return SimpleNamespace(total_tokens=estimate_tokens(str(contents)))
+
+    async def count_tokens_async(self, contents: Any, **kwargs) -> Any:
+        await asyncio.sleep(self._checkout())
+        self._checkin()
+        return SimpleNamespace(total_tokens=estimate_tokens(str(contents)))
+
+    def _checkout(self) -> float:
+        """Take an idle live connection; returns the seconds spent opening one if there was none"""
+        config = self.config
+        now = time.monotonic()
+        with self._lock:
+            while self._idle_connections:
+                if now - self._idle_connections.pop() <= config.connection_idle_seconds:
+                    return 0.0
+            self._connections_opened += 1
+        return config.connect_latency_ms / 1000
+
+    def _checkin(self) -> None:
+        """Return the connection to the keep-alive pool (closed if the pool is full)"""
+        with self._lock:
+            if len(self._idle_connections) < self.config.connection_pool_size:
+                self._idle_connections.append(time.monotonic())
+
+    def _plan(self):
+        """Draw the latency and the injected fault (None, 429, 500 or timeout) of a call"""
+        config = self.config
+        with self._lock:
+            self._calls += 1
+            draw = self._rng.random()
+            noise = self._rng.gauss(0, 1)
+        latency = config.latency_ms / 1000 * math.exp(config.latency_sigma * noise)
+        if draw < config.error_429_rate:
+            return latency, "429"
+        draw -= config.error_429_rate
+        if draw < config.error_500_rate:
+            return latency, "500"
+        draw -= config.error_500_rate
+        if draw < config.timeout_rate:
+            return latency, "timeout"
+        return latency, None
+
+    @staticmethod
+    def _raise(fault: Optional[str]) -> None:
+        if fault == "429":
+            raise google_exceptions.ResourceExhausted("Fake Gemini: resource exhausted")
+        if fault == "500":
+            raise google_exceptions.InternalServerError("Fake Gemini: internal error")
+        if fault == "timeout":
+            raise google_exceptions.DeadlineExceeded("Fake Gemini: deadline exceeded")
+
+    def _text(self, prompt: str, generation_config: Any) -> str:
+        """Deterministic text shaped like the answer each prompt type expects"""
+        max_tokens = getattr(generation_config, "max_output_tokens", None) or 1024
+        max_chars = max_tokens * CHARS_PER_TOKEN
+
+        batch = re.search(r"Productos \(JSON\):\n(\[.*?\])\n\nInstrucciones", prompt, re.S)
+        if batch:
+            products = json.loads(batch.group(1))
+            per_product = max(max_chars // max(len(products), 1) - 40, 40)
+            return json.dumps([
+                {"index": p["index"], "description": self._sentences(f"{prompt}{p['index']}", p["name"], per_product)}
+                for p in products
+            ], ensure_ascii=False)
+
+        suggestions = re.search(r"Genera una lista de (\d+) productos populares para la categoría: (.+)", prompt)
+        if suggestions:
+            count, category = int(suggestions.group(1)), suggestions.group(2).strip()
+            lines = []
+            for i in range(1, count + 1):
+                seed = self._digest(f"{prompt}{i}")
+                lines.append(
+                    f"{i}. {category} {_WORDS[seed % len(_WORDS)].capitalize()} {seed % 900 + 100} - "
+                    f"Marca{seed % 50} - Producto {_WORDS[(seed >> 8) % len(_WORDS)]} y {_WORDS[(seed >> 16) % len(_WORDS)]}"
+                )
+            return "\n".join(lines)[:max_chars]
+
+        subject = re.search(r"- Nombre: (.+)", prompt)
+        return self._sentences(prompt, subject.group(1).strip() if subject else "Este producto", min(max_chars, 1200))
+
+    def _sentences(self, seed_text: str, subject: str, max_chars: int) -> str:
+        seed = self._digest(seed_text)
+        sentences: List[str] = []
+        length = 0
+        i = 0
+        while True:
+            a, b = _WORDS[(seed + i) % len(_WORDS)], _WORDS[(seed // 7 + 3 * i) % len(_WORDS)]
+            sentence = f"{subject} ofrece un acabado {a} y un uso {b}."
+            if sentences and length + len(sentence) + 1 > max_chars:
+                break
+            sentences.append(sentence)
+            length += len(sentence) + 1
+            i += 1
+            if i >= 12:
+                break
+        return " ".join(sentences)[:max_chars]
+
+    @staticmethod
+    def _digest(text: str) -> int:
+        return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
+
+    @staticmethod
+    def _usage(prompt: str, text: str) -> SimpleNamespace:
+        prompt_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(text)
+        return SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens
+        )
+
+    def _response(self, prompt: str, text: str) -> SimpleNamespace:
+        return SimpleNamespace(text=text, usage_metadata=self._usage(prompt, text))
+
+    def _chunks(self, prompt: str, text: str) -> List[SimpleNamespace]:
+        size = max(self.config.stream_chunk_chars, 1)
+        parts = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        chunks = [SimpleNamespace(text=part, usage_metadata=None) for part in parts]
+        chunks[-1].usage_metadata = self._usage(prompt, text)
+        return chunks
+
+    def _stream_chunks(self, prompt: str, text: str) -> Iterator[SimpleNamespace]:
+        yield from self._chunks(prompt, text)
+
+    async def _stream_chunks_async(self, prompt: str, text: str) -> AsyncIterator[SimpleNamespace]:
+        for chunk in self._chunks(prompt, text):
+            await asyncio.sleep(0)
+            yield chunk
@@ -2,6 +2,59 @@
 Templates de prompts para servicios de AI como constantes
 Separamos los prompts de la lógica de negocio
 """
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import json
+
+# Token budgeting
+CHARS_PER_TOKEN = 4  # Local approximation of Gemini's tokenizer (no count_tokens round trip)
+TRUNCATION_MARK = "…"
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Approximate token count of a text"""
+    if not text:
+        return 0
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def trim_to_token_budget(text: Optional[str], max_tokens: Optional[int]) -> Optional[str]:
+    """Trim text to roughly max_tokens, cutting at a sentence or word boundary"""
+    if not text or max_tokens is None or estimate_tokens(text) <= max_tokens:
+        return text
+    
+    max_chars = max(max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARK), 1)
+    cut = text[:max_chars]
+    sentence_end = max(cut.rfind(". "), cut.rfind("\n"))
+    if sentence_end >= max_chars * 0.6:
+        return cut[:sentence_end + 1].rstrip()
+    word_end = cut.rfind(" ")
+    if word_end > 0:
+        cut = cut[:word_end]
+    return cut.rstrip() + TRUNCATION_MARK
+
+@dataclass(frozen=True)
+class PromptBudget:
+    """Input trimming limits and max_output_tokens per prompt type"""
+    basic_info_tokens: int = 256
+    current_description_tokens: int = 768
+    description_output_tokens: int = 768
+    batch_output_tokens_per_product: int = 512
+    suggestion_output_tokens_per_item: int = 64
+    improve_output_tokens: int = 1024
+    max_output_tokens_limit: int = 8192
+
+    def max_output_tokens(self, operation: str, count: int = 1) -> int:
+        """max_output_tokens for an operation (count = products or suggestions requested)"""
+        if operation == "product_descriptions_batch":
+            tokens = self.batch_output_tokens_per_product * count + 128
+        elif operation == "product_suggestions":
+            tokens = self.suggestion_output_tokens_per_item * count + 64
+        elif operation == "improve_description":
+            tokens = self.improve_output_tokens
+        else:
+            tokens = self.description_output_tokens
+        return min(tokens, self.max_output_tokens_limit)
+
+DEFAULT_PROMPT_BUDGET = PromptBudget()
 
 # Product Description Prompts
 PRODUCT_DESCRIPTION_BASE_PROMPT = """Genera una descripción atractiva y detallada para un producto de e-commerce.
@@ -21,6 +74,25 @@ Instrucciones:
 
 Descripción:"""
 
+# Batch Product Description Prompts (JSON mode)
+BATCH_PRODUCT_DESCRIPTION_PROMPT = """Genera descripciones atractivas y detalladas para {count} productos de e-commerce.
+
+Productos (JSON):
+{products_json}
+
+Instrucciones para cada producto:
+1. Crea una descripción comercial atractiva (2-3 párrafos)
+2. Destaca las características principales y beneficios
+3. Usa un tono profesional pero accesible
+4. Incluye posibles usos o aplicaciones
+5. NO menciones precios ni disponibilidad
+
+Formato de respuesta:
+Responde ÚNICAMENTE con un array JSON de {count} objetos, uno por producto, con las claves
+"index" (el índice del producto recibido) y "description" (su descripción).
+
+Respuesta JSON:"""
+
 # Product Suggestions Prompts
 PRODUCT_SUGGESTIONS_PROMPT = """Genera una lista de {count} productos populares para la categoría: {category}
 
@@ -52,8 +124,15 @@ Instrucciones para mejorar:
 Descripción mejorada:"""
 
 # Helper functions for formatting prompts
-def format_product_description_prompt(name: str, category: str, brand: str, basic_info: str = None) -> str:
-    """Format product description prompt with parameters"""
+def format_product_description_prompt(
+    name: str,
+    category: str,
+    brand: str,
+    basic_info: str = None,
+    budget: PromptBudget = DEFAULT_PROMPT_BUDGET
+) -> str:
+    """Format product description prompt with parameters (basic_info trimmed to the budget)"""
+    basic_info = trim_to_token_budget(basic_info, budget.basic_info_tokens)
     additional_info = f"- Información adicional: {basic_info}" if basic_info else ""
     return PRODUCT_DESCRIPTION_BASE_PROMPT.format(
         name=name,
@@ -62,6 +141,28 @@ def format_product_description_prompt(name: str, category: str, brand: str, basi
         additional_info=additional_info
     )
 
+def format_batch_product_description_prompt(
+    products: List[Dict[str, Optional[str]]],
+    budget: PromptBudget = DEFAULT_PROMPT_BUDGET
+) -> str:
+    """Format a multi-product description prompt; each product needs name, category and brand"""
+    packed = []
+    for index, product in enumerate(products):
+        item = {
+            "index": index,
+            "name": product["name"],
+            "category": product["category"],
+            "brand": product["brand"]
+        }
+        if product.get("basic_info"):
+            item["additional_info"] = trim_to_token_budget(product["basic_info"], budget.basic_info_tokens)
+        packed.append(item)
+    
+    return BATCH_PRODUCT_DESCRIPTION_PROMPT.format(
+        count=len(products),
+        products_json=json.dumps(packed, ensure_ascii=False, indent=2)
+    )
+
 def format_product_suggestions_prompt(category: str, count: int = 5) -> str:
     """Format product suggestions prompt with parameters"""
     return PRODUCT_SUGGESTIONS_PROMPT.format(
@@ -69,8 +170,15 @@ def format_product_suggestions_prompt(category: str, count: int = 5) -> str:
         count=count
     )
 
-def format_improve_description_prompt(current_description: str) -> str:
-    """Format improve description prompt with parameters"""
+def format_improve_description_prompt(
+    current_description: str,
+    budget: PromptBudget = DEFAULT_PROMPT_BUDGET
+) -> str:
+    """Format improve description prompt with parameters.
+    
+    The description is trimmed to the budget so repeated improvements do not keep
+    growing the prompt.
+    """
     return IMPROVE_DESCRIPTION_PROMPT.format(
-        current_description=current_description
+        current_description=trim_to_token_budget(current_description, budget.current_description_tokens)
     )
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""
+Benchmark del coste de conexión por llamada: python -m app.infrastructure.transport_benchmark --help
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import argparse
+import json
+import statistics
+import sys
+import time
+from .ai_services import GeminiDirectService
+from .ai_transport import TransportConfig
+from .fake_gemini import FakeGeminiConfig, FakeGenerativeModel
+
+SCENARIOS = ("no_reuse", "keepalive", "keepalive_warmup")
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+def run_scenario(
+    scenario: str,
+    calls: int = 200,
+    concurrency: int = 8,
+    latency_ms: float = 50.0,
+    connect_latency_ms: float = 80.0
+) -> Dict[str, float]:
+    """Time `calls` description generations (distinct prompts, no cache) under one scenario"""
+    if scenario not in SCENARIOS:
+        raise ValueError(f"Unknown scenario: {scenario} (expected one of {', '.join(SCENARIOS)})")
+
+    model = FakeGenerativeModel(FakeGeminiConfig(
+        latency_ms=latency_ms,
+        latency_sigma=0,
+        connect_latency_ms=connect_latency_ms,
+        connection_pool_size=0 if scenario == "no_reuse" else concurrency,
+        seed=1
+    ))
+    service = GeminiDirectService(
+        api_key="",
+        model=model,
+        transport=TransportConfig(kind="rest", pool_size=concurrency)
+    )
+    if scenario == "keepalive_warmup":
+        service.warm_up()
+    opened_before = model.connections_opened
+
+    def timed_call(i: int) -> float:
+        started = time.monotonic()
+        service.generate_product_description(f"Producto {i}", "Benchmark", "Marca")
+        return time.monotonic() - started
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(timed_call, range(calls)))
+
+    return {
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2),
+        "p50_ms": round(_percentile(latencies, 0.5) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+        "connections_opened": model.connections_opened - opened_before
+    }
+
+def run_benchmark(
+    calls: int = 200,
+    concurrency: int = 8,
+    latency_ms: float = 50.0,
+    connect_latency_ms: float = 80.0
+) -> dict:
+    """Every scenario plus the mean per-call overhead saved against no_reuse"""
+    results = {
+        scenario: run_scenario(scenario, calls, concurrency, latency_ms, connect_latency_ms)
+        for scenario in SCENARIOS
+    }
+    baseline = results["no_reuse"]["mean_ms"]
+    for result in results.values():
+        result["overhead_saved_ms"] = round(baseline - result["mean_ms"], 2)
+    return {
+        "calls": calls,
+        "concurrency": concurrency,
+        "latency_ms": latency_ms,
+        "connect_latency_ms": connect_latency_ms,
+        "scenarios": results
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-call connection overhead with and without keep-alive reuse")
+    parser.add_argument("--calls", type=int, default=200, help="Model calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent calls (and keep-alive pool size)")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Latency of the fake model")
+    parser.add_argument("--connect-latency-ms", type=float, default=80.0, help="Cost of opening a connection")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.calls, args.concurrency, args.latency_ms, args.connect_latency_ms)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.database import engine
 from app.models import Product
 from app.routers.product_router import router as product_router
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="Product Catalog API",
     description="API para gestionar catálogo de productos con descripciones generadas por Gemini AI",
@@ -32,28 +35,34 @@ def health_check():
 
 @app.get("/ai-status")
 def ai_service_status():
-    """Check Gemini AI service status"""
+    """Check Gemini AI service status (cached liveness, no model call or client construction)"""
     try:
-        from app.core.config import settings
-        from app.infrastructure.external_services import GeminiAIService
-        
-        api_key = settings.get_google_api_key()
+        from app.infrastructure.ai_registry import ai_service_registry
         
-        if not api_key:
+        if not settings.get_google_api_key() and settings.ai_backend != "fake":
             return {
                 "status": "error",
                 "message": "GOOGLE_API_KEY not configured",
                 "service": "Gemini Direct API"
             }
         
-        # Test service initialization
-        ai_service = GeminiAIService()
-        service_info = ai_service.get_service_info()
+        return ai_service_registry.health()
+    except Exception as e:
+        return {
+            "status": "error",
+            "message": f"AI service error: {str(e)}",
+            "service": "Gemini Direct API"
+        }
+
+@app.get("/ai-metrics")
+def ai_service_metrics():
+    """Runtime metrics of the AI layer (cache counters, per-operation latency/token histograms, etc.)"""
+    try:
+        from app.core.dependencies import get_ai_service
         
         return {
-            "status": "healthy",
-            "message": "Gemini AI service is working correctly",
-            **service_info
+            "status": "ok",
+            **get_ai_service().get_stats()
         }
     except Exception as e:
         return {
@@ -62,6 +71,58 @@ def ai_service_status():
             "service": "Gemini Direct API"
         }
 
+description_worker = None
+description_repairer = None
+
 @app.on_event("startup")
 def startup_event():
-    pass
\ No newline at end of file
+    global description_worker, description_repairer
+    from app.infrastructure.ai_registry import ai_service_registry
+    
+    try:
+        ai_service_registry.initialize()
+    except Exception as e:
+        logger.error(f"AI service not initialized: {e}")
+    
+    if settings.ai_transport_warmup_enabled and ai_service_registry.is_initialized:
+        try:
+            ai_service_registry.get().warm_up()
+        except Exception as e:
+            logger.error(f"AI connections not warmed up: {e}")
+    
+    if settings.description_worker_enabled:
+        from app.workers.description_worker import create_description_worker
+        
+        try:
+            description_worker = create_description_worker()
+            description_worker.start()
+        except Exception as e:
+            logger.error(f"Description job worker not started: {e}")
+    
+    if settings.description_repair_enabled:
+        from app.workers.description_repair import create_description_repairer
+        
+        try:
+            description_repairer = create_description_repairer()
+            description_repairer.start()
+        except Exception as e:
+            logger.error(f"Fallback description repairer not started: {e}")
+    
+    if settings.ai_suggestions_precompute_enabled:
+        from app.core.dependencies import get_suggestion_refresher
+        
+        try:
+            get_suggestion_refresher().start()
+        except Exception as e:
+            logger.error(f"Category suggestion refresher not started: {e}")
+
+@app.on_event("shutdown")
+def shutdown_event():
+    if description_worker is not None:
+        description_worker.stop()
+    if description_repairer is not None:
+        description_repairer.stop()
+    if settings.ai_suggestions_precompute_enabled:
+        from app.core.dependencies import get_suggestion_refresher
+        
+        get_suggestion_refresher().stop()
\ No newline at end of file
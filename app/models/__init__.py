@@ -1,3 +1,5 @@
 from .product import Product
+from .description_job import DescriptionJob
+from .category_suggestion import CategorySuggestion
 
-__all__ = ["Product"]
\ No newline at end of file
+__all__ = ["Product", "DescriptionJob", "CategorySuggestion"]
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.core.database import Base
+
+class CategorySuggestion(Base):
+    __tablename__ = "category_suggestions"
+    
+    category = Column(String(100), primary_key=True)
+    suggestions = Column(Text, nullable=False)
+    item_count = Column(Integer, nullable=False)
+    generated_at = Column(DateTime, nullable=False)
@@ -8,6 +8,7 @@ class Product(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
+    description_source = Column(String(20), nullable=False, default="manual", server_default="manual", index=True)
     price = Column(DECIMAL(10, 2), nullable=False)
     category = Column(String(100), nullable=False, index=True)
     brand = Column(String(100), nullable=False)
@@ -1,33 +1,93 @@
+from typing import AsyncIterator
+import json
+import logging
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.core.config import settings
 from app.core.dependencies import get_product_service
 from app.application.product_service import ProductService
 from .schemas import (
     ProductCreateRequest, 
+    ProductBatchCreateRequest,
     ProductUpdateRequest, 
     StockUpdateRequest,
     CategorySuggestionsResponse,
     ProductResponse,
+    ProductBatchCreateResponse,
+    ProductBatchError,
+    ProductAcceptedResponse,
+    DescriptionJobResponse,
     StockUpdateResponse,
     MessageResponse
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/products", tags=["Product Catalog"])
 
-@router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
-def create_product(
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+async def _sse_stream(chunks: AsyncIterator[str], done: dict) -> AsyncIterator[str]:
+    """Relay text chunks as SSE 'chunk' events, then a 'done' (or 'error') event"""
+    parts = []
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield _sse_event("chunk", {"text": chunk})
+    except ValueError as e:
+        yield _sse_event("error", {"detail": str(e)})
+        return
+    except Exception as e:
+        logger.error(f"Unexpected error while streaming: {e}")
+        yield _sse_event("error", {"detail": "Internal server error"})
+        return
+    yield _sse_event("done", {**done, "text": "".join(parts).strip()})
+
+@router.post(
+    "/",
+    response_model=ProductResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": ProductAcceptedResponse}}
+)
+async def create_product(
     product_data: ProductCreateRequest,
+    defer_description: bool = Query(False, description="Return 202 at once and generate the description in the background"),
     service: ProductService = Depends(get_product_service)
 ):
     """Crear un nuevo producto con descripción generada por AI"""
     try:
-        product = service.create_product(
+        if defer_description and product_data.auto_generate_description:
+            product, job = await service.create_product_deferred_async(
+                name=product_data.name,
+                price=product_data.price,
+                category=product_data.category,
+                brand=product_data.brand,
+                stock_quantity=product_data.stock_quantity,
+                basic_info=product_data.basic_info
+            )
+            accepted = ProductAcceptedResponse(
+                product=ProductResponse.model_validate(product),
+                description_job=DescriptionJobResponse.model_validate(job)
+            )
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content=accepted.model_dump(mode="json"),
+                headers={"Location": f"{router.prefix}/{product.id}/description-job"}
+            )
+        
+        product = await service.create_product_async(
             name=product_data.name,
             price=product_data.price,
             category=product_data.category,
             brand=product_data.brand,
             stock_quantity=product_data.stock_quantity,
             basic_info=product_data.basic_info,
-            auto_generate_description=product_data.auto_generate_description
+            auto_generate_description=product_data.auto_generate_description,
+            latency_budget=settings.ai_latency_budget_create_product_seconds
         )
         
         return ProductResponse.model_validate(product)
@@ -36,6 +96,26 @@ def create_product(
     except Exception:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
+@router.post("/batch", response_model=ProductBatchCreateResponse, status_code=status.HTTP_201_CREATED)
+def create_products(
+    batch_data: ProductBatchCreateRequest,
+    service: ProductService = Depends(get_product_service)
+):
+    """Crear varios productos generando las descripciones con prompts multi-producto"""
+    try:
+        created, errors = service.create_products(
+            [product_data.model_dump() for product_data in batch_data.products]
+        )
+        
+        return ProductBatchCreateResponse(
+            created=[ProductResponse.model_validate(product) for product in created],
+            errors=[ProductBatchError(**error) for error in errors]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
 @router.get("/", response_model=list[ProductResponse])
 def get_all_products(
     available_only: bool = Query(False, description="Only return available products"),
@@ -71,6 +151,24 @@ def get_product_by_id(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
+@router.get("/{product_id}/description-job", response_model=DescriptionJobResponse)
+def get_description_job(
+    product_id: int,
+    service: ProductService = Depends(get_product_service)
+):
+    """Estado de la generación de descripción encolada para un producto"""
+    try:
+        job = service.get_description_job(product_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Description job not found")
+        
+        return DescriptionJobResponse.model_validate(job)
+    except HTTPException:
+        raise
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
 @router.put("/{product_id}", response_model=ProductResponse)
 def update_product(
     product_id: int,
@@ -186,28 +284,61 @@ def search_products(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 @router.post("/{product_id}/improve-description", response_model=ProductResponse)
-def improve_product_description(
+async def improve_product_description(
     product_id: int,
     service: ProductService = Depends(get_product_service)
 ):
     """Mejorar la descripción de un producto usando Gemini AI"""
     try:
-        product = service.improve_product_description(product_id)
+        product = await service.improve_product_description_async(product_id)
         return ProductResponse.model_validate(product)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
+@router.post("/{product_id}/improve-description/stream")
+async def stream_improve_product_description(
+    product_id: int,
+    service: ProductService = Depends(get_product_service)
+):
+    """Mejorar la descripción emitiendo fragmentos SSE a medida que Gemini genera;
+    la descripción se guarda al completar el stream"""
+    try:
+        chunks = await service.stream_improve_product_description_async(product_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+    
+    return StreamingResponse(
+        _sse_stream(chunks, {"product_id": product_id}),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
+@router.get("/suggestions/{category}/stream")
+async def stream_category_suggestions(
+    category: str,
+    count: int = Query(5, ge=1, le=10, description="Number of suggestions (1-10)"),
+    service: ProductService = Depends(get_product_service)
+):
+    """Obtener sugerencias de productos como Server-Sent Events a medida que Gemini las genera"""
+    return StreamingResponse(
+        _sse_stream(service.stream_category_suggestions_async(category, count), {"category": category}),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
 @router.get("/suggestions/{category}", response_model=CategorySuggestionsResponse)
-def get_category_suggestions(
+async def get_category_suggestions(
     category: str,
     count: int = Query(5, ge=1, le=10, description="Number of suggestions (1-10)"),
     service: ProductService = Depends(get_product_service)
 ):
     """Obtener sugerencias de productos para una categoría usando Gemini AI"""
     try:
-        suggestions = service.get_category_suggestions(category, count)
+        suggestions = await service.get_category_suggestions_async(category, count)
         return CategorySuggestionsResponse(category=category, suggestions=suggestions)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
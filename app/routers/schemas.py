@@ -12,6 +12,9 @@ class ProductCreateRequest(BaseModel):
     basic_info: Optional[str] = Field(None, max_length=500)
     auto_generate_description: bool = True
 
+class ProductBatchCreateRequest(BaseModel):
+    products: list[ProductCreateRequest] = Field(..., min_length=1, max_length=100)
+
 class ProductUpdateRequest(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     price: Optional[Decimal] = Field(None, gt=0, decimal_places=2)
@@ -27,6 +30,7 @@ class ProductResponse(BaseModel):
     id: Optional[int]
     name: str
     description: Optional[str]
+    description_source: Optional[str] = None
     price: Decimal
     category: str
     brand: str
@@ -43,6 +47,15 @@ class ProductResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ProductBatchError(BaseModel):
+    index: int
+    name: str
+    detail: str
+
+class ProductBatchCreateResponse(BaseModel):
+    created: list[ProductResponse]
+    errors: list[ProductBatchError]
+
 class StockUpdateResponse(BaseModel):
     message: str
     new_stock: int
@@ -52,4 +65,20 @@ class MessageResponse(BaseModel):
 
 class CategorySuggestionsResponse(BaseModel):
     category: str
-    suggestions: str
\ No newline at end of file
+    suggestions: str
+
+class DescriptionJobResponse(BaseModel):
+    id: int
+    product_id: int
+    status: str
+    attempts: int
+    last_error: Optional[str]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+class ProductAcceptedResponse(BaseModel):
+    product: ProductResponse
+    description_job: DescriptionJobResponse
@@ -0,0 +1,6 @@
+from .description_worker import DescriptionJobWorker
+from .suggestion_refresher import CategorySuggestionRefresher
+from .bulk_redescribe import BulkRedescriptionJob
+from .description_repair import FallbackDescriptionRepairer
+
+__all__ = ["DescriptionJobWorker", "CategorySuggestionRefresher", "BulkRedescriptionJob", "FallbackDescriptionRepairer"]
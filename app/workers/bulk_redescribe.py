@@ -0,0 +1,209 @@
+"""
+Mejora masiva de descripciones de productos: python -m app.workers.bulk_redescribe --help
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from sqlalchemy.orm import Session
+from app.application.product_service import ProductService
+from app.domain.entities import Product
+from app.infrastructure.ai_scheduler import BATCH, ai_priority
+from app.infrastructure.database import ProductRepository
+
+logger = logging.getLogger(__name__)
+
+class BulkRedescriptionJob:
+    """Chunked, checkpointed improve_product_description over many products"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        ai_service: Any,
+        category: Optional[str] = None,
+        chunk_size: int = 100,
+        concurrency: int = 4,
+        checkpoint_path: Optional[str] = None
+    ):
+        if chunk_size <= 0 or concurrency <= 0:
+            raise ValueError("chunk_size and concurrency must be positive integers")
+
+        self._session_factory = session_factory
+        self._ai_service = ai_service
+        self.category = category
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.checkpoint_path = checkpoint_path
+        self._stop = threading.Event()
+        self._state = self._load_checkpoint()
+        self._total: Optional[int] = None
+        self._run_started: Optional[float] = None
+        self._run_processed = 0
+
+    def stop(self) -> None:
+        """Finish the current chunk, write the checkpoint and return from run()"""
+        self._stop.set()
+
+    def run(self) -> dict:
+        """Process every remaining product and return the report"""
+        with self._session_factory() as session:
+            self._total = ProductRepository(session).count_active(self.category)
+        self._run_started = time.monotonic()
+        self._run_processed = 0
+        resumed = self._state["processed"]
+        if resumed:
+            logger.info(f"🔁 Resuming bulk re-description after product {self._state['last_id']} ({resumed} done)")
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bulk-redescribe") as executor:
+            while not self._stop.is_set():
+                with self._session_factory() as session:
+                    products = ProductRepository(session).get_page(
+                        self._state["last_id"], self.chunk_size, self.category
+                    )
+                if not products:
+                    self._state["completed"] = True
+                    break
+
+                results = list(executor.map(self._improve, products))
+                self._record_chunk(products, results)
+                self._save_checkpoint()
+                self._log_progress()
+
+        report = self.get_report()
+        logger.info(
+            f"✅ Bulk re-description {'finished' if report['completed'] else 'stopped'}: "
+            f"{report['succeeded']} improved, {report['failed']} failed, {report['skipped']} skipped"
+        )
+        return report
+
+    def get_report(self) -> dict:
+        """Progress, throughput and per-item failures so far"""
+        state = self._state
+        elapsed = time.monotonic() - self._run_started if self._run_started is not None else 0.0
+        return {
+            "category": self.category,
+            "completed": state["completed"],
+            "last_id": state["last_id"],
+            "total": self._total,
+            "processed": state["processed"],
+            "succeeded": state["succeeded"],
+            "failed": len(state["failures"]),
+            "skipped": state["skipped"],
+            "elapsed_seconds": round(elapsed, 2),
+            "items_per_second": round(self._run_processed / elapsed, 3) if elapsed > 0 else None,
+            "failures": list(state["failures"])
+        }
+
+    def _improve(self, product: Product) -> Optional[str]:
+        """Improve one product in its own session; returns the error message or None"""
+        if not product.description or not product.description.strip():
+            return None
+        try:
+            with self._session_factory() as session, ai_priority(BATCH):
+                ProductService(ProductRepository(session), self._ai_service).improve_product_description(product.id)
+            return None
+        except Exception as e:
+            return str(e) or type(e).__name__
+
+    def _record_chunk(self, products: List[Product], errors: List[Optional[str]]) -> None:
+        state = self._state
+        for product, error in zip(products, errors):
+            if not product.description or not product.description.strip():
+                state["skipped"] += 1
+            elif error is None:
+                state["succeeded"] += 1
+            else:
+                logger.warning(f"Product {product.id} ({product.name}) not improved: {error}")
+                state["failures"].append({"product_id": product.id, "name": product.name, "error": error})
+        state["processed"] += len(products)
+        state["last_id"] = products[-1].id
+        self._run_processed += len(products)
+
+    def _log_progress(self) -> None:
+        report = self.get_report()
+        total = f"/{report['total']}" if report["total"] is not None else ""
+        logger.info(
+            f"📈 Bulk re-description: {report['processed']}{total} processed, "
+            f"{report['failed']} failed, {report['items_per_second']} items/s"
+        )
+
+    def _new_state(self) -> Dict[str, Any]:
+        return {
+            "category": self.category,
+            "last_id": 0,
+            "processed": 0,
+            "succeeded": 0,
+            "skipped": 0,
+            "failures": [],
+            "completed": False,
+            "started_at": datetime.utcnow().isoformat()
+        }
+
+    def _load_checkpoint(self) -> Dict[str, Any]:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return self._new_state()
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("category") != self.category:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} belongs to category {state.get('category')!r}, "
+                f"not {self.category!r}"
+            )
+        return state
+
+    def _save_checkpoint(self) -> None:
+        """Write the checkpoint atomically (temp file + rename)"""
+        if not self.checkpoint_path:
+            return
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self._state, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.checkpoint_path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Improve product descriptions in bulk with Gemini")
+    parser.add_argument("--category", help="Only products of this category (default: all active products)")
+    parser.add_argument("--chunk-size", type=int, default=100, help="Products loaded and checkpointed per chunk")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent improve calls")
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file; an existing one is resumed (default: bulk_redescribe_<category|all>.json)"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    from app.core.database import SessionLocal
+    from app.core.dependencies import get_ai_service
+
+    job = BulkRedescriptionJob(
+        session_factory=SessionLocal,
+        ai_service=get_ai_service(),
+        category=args.category,
+        chunk_size=args.chunk_size,
+        concurrency=args.concurrency,
+        checkpoint_path=args.checkpoint or f"bulk_redescribe_{args.category or 'all'}.json"
+    )
+
+    def handle_signal(signum, frame):
+        logger.info("Stopping after the current chunk...")
+        job.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    report = job.run()
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0 if report["completed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
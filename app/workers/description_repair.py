@@ -0,0 +1,152 @@
+"""
+Reparación de descripciones de fallback: python -m app.workers.description_repair
+"""
+from typing import Any, Callable, Optional
+import logging
+import signal
+import threading
+from sqlalchemy.orm import Session
+from app.application.product_service import ProductService
+from app.infrastructure.ai_scheduler import BACKGROUND, ai_priority
+from app.infrastructure.database import ProductRepository
+from app.infrastructure.exceptions import AIGenerationError
+
+logger = logging.getLogger(__name__)
+
+class FallbackDescriptionRepairer:
+    """Rate-limited regeneration of fallback descriptions"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        ai_service: Any,
+        interval_seconds: float = 60.0,
+        batch_size: int = 20,
+        per_minute: int = 30,
+        min_age_seconds: float = 300.0
+    ):
+        if batch_size <= 0 or per_minute <= 0:
+            raise ValueError("batch_size and per_minute must be positive integers")
+
+        self._session_factory = session_factory
+        self._ai_service = ai_service
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.per_minute = per_minute
+        self.min_age_seconds = min_age_seconds
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._repaired = 0
+        self._failed = 0
+        self._skipped_unhealthy = 0
+
+    def start(self) -> None:
+        """Start the periodic repair thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="description-repair", daemon=True)
+        self._thread.start()
+        logger.info(f"🩹 Fallback description repairer started ({self.per_minute}/min)")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def run_once(self) -> int:
+        """Regenerate up to batch_size fallback descriptions; returns how many were repaired"""
+        if not self._ai_service.is_available():
+            with self._lock:
+                self._skipped_unhealthy += 1
+            return 0
+
+        session = self._session_factory()
+        try:
+            products = ProductRepository(session).claim_fallback_descriptions(self.batch_size, self.min_age_seconds)
+        finally:
+            session.close()
+
+        repaired = 0
+        pause = 60.0 / self.per_minute
+        for index, product in enumerate(products):
+            if index and self._stop.wait(pause):
+                break
+            try:
+                if self._repair(product):
+                    repaired += 1
+            except AIGenerationError as e:
+                # Gemini is still failing: leave the rest for a later pass
+                logger.warning(f"Fallback repair paused, AI service failing: {e}")
+                with self._lock:
+                    self._failed += 1
+                break
+
+        if repaired:
+            logger.info(f"🩹 Regenerated {repaired} fallback descriptions")
+        return repaired
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._thread is not None,
+                "repaired": self._repaired,
+                "failed": self._failed,
+                "skipped_unhealthy": self._skipped_unhealthy
+            }
+
+    def _repair(self, product) -> bool:
+        session = self._session_factory()
+        try:
+            with ai_priority(BACKGROUND):
+                repaired = ProductService(ProductRepository(session), self._ai_service).regenerate_fallback_description(product)
+        finally:
+            session.close()
+        if repaired:
+            with self._lock:
+                self._repaired += 1
+        return repaired
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Fallback description repair error: {e}")
+
+
+def create_description_repairer(ai_service: Optional[Any] = None) -> FallbackDescriptionRepairer:
+    """Repairer configured from settings, sharing the process-wide AI service"""
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+    from app.core.dependencies import get_ai_service
+
+    return FallbackDescriptionRepairer(
+        session_factory=SessionLocal,
+        ai_service=ai_service or get_ai_service(),
+        interval_seconds=settings.description_repair_interval_seconds,
+        batch_size=settings.description_repair_batch_size,
+        per_minute=settings.description_repair_per_minute,
+        min_age_seconds=settings.description_repair_min_age_seconds
+    )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    repairer = create_description_repairer()
+    stopped = threading.Event()
+
+    def handle_signal(signum, frame):
+        stopped.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    repairer.start()
+    stopped.wait()
+    logger.info("Stopping fallback description repairer...")
+    repairer.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Worker de la cola de descripciones (tabla description_jobs): python -m app.workers.description_worker
+"""
+from typing import Any, Callable, List, Optional
+import logging
+import signal
+import threading
+from sqlalchemy.orm import Session
+from app.application.product_service import ProductService
+from app.infrastructure.ai_scheduler import BATCH, ai_priority
+from app.infrastructure.database import DescriptionJobRepository, ProductRepository
+
+logger = logging.getLogger(__name__)
+
+class DescriptionJobWorker:
+    """Pool of threads claiming and running description jobs"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        ai_service: Any,
+        concurrency: int = 4,
+        lease_seconds: float = 120.0,
+        max_attempts: int = 5,
+        poll_interval: float = 1.0,
+        retry_base_delay: float = 5.0
+    ):
+        if concurrency <= 0:
+            raise ValueError("concurrency must be a positive integer")
+
+        self._session_factory = session_factory
+        self._ai_service = ai_service
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.retry_base_delay = retry_base_delay
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._succeeded = 0
+        self._retried = 0
+        self._failed = 0
+
+    def start(self) -> None:
+        """Start the worker threads"""
+        self._stop.clear()
+        for index in range(self.concurrency):
+            thread = threading.Thread(
+                target=self._loop, name=f"description-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"🧵 Description job worker started with {self.concurrency} threads")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop claiming jobs and wait for the running ones"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def run_once(self) -> bool:
+        """Claim and run one job; False when the queue had nothing runnable"""
+        session = self._session_factory()
+        try:
+            jobs = DescriptionJobRepository(session)
+            job = jobs.claim_next(self.lease_seconds)
+            if job is None:
+                return False
+
+            service = ProductService(ProductRepository(session), self._ai_service, job_repo=jobs)
+            try:
+                with ai_priority(BATCH):
+                    service.run_description_job(job)
+            except Exception as e:
+                # A failed flush leaves the session unusable until it is rolled back
+                session.rollback()
+                if job.attempts < self.max_attempts:
+                    delay = self.retry_base_delay * 2 ** (job.attempts - 1)
+                    logger.warning(f"Description job {job.id} failed (attempt {job.attempts}), retrying in {delay:.0f}s: {e}")
+                    jobs.mark_failed(job.id, str(e), retry_delay=delay)
+                    self._count("_retried")
+                else:
+                    logger.error(f"Description job {job.id} failed after {job.attempts} attempts: {e}")
+                    jobs.mark_failed(job.id, str(e))
+                    self._count("_failed")
+            else:
+                jobs.mark_succeeded(job.id)
+                self._count("_succeeded")
+            return True
+        finally:
+            session.close()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "threads": len(self._threads),
+                "succeeded": self._succeeded,
+                "retried": self._retried,
+                "failed": self._failed
+            }
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.run_once():
+                    continue
+            except Exception as e:
+                logger.error(f"Description job worker error: {e}")
+            self._stop.wait(self.poll_interval)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+def create_description_worker(ai_service: Optional[Any] = None) -> DescriptionJobWorker:
+    """Worker configured from settings, sharing the process-wide AI service"""
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+    from app.core.dependencies import get_ai_service
+
+    return DescriptionJobWorker(
+        session_factory=SessionLocal,
+        ai_service=ai_service or get_ai_service(),
+        concurrency=settings.description_worker_concurrency,
+        lease_seconds=settings.description_worker_lease_seconds,
+        max_attempts=settings.description_worker_max_attempts,
+        poll_interval=settings.description_worker_poll_interval_seconds
+    )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    worker = create_description_worker()
+    stopped = threading.Event()
+
+    def handle_signal(signum, frame):
+        stopped.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    worker.start()
+    stopped.wait()
+    logger.info("Stopping description job worker...")
+    worker.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Refresco programado de las sugerencias de productos por categoría
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Set
+import fcntl
+import hashlib
+import logging
+import os
+import threading
+from sqlalchemy.orm import Session
+from app.application.product_service import ProductService
+from app.domain.entities import CategorySuggestions
+from app.infrastructure.ai_scheduler import BACKGROUND, ai_priority
+from app.infrastructure.database import CategorySuggestionRepository, ProductRepository
+
+logger = logging.getLogger(__name__)
+
+class CategorySuggestionRefresher:
+    """Background precomputation of category suggestions"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        ai_service: Any,
+        interval_seconds: float = 3600.0,
+        max_age_seconds: float = 86400.0,
+        lock_dir: Optional[str] = None
+    ):
+        self._session_factory = session_factory
+        self._ai_service = ai_service
+        self.interval_seconds = interval_seconds
+        self.max_age_seconds = max_age_seconds
+        self.lock_dir = lock_dir  # None = no cross-process lock (single worker)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="suggestion-refresh")
+        self._in_flight: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._refreshed = 0
+        self._failed = 0
+        self._skipped = 0
+        self._revalidations = 0
+
+    def start(self) -> None:
+        """Start the periodic refresh thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="suggestion-refresher", daemon=True)
+        self._thread.start()
+        logger.info(f"🔁 Category suggestion refresher started (every {self.interval_seconds:.0f}s)")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def revalidate(self, stored: CategorySuggestions) -> None:
+        """Called on every read: schedule a refresh if the stored suggestions are stale"""
+        if stored.is_stale(self.max_age_seconds) and self._schedule(stored.category):
+            with self._lock:
+                self._revalidations += 1
+
+    def refresh_all(self) -> int:
+        """Refresh every known category whose suggestions are missing or stale"""
+        session = self._session_factory()
+        try:
+            categories = ProductRepository(session).get_categories()
+            suggestions = CategorySuggestionRepository(session)
+            due = [
+                category for category in categories
+                if (stored := suggestions.find_by_category(category)) is None
+                or stored.is_stale(self.max_age_seconds)
+            ]
+        finally:
+            session.close()
+
+        refreshed = 0
+        for category in due:
+            if self._stop.is_set():
+                break
+            refreshed += self.refresh(category)
+        return refreshed
+
+    def refresh(self, category: str) -> bool:
+        """Regenerate one category unless another worker holds it or already refreshed it; False if not refreshed"""
+        with self._claim(category) as claimed:
+            if not claimed or not self._is_due(category):
+                with self._lock:
+                    self._skipped += 1
+                return False
+            return self._regenerate(category)
+
+    def _is_due(self, category: str) -> bool:
+        """Re-read once claimed: another worker may have refreshed it in the meantime"""
+        session = self._session_factory()
+        try:
+            stored = CategorySuggestionRepository(session).find_by_category(category)
+        finally:
+            session.close()
+        return stored is None or stored.is_stale(self.max_age_seconds)
+
+    def _regenerate(self, category: str) -> bool:
+        session = self._session_factory()
+        try:
+            service = ProductService(
+                ProductRepository(session),
+                self._ai_service,
+                suggestion_repo=CategorySuggestionRepository(session)
+            )
+            with ai_priority(BACKGROUND):
+                service.refresh_category_suggestions(category)
+        except Exception as e:
+            logger.warning(f"Could not refresh suggestions for {category}: {e}")
+            with self._lock:
+                self._failed += 1
+            return False
+        finally:
+            session.close()
+        with self._lock:
+            self._refreshed += 1
+        return True
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                "refreshed": self._refreshed,
+                "failed": self._failed,
+                "skipped": self._skipped,
+                "revalidations": self._revalidations,
+                "in_flight": len(self._in_flight),
+                "max_age_seconds": self.max_age_seconds
+            }
+
+    @contextmanager
+    def _claim(self, category: str) -> Iterator[bool]:
+        """Non-blocking per-category file lock shared by the workers on the host"""
+        if self.lock_dir is None:
+            yield True
+            return
+        os.makedirs(self.lock_dir, exist_ok=True)
+        name = hashlib.sha1(category.encode("utf-8")).hexdigest()
+        with open(os.path.join(self.lock_dir, f"{name}.lock"), "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _schedule(self, category: str) -> bool:
+        """Queue a refresh unless one for the category is already pending"""
+        with self._lock:
+            if category in self._in_flight:
+                return False
+            self._in_flight.add(category)
+
+        def run() -> None:
+            try:
+                self.refresh(category)
+            finally:
+                with self._lock:
+                    self._in_flight.discard(category)
+
+        try:
+            self._executor.submit(run)
+        except RuntimeError:
+            # Executor already shut down
+            with self._lock:
+                self._in_flight.discard(category)
+            return False
+        return True
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                refreshed = self.refresh_all()
+                if refreshed:
+                    logger.info(f"🔁 Refreshed suggestions for {refreshed} categories")
+            except Exception as e:
+                logger.error(f"Category suggestion refresh failed: {e}")
+            self._stop.wait(self.interval_seconds)
@@ -0,0 +1,94 @@
+"""
+Unit tests for transparent micro-batching of description generations
+"""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from app.infrastructure.ai_batching import DescriptionMicroBatcher
+from app.infrastructure.ai_cache import AIResponseCache
+from tests.unit.test_ai_services import StubAIService
+
+
+def _batch_response(*descriptions) -> MagicMock:
+    return MagicMock(text=json.dumps([
+        {"index": i, "description": d} for i, d in enumerate(descriptions)
+    ]))
+
+
+class TestDescriptionMicroBatcher:
+    """Test merging of concurrent single-product generations"""
+
+    def test_concurrent_calls_share_one_request(self):
+        """Calls arriving within the window become one multi-product request"""
+        service = StubAIService()
+        service._model.generate_content.return_value = _batch_response("D0", "D1", "D2")
+        batcher = DescriptionMicroBatcher(service, window_ms=200, max_batch_size=3)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(batcher.submit, f"Product {i}", "Laptops", "Brand")
+                for i in range(3)
+            ]
+            results = sorted(f.result() for f in futures)
+
+        assert results == ["D0", "D1", "D2"]
+        assert service._model.generate_content.call_count == 1
+        assert batcher.get_stats()["batches"] == 1
+
+    def test_single_call_uses_regular_prompt(self):
+        """A lone call after the window is sent as a normal single request"""
+        service = StubAIService("Single description")
+        batcher = DescriptionMicroBatcher(service, window_ms=1, max_batch_size=10)
+
+        assert batcher.submit("iPhone 15", "Smartphones", "Apple") == "Single description"
+
+    def test_batched_results_populate_single_prompt_cache(self):
+        """Later identical single calls are served from cache"""
+        service = StubAIService()
+        service._cache = AIResponseCache()
+        service._model.generate_content.return_value = _batch_response("D0", "D1")
+        batcher = DescriptionMicroBatcher(service, window_ms=200, max_batch_size=2)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda n: batcher.submit(n, "Laptops", "Brand"), ["A", "B"]))
+
+        assert service.generate_product_description("A", "Laptops", "Brand") in ("D0", "D1")
+        assert service._model.generate_content.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_async_calls_share_one_request(self):
+        """Concurrent coroutines are merged the same way"""
+        service = StubAIService()
+        service._model.generate_content_async = AsyncMock(return_value=_batch_response("D0", "D1"))
+        batcher = DescriptionMicroBatcher(service, window_ms=200, max_batch_size=2)
+
+        results = await asyncio.gather(
+            batcher.submit_async("A", "Laptops", "Brand"),
+            batcher.submit_async("B", "Laptops", "Brand")
+        )
+
+        assert results == ["D0", "D1"]
+        assert service._model.generate_content_async.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_strand_followers(self):
+        """The batch is still flushed for the followers when the caller that opened it goes away"""
+        service = StubAIService()
+        service._model.generate_content_async = AsyncMock(side_effect=[
+            _batch_response("D0", "D1"),
+            MagicMock(text="Later description")
+        ])
+        batcher = DescriptionMicroBatcher(service, window_ms=50, max_batch_size=10)
+
+        leader = asyncio.create_task(batcher.submit_async("A", "Laptops", "Brand"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(batcher.submit_async("B", "Laptops", "Brand"))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await asyncio.wait_for(follower, timeout=2) == "D1"
+        assert leader.cancelled()
+        later = await asyncio.wait_for(batcher.submit_async("C", "Laptops", "Brand"), timeout=2)
+        assert later == "Later description"
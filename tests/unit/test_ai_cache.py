@@ -0,0 +1,112 @@
+"""
+Unit tests for the AI response cache
+"""
+import time
+import pytest
+from app.infrastructure.ai_cache import AIResponseCache, SQLiteCacheStore, make_cache_key
+from tests.unit.test_ai_services import StubAIService
+
+
+class TestCacheKey:
+    """Test content-addressed cache keys"""
+
+    def test_same_inputs_same_key(self):
+        """Identical prompt, model and config produce the same key"""
+        config = {"temperature": 0.7}
+        assert make_cache_key("prompt", "model", config) == make_cache_key("prompt", "model", config)
+
+    def test_key_depends_on_model_and_config(self):
+        """Model name and generation config are part of the key"""
+        base = make_cache_key("prompt", "model-a", {"temperature": 0.7})
+        assert base != make_cache_key("prompt", "model-b", {"temperature": 0.7})
+        assert base != make_cache_key("prompt", "model-a", {"temperature": 0.2})
+        assert base != make_cache_key("other prompt", "model-a", {"temperature": 0.7})
+
+
+class TestAIResponseCache:
+    """Test LRU/TTL behaviour and counters"""
+
+    def test_hit_and_miss_counters(self):
+        """Lookups are counted as hits or misses"""
+        cache = AIResponseCache(max_entries=10)
+        assert cache.get("k") is None
+        cache.set("k", "value")
+        assert cache.get("k") == "value"
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_contains_is_not_counted(self):
+        """Checking for an entry counts neither a hit nor a miss"""
+        cache = AIResponseCache(max_entries=10)
+        assert not cache.contains("k")
+        cache.set("k", "value")
+        assert cache.contains("k")
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 0
+        assert stats["misses"] == 0
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted when full"""
+        cache = AIResponseCache(max_entries=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get("c") == "3"
+
+    def test_ttl_expiration(self):
+        """Expired entries are not returned"""
+        cache = AIResponseCache(max_entries=10, ttl_seconds=0.01)
+        cache.set("k", "value")
+        time.sleep(0.02)
+
+        assert cache.get("k") is None
+
+    def test_invalid_size(self):
+        """max_entries must be positive"""
+        with pytest.raises(ValueError):
+            AIResponseCache(max_entries=0)
+
+    def test_persistent_store_survives_restart(self, tmp_path):
+        """A new cache instance reads entries written by a previous one"""
+        db_path = str(tmp_path / "cache.sqlite3")
+        AIResponseCache(store=SQLiteCacheStore(db_path)).set("k", "persisted")
+
+        restarted = AIResponseCache(store=SQLiteCacheStore(db_path))
+
+        assert restarted.get("k") == "persisted"
+        assert restarted.get_stats()["store_hits"] == 1
+
+
+class TestServiceCaching:
+    """Test the cache wired into BaseAIService"""
+
+    def test_identical_prompts_call_model_once(self):
+        """The second identical generation is served from cache"""
+        service = StubAIService("Description")
+        service._cache = AIResponseCache()
+
+        first = service.generate_product_description("iPhone 15", "Smartphones", "Apple")
+        second = service.generate_product_description("iPhone 15", "Smartphones", "Apple")
+
+        assert first == second == "Description"
+        assert service._model.generate_content.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_async_path_shares_cache(self):
+        """Sync and async paths use the same cache entries"""
+        service = StubAIService("Suggestions")
+        service._cache = AIResponseCache()
+
+        service.generate_product_suggestions("Laptops", 3)
+        result = await service.generate_product_suggestions_async("Laptops", 3)
+
+        assert result == "Suggestions"
+        service._model.generate_content_async.assert_not_called()
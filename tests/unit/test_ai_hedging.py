@@ -0,0 +1,131 @@
+"""
+Unit tests for hedged AI requests
+"""
+import asyncio
+import threading
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.infrastructure.ai_hedging import HedgingPolicy
+from tests.unit.test_ai_services import StubAIService
+
+
+def _warm_policy(latency: float = 0.01, **options) -> HedgingPolicy:
+    policy = HedgingPolicy(min_samples=5, **options)
+    for _ in range(5):
+        policy.record_latency(latency)
+    return policy
+
+
+class TestHedgingPolicy:
+    """Test the hedge threshold and the traffic cap"""
+
+    def test_no_threshold_until_min_samples(self):
+        """Hedging stays off until enough latencies were observed"""
+        policy = HedgingPolicy(min_samples=3)
+        policy.record_latency(0.1)
+
+        assert policy.start() is None
+
+    def test_threshold_is_the_percentile(self):
+        """The hedge delay is the configured percentile of recent latencies"""
+        policy = HedgingPolicy(percentile=0.9, min_samples=1)
+        for latency in range(1, 11):
+            policy.record_latency(latency / 10)
+
+        assert policy.start() == pytest.approx(0.9)
+
+    def test_hedged_fraction_is_capped(self):
+        """No more than max_hedge_fraction of requests are duplicated"""
+        policy = _warm_policy(max_hedge_fraction=0.1)
+        hedges = 0
+        for _ in range(50):
+            policy.start()
+            hedges += policy.try_hedge()
+
+        assert hedges == 5
+        assert policy.get_stats()["hedge_rate"] == 0.1
+
+    def test_invalid_percentile(self):
+        with pytest.raises(ValueError):
+            HedgingPolicy(percentile=1.5)
+
+
+class TestHedgedCalls:
+    """Test the hedged call path in BaseAIService"""
+
+    def test_slow_primary_loses_to_hedge(self):
+        """A stalled first call is overtaken by the duplicate"""
+        service = StubAIService()
+        service._hedging = _warm_policy(max_hedge_fraction=1.0)
+        release = threading.Event()
+        calls = []
+
+        def generate(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                release.wait(timeout=2)
+                return MagicMock(text="Primary")
+            return MagicMock(text="Hedge")
+
+        service._model.generate_content.side_effect = generate
+
+        try:
+            assert service.generate_product_suggestions("Laptops", 3) == "Hedge"
+        finally:
+            release.set()
+
+        stats = service.get_stats()["hedging"]
+        assert stats["hedged"] == 1
+        assert stats["hedge_wins"] == 1
+
+    def test_fast_call_is_not_hedged(self):
+        """Calls answering under the threshold are never duplicated"""
+        service = StubAIService("Fast")
+        service._hedging = _warm_policy(latency=1.0, max_hedge_fraction=1.0)
+
+        assert service.generate_product_suggestions("Laptops", 3) == "Fast"
+        assert service._model.generate_content.call_count == 1
+        assert service.get_stats()["hedging"]["hedged"] == 0
+
+    def test_busy_hedge_threads_run_the_call_on_the_caller_thread(self):
+        """Calls never queue behind other hedged calls once the hedge pool is full"""
+        service = StubAIService()
+        service._hedging = _warm_policy(max_hedge_fraction=1.0, max_threads=2)
+        assert service._acquire_hedge_thread() and service._acquire_hedge_thread()
+        threads = []
+
+        def generate(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return MagicMock(text="Inline")
+
+        service._model.generate_content.side_effect = generate
+
+        assert service.generate_product_suggestions("Laptops", 3) == "Inline"
+        assert threads == [threading.current_thread()]
+        assert service.get_stats()["hedging"]["hedged"] == 0
+
+    @pytest.mark.asyncio
+    async def test_async_loser_is_cancelled(self):
+        """The losing coroutine is cancelled once the other answers"""
+        service = StubAIService()
+        service._hedging = _warm_policy(max_hedge_fraction=1.0)
+        cancelled = asyncio.Event()
+        calls = []
+
+        async def generate(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(2)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return MagicMock(text=f"Call {len(calls)}")
+
+        service._model.generate_content_async = AsyncMock(side_effect=generate)
+
+        result = await service.generate_product_suggestions_async("Laptops", 3)
+
+        assert result == "Call 2"
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert service.get_stats()["hedging"]["hedge_wins"] == 1
@@ -0,0 +1,94 @@
+"""
+Unit tests for the adaptive concurrency limiter
+"""
+import pytest
+from google.api_core import exceptions as google_exceptions
+from app.infrastructure.ai_limiter import AdaptiveConcurrencyLimiter
+from app.infrastructure.exceptions import AIConcurrencyLimitError, AIGenerationError
+from tests.unit.test_ai_services import StubAIService
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Test AIMD adaptation"""
+
+    def _saturate(self, limiter: AdaptiveConcurrencyLimiter, latency: float, rounds: int) -> None:
+        for _ in range(rounds):
+            permits = limiter.limit
+            for _ in range(permits):
+                limiter.acquire()
+            for _ in range(permits):
+                limiter.release(latency)
+
+    def test_limit_grows_while_latency_is_flat(self):
+        """Additive increase while latency stays at the baseline"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=10)
+
+        self._saturate(limiter, latency=0.1, rounds=10)
+
+        assert limiter.limit > 2
+        assert limiter.get_stats()["increases"] > 0
+
+    def test_limit_shrinks_on_latency_spike(self):
+        """Multiplicative decrease when latency exceeds the tolerance"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_tolerance=2.0, backoff_ratio=0.5)
+        self._saturate(limiter, latency=0.1, rounds=1)
+        before = limiter.limit
+
+        limiter.acquire()
+        limiter.release(1.0)
+
+        assert limiter.limit < before
+
+    def test_limit_shrinks_on_errors(self):
+        """Overload errors reduce the limit but never below min_limit"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, min_limit=2, backoff_ratio=0.5)
+
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(0.1, overloaded=True)
+
+        assert limiter.limit == 2
+
+    def test_acquire_times_out_when_saturated(self):
+        """Callers beyond the limit are rejected after max_wait_seconds"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_wait_seconds=0.05)
+        limiter.acquire()
+
+        with pytest.raises(AIConcurrencyLimitError):
+            limiter.acquire()
+
+    @pytest.mark.asyncio
+    async def test_async_acquire(self):
+        """The async path shares the same permits"""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_wait_seconds=0.05)
+        await limiter.acquire_async()
+
+        with pytest.raises(AIConcurrencyLimitError):
+            await limiter.acquire_async()
+
+    def test_service_feeds_errors_to_limiter(self):
+        """429/503/504 and timeouts from the SDK count as overload signals"""
+        service = StubAIService()
+        service._limiter = AdaptiveConcurrencyLimiter(initial_limit=4, backoff_ratio=0.5)
+        service._model.generate_content.side_effect = google_exceptions.ServiceUnavailable("down")
+
+        with pytest.raises(AIGenerationError):
+            service.generate_product_suggestions("Laptops", 3)
+
+        stats = service.get_stats()["adaptive_limit"]
+        assert stats["limit"] == 2
+        assert stats["in_flight"] == 0
+
+    def test_client_errors_do_not_shrink_the_limit(self):
+        """A rejected request (400/403) says nothing about Gemini's capacity"""
+        service = StubAIService()
+        service._limiter = AdaptiveConcurrencyLimiter(initial_limit=4, backoff_ratio=0.5)
+        service._model.generate_content.side_effect = google_exceptions.InvalidArgument("bad prompt")
+
+        with pytest.raises(AIGenerationError):
+            service.generate_product_suggestions("Laptops", 3)
+
+        stats = service.get_stats()["adaptive_limit"]
+        assert stats["limit"] == 4
+        assert stats["decreases"] == 0
+        assert stats["in_flight"] == 0
@@ -0,0 +1,125 @@
+"""
+Unit tests for per-operation token and latency accounting
+"""
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from app.application.product_service import ProductService
+from app.infrastructure.ai_cache import AIResponseCache
+from app.infrastructure.ai_metrics import AIMetrics, Histogram
+from app.infrastructure.exceptions import AIGenerationError
+from tests.unit.test_ai_services import StubAIService
+
+
+def _response(text: str, prompt_tokens: int = 40, output_tokens: int = 100) -> MagicMock:
+    response = MagicMock(text=text)
+    response.usage_metadata.prompt_token_count = prompt_tokens
+    response.usage_metadata.candidates_token_count = output_tokens
+    response.usage_metadata.total_token_count = prompt_tokens + output_tokens
+    return response
+
+
+class TestHistogram:
+    """Test bucketed aggregation"""
+
+    def test_snapshot_is_cumulative(self):
+        histogram = Histogram((1, 10))
+        for value in (0.5, 5, 50):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot["buckets"] == {"1": 1, "10": 2, "+Inf": 3}
+        assert snapshot["count"] == 3
+        assert snapshot["max"] == 50
+
+    def test_quantile_uses_bucket_bounds(self):
+        histogram = Histogram((1, 10))
+        for _ in range(9):
+            histogram.observe(0.5)
+        histogram.observe(7)
+
+        assert histogram.quantile(0.5) == 1
+        assert histogram.quantile(0.95) == 10
+
+    def test_empty_histogram(self):
+        assert Histogram((1,)).snapshot()["p50"] is None
+
+
+class TestServiceMetrics:
+    """Test metrics captured by BaseAIService"""
+
+    def test_tokens_and_latency_per_operation(self):
+        """usage_metadata is aggregated under the operation that made the call"""
+        service = StubAIService()
+        service._model.generate_content.return_value = _response("Description", 40, 100)
+
+        service.generate_product_description(name="iPhone 15", category="Smartphones", brand="Apple")
+
+        stats = service.get_stats()["operations"]["product_description"]
+        assert stats["outcomes"]["success"] == 1
+        assert stats["total_prompt_tokens"] == 40
+        assert stats["total_output_tokens"] == 100
+        assert stats["latency_seconds"]["count"] == 1
+
+    def test_empty_and_error_outcomes(self):
+        """Empty responses and SDK errors are counted separately"""
+        service = StubAIService()
+        service._model.generate_content.return_value = MagicMock(text="")
+
+        with pytest.raises(AIGenerationError):
+            service.generate_product_suggestions("Laptops", 3)
+
+        service._model.generate_content.side_effect = RuntimeError("boom")
+        with pytest.raises(AIGenerationError):
+            service.improve_product_description("Basic description")
+
+        operations = service.get_stats()["operations"]
+        assert operations["product_suggestions"]["outcomes"]["empty"] == 1
+        assert operations["improve_description"]["outcomes"]["error"] == 1
+
+    def test_cache_hits_are_counted(self):
+        service = StubAIService("Suggestions")
+        service._cache = AIResponseCache()
+
+        service.generate_product_suggestions("Laptops", 3)
+        service.generate_product_suggestions("Laptops", 3)
+
+        outcomes = service.get_stats()["operations"]["product_suggestions"]["outcomes"]
+        assert outcomes["success"] == 1
+        assert outcomes["cache_hit"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_calls_are_recorded(self):
+        service = StubAIService()
+        service._model.generate_content_async.return_value = _response("Better", 20, 30)
+
+        await service.improve_product_description_async("Basic description")
+
+        stats = service.get_stats()["operations"]["improve_description"]
+        assert stats["outcomes"]["success"] == 1
+        assert stats["output_tokens"]["sum"] == 30
+
+
+class TestFallbackMetrics:
+    """Test fallbacks reported by ProductService"""
+
+    def test_failed_generation_records_fallback(self):
+        ai_service = MagicMock()
+        ai_service.generate_product_description.side_effect = AIGenerationError("down", "Stub")
+        repo = MagicMock()
+        repo.find_by_name.return_value = None
+        repo.save.side_effect = lambda product: product
+
+        product = ProductService(repo, ai_service).create_product(
+            name="A", price=Decimal("1"), category="C", brand="B"
+        )
+
+        assert product.description == "B A - C"
+        ai_service.record_fallback.assert_called_once_with("product_description")
+
+    def test_record_outcome(self):
+        metrics = AIMetrics()
+        metrics.record_outcome("product_description", "fallback")
+
+        assert metrics.get_stats()["product_description"]["outcomes"]["fallback"] == 1
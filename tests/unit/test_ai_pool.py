@@ -0,0 +1,95 @@
+"""
+Unit tests for the multi-key / multi-model Gemini pool
+"""
+import pytest
+from unittest.mock import MagicMock
+from google.api_core import exceptions as google_exceptions
+from app.infrastructure.ai_pool import GeminiModelPool, PoolMember, bind_async_client, create_gemini_member_model
+from app.infrastructure.ai_services import GeminiDirectService
+from app.infrastructure.fake_gemini import FakeGeminiConfig, FakeGenerativeModel
+
+
+def _member(name: str, requests_per_minute=None, **options) -> PoolMember:
+    model = FakeGenerativeModel(FakeGeminiConfig(latency_ms=1, latency_sigma=0, seed=1, **options), f"models/{name}")
+    return PoolMember(name, model, requests_per_minute=requests_per_minute)
+
+
+class TestGeminiModelPool:
+    """Test routing, eviction and per-member accounting"""
+
+    def test_routes_to_least_loaded_member(self):
+        first, second = _member("a"), _member("b")
+        pool = GeminiModelPool([first, second])
+        first.in_flight = 2
+
+        pool.generate_content("prompt")
+
+        assert first.model.calls == 0
+        assert second.model.calls == 1
+
+    def test_rate_limited_member_is_evicted(self):
+        """A 429 takes the member out of rotation for eviction_seconds"""
+        limited, healthy = _member("a", error_429_rate=1.0), _member("b")
+        pool = GeminiModelPool([limited, healthy], eviction_seconds=60)
+
+        with pytest.raises(google_exceptions.ResourceExhausted):
+            pool.generate_content("prompt")
+        for _ in range(3):
+            pool.generate_content("prompt")
+
+        assert limited.model.calls == 1
+        assert healthy.model.calls == 3
+        stats = pool.get_stats()
+        assert stats["available"] == 1
+        assert stats["members"][0]["evictions"] == 1
+
+    def test_members_out_of_quota_are_skipped(self):
+        first, second = _member("a", requests_per_minute=1), _member("b", requests_per_minute=1)
+        pool = GeminiModelPool([first, second])
+
+        pool.generate_content("prompt")
+        pool.generate_content("prompt")
+
+        assert (first.model.calls, second.model.calls) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_async_calls_record_tokens(self):
+        pool = GeminiModelPool([_member("a")])
+
+        await pool.generate_content_async("prompt")
+
+        member = pool.get_stats()["members"][0]
+        assert member["successes"] == 1
+        assert member["requests_last_minute"] == 1
+        assert member["tokens_last_minute"] > 0
+        assert member["in_flight"] == 0
+
+    def test_service_reports_pool_stats(self):
+        pool = GeminiModelPool([_member("a"), _member("b")])
+        service = GeminiDirectService(api_key="", model=pool)
+
+        service.generate_product_description(name="iPhone 15", category="Smartphones", brand="Apple")
+
+        assert pool.model_name == "pool:models/a,models/b"
+        assert sum(m["successes"] for m in service.get_stats()["model_pool"]["members"]) == 1
+
+
+class TestMemberClients:
+    """Per-member SDK clients"""
+
+    @pytest.mark.asyncio
+    async def test_members_get_their_own_clients(self, monkeypatch):
+        """Members never call genai.configure; async clients are made inside the event loop"""
+        import google.generativeai as genai
+        configure = MagicMock()
+        monkeypatch.setattr(genai, "configure", configure)
+
+        first = create_gemini_member_model("key-1", "gemini-2.0-flash")
+        second = create_gemini_member_model("key-2", "gemini-2.0-flash-lite")
+
+        assert first._client is not second._client
+        assert first._async_client is None
+        bind_async_client(first)
+        bind_async_client(second)
+        assert first._async_client is not second._async_client
+        configure.assert_not_called()
@@ -0,0 +1,72 @@
+"""
+Unit tests for the cross-worker quota governor
+"""
+import pytest
+from app.infrastructure.ai_quota import QuotaGovernor, estimate_request_tokens
+from app.infrastructure.exceptions import AIGenerationError, AIQuotaExceededError
+from tests.unit.test_ai_services import StubAIService
+
+
+def _governor(state_dir, **overrides) -> QuotaGovernor:
+    options = {
+        "requests_per_minute": 60,
+        "tokens_per_minute": 10000,
+        "max_concurrency": 2,
+        "max_wait_seconds": 0.2
+    }
+    options.update(overrides)
+    return QuotaGovernor(str(state_dir), **options)
+
+
+class TestQuotaGovernor:
+    """Test token buckets and concurrency slots"""
+
+    def test_estimate_includes_output_ceiling(self):
+        """The estimate counts the prompt and the max output tokens"""
+        assert estimate_request_tokens("x" * 400, {"max_output_tokens": 100}) == 201
+
+    def test_request_bucket_is_shared_between_workers(self, tmp_path):
+        """Two governors on the same state dir (two workers) share one bucket"""
+        worker_a = _governor(tmp_path, requests_per_minute=2)
+        worker_b = _governor(tmp_path, requests_per_minute=2)
+
+        worker_a.release(worker_a.acquire(10))
+        worker_b.release(worker_b.acquire(10))
+
+        with pytest.raises(AIQuotaExceededError):
+            worker_a.acquire(10)
+        assert worker_a.get_stats()["rejected"] == 1
+
+    def test_concurrency_slots_are_shared(self, tmp_path):
+        """In-flight requests across workers never exceed max_concurrency"""
+        worker_a = _governor(tmp_path, max_concurrency=1)
+        worker_b = _governor(tmp_path, max_concurrency=1)
+
+        lease = worker_a.acquire(10)
+        with pytest.raises(AIQuotaExceededError):
+            worker_b.acquire(10)
+
+        worker_a.release(lease)
+        worker_b.release(worker_b.acquire(10))
+
+    def test_unused_tokens_are_refunded(self, tmp_path):
+        """Actual usage below the estimate returns tokens to the bucket"""
+        governor = _governor(tmp_path, tokens_per_minute=1000)
+
+        governor.release(governor.acquire(900), used_tokens=100)
+
+        assert governor.get_stats()["available_tokens"] >= 900
+
+    def test_quota_error_is_a_generation_error(self):
+        """Callers fall back on quota errors like on any generation error"""
+        assert issubclass(AIQuotaExceededError, AIGenerationError)
+
+    def test_service_releases_slot_after_call(self, tmp_path):
+        """BaseAIService acquires and releases the quota around each model call"""
+        service = StubAIService("Description")
+        service._quota = _governor(tmp_path, max_concurrency=1)
+
+        service.generate_product_description("A", "B", "C")
+        service.generate_product_description("D", "E", "F")
+
+        assert service.get_stats()["quota"]["acquired"] == 2
@@ -0,0 +1,73 @@
+"""
+Unit tests for the shared AI service registry and its health snapshot
+"""
+import pytest
+from google.api_core import exceptions as google_exceptions
+from unittest.mock import MagicMock
+from app.infrastructure.ai_registry import AIServiceRegistry
+from app.infrastructure.ai_services import CircuitBreaker, RetryPolicy
+from app.infrastructure.exceptions import AIConfigurationError, AIGenerationError
+from tests.unit.test_ai_services import StubAIService
+
+
+def _wrapped(service) -> MagicMock:
+    """GeminiAIService-like facade over a BaseAIService"""
+    wrapper = MagicMock()
+    wrapper.get_health.side_effect = service.get_health
+    wrapper.get_service_info.return_value = {"service": "Gemini Direct API", "model": "stub", "status": "active"}
+    return wrapper
+
+
+class TestAIServiceRegistry:
+    """Test the single process-wide instance"""
+
+    def test_initialize_builds_once(self):
+        factory = MagicMock(side_effect=lambda: _wrapped(StubAIService("Text")))
+        registry = AIServiceRegistry(factory)
+
+        first = registry.initialize()
+
+        assert registry.get() is first
+        assert registry.initialize() is first
+        factory.assert_called_once()
+
+    def test_health_before_and_after_failed_initialization(self):
+        registry = AIServiceRegistry(MagicMock(side_effect=AIConfigurationError("missing key")))
+
+        assert registry.health()["message"] == "AI service not initialized"
+        with pytest.raises(AIConfigurationError):
+            registry.initialize()
+
+        health = registry.health()
+        assert health["status"] == "error"
+        assert "missing key" in health["message"]
+
+    def test_health_reports_recent_calls_without_calling_the_model(self):
+        service = StubAIService("Description")
+        registry = AIServiceRegistry(lambda: _wrapped(service))
+        registry.initialize()
+        service.generate_product_description(name="iPhone 15", category="Smartphones", brand="Apple")
+        calls = service._model.generate_content.call_count
+
+        health = registry.health()
+
+        assert health["status"] == "healthy"
+        assert health["last_success_at"] is not None
+        assert health["recent_latency_seconds"]["samples"] == 1
+        assert service._model.generate_content.call_count == calls
+
+    def test_open_breaker_is_degraded(self):
+        service = StubAIService()
+        service._retry_policy = RetryPolicy(max_attempts=1)
+        service._breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+        service._model.generate_content.side_effect = google_exceptions.ServiceUnavailable("down")
+        registry = AIServiceRegistry(lambda: _wrapped(service))
+        registry.initialize()
+
+        with pytest.raises(AIGenerationError):
+            service.generate_product_suggestions("Laptops", 3)
+
+        health = registry.health()
+        assert health["status"] == "degraded"
+        assert health["circuit_breaker"]["state"] == "open"
+        assert health["last_failure_at"] is not None
@@ -0,0 +1,146 @@
+"""
+Unit tests for retries and the circuit breaker
+"""
+import time
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from google.api_core import exceptions as google_exceptions
+from app.application.product_service import ProductService
+from app.infrastructure.ai_services import CircuitBreaker, RetryPolicy, is_retryable_error
+from app.infrastructure.exceptions import AICircuitOpenError, AIConcurrencyLimitError, AIGenerationError
+from tests.unit.test_ai_services import StubAIService
+
+
+def _resilient_service(**breaker_options) -> StubAIService:
+    service = StubAIService("Recovered")
+    service._retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001)
+    service._breaker = CircuitBreaker(**breaker_options) if breaker_options else None
+    return service
+
+
+class TestRetries:
+    """Test jittered exponential backoff"""
+
+    def test_retryable_errors(self):
+        """429/5xx and timeouts are retryable, client errors are not"""
+        assert is_retryable_error(google_exceptions.ResourceExhausted("quota"))
+        assert is_retryable_error(google_exceptions.ServiceUnavailable("down"))
+        assert is_retryable_error(TimeoutError())
+        assert not is_retryable_error(google_exceptions.InvalidArgument("bad prompt"))
+        assert not is_retryable_error(AIGenerationError("Empty response", "Stub"))
+
+    def test_backoff_is_bounded(self):
+        """Delays never exceed max_delay"""
+        policy = RetryPolicy(base_delay=1, max_delay=2)
+        assert all(0 <= policy.delay(attempt) <= 2 for attempt in range(10))
+
+    def test_transient_error_is_retried(self):
+        """A 503 followed by success returns the successful response"""
+        service = _resilient_service()
+        service._model.generate_content.side_effect = [
+            google_exceptions.ServiceUnavailable("down"),
+            MagicMock(text="Recovered")
+        ]
+
+        assert service.generate_product_suggestions("Laptops", 3) == "Recovered"
+        assert service._model.generate_content.call_count == 2
+
+    def test_non_retryable_error_fails_fast(self):
+        """Invalid requests are not retried"""
+        service = _resilient_service()
+        service._model.generate_content.side_effect = google_exceptions.InvalidArgument("bad")
+
+        with pytest.raises(AIGenerationError):
+            service.generate_product_suggestions("Laptops", 3)
+        assert service._model.generate_content.call_count == 1
+
+
+class TestCircuitBreaker:
+    """Test closed / open / half-open transitions"""
+
+    def test_opens_after_threshold_and_recovers(self):
+        """The breaker opens, moves to half-open after the timeout and closes on success"""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+        time.sleep(0.06)
+        assert breaker.allow_request()
+        assert not breaker.allow_request()  # only one half-open probe
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        """A failed probe opens the breaker again"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_empty_probe_does_not_close(self):
+        """A half-open probe answered with an empty response leaves the breaker half-open"""
+        service = _resilient_service(failure_threshold=1, recovery_timeout=0.01)
+        service._breaker.record_failure()
+        time.sleep(0.02)
+        service._model.generate_content.return_value = MagicMock(text="")
+
+        with pytest.raises(AIGenerationError):
+            service.generate_product_suggestions("Laptops", 3)
+
+        assert service._breaker.state == CircuitBreaker.HALF_OPEN
+        assert service._breaker.get_stats()["consecutive_failures"] == 1
+        assert service._breaker.allow_request()
+
+    def test_open_breaker_short_circuits_calls(self):
+        """With the breaker open the model is not called"""
+        service = _resilient_service(failure_threshold=1, recovery_timeout=60)
+        service._model.generate_content.side_effect = google_exceptions.ServiceUnavailable("down")
+
+        with pytest.raises(AIGenerationError):
+            service.generate_product_suggestions("Laptops", 3)
+        calls = service._model.generate_content.call_count
+
+        with pytest.raises(AIGenerationError) as exc_info:
+            service.generate_product_suggestions("Phones", 3)
+
+        assert isinstance(exc_info.value.original_error, AICircuitOpenError)
+        assert service._model.generate_content.call_count == calls
+        assert not service.is_available()
+
+    @pytest.mark.asyncio
+    async def test_stream_rejected_before_the_model_releases_the_probe(self):
+        """A half-open probe taken by a stream that the limiter rejects does not wedge the breaker"""
+        service = _resilient_service(failure_threshold=1, recovery_timeout=0.01)
+        service._breaker.record_failure()
+        time.sleep(0.02)
+        service._limiter = MagicMock()
+        service._limiter.acquire_async = AsyncMock(side_effect=AIConcurrencyLimitError("Too many calls", "Stub"))
+
+        with pytest.raises(AIConcurrencyLimitError):
+            async for _ in service.stream_product_suggestions_async("Laptops", 3):
+                pass
+
+        assert service._breaker.allow_request()
+
+    def test_product_service_falls_back_instantly_when_open(self):
+        """ProductService skips the AI call while the breaker is open"""
+        ai_service = MagicMock()
+        ai_service.is_available.return_value = False
+        repo = MagicMock()
+        repo.find_by_name.return_value = None
+        repo.save.side_effect = lambda product: product
+
+        product = ProductService(repo, ai_service).create_product(
+            name="Widget", price=Decimal("5.00"), category="Tools", brand="Acme"
+        )
+
+        assert product.description == "Acme Widget - Tools"
+        ai_service.generate_product_description.assert_not_called()
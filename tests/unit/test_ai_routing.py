@@ -0,0 +1,153 @@
+"""
+Unit tests for latency-tiered model routing
+"""
+import pytest
+from google.generativeai.types import GenerationConfig
+from types import SimpleNamespace
+from app.infrastructure.ai_cache import AIResponseCache
+from app.infrastructure.ai_routing import ModelRoutingTable, ModelTier
+from app.infrastructure.ai_services import GeminiDirectService, RetryPolicy
+from app.infrastructure.fake_gemini import FakeGeminiConfig, FakeGenerativeModel
+
+SUGGESTIONS = "\n".join(f"{i}. Producto {i} - Marca - Descripción" for i in range(1, 4))
+
+
+class ScriptedModel:
+    """Model returning a fixed answer and recording its calls"""
+
+    def __init__(self, model_name: str, text: str):
+        self.model_name = model_name
+        self.text = text
+        self.calls = 0
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(text=self.text, usage_metadata=None)
+
+    async def generate_content_async(self, prompt, generation_config=None, **kwargs):
+        return self.generate_content(prompt, generation_config)
+
+
+def _table() -> ModelRoutingTable:
+    return ModelRoutingTable(
+        tiers=[
+            ModelTier("light", "models/light", latency_slo_seconds=1.0, max_output_tokens=100, fallback="standard"),
+            ModelTier("standard", "models/standard", latency_slo_seconds=5.0)
+        ],
+        operations={"product_suggestions": "light", "improve_description": "light"},
+        default_tier="standard"
+    )
+
+
+def _service(models: dict, cache=None) -> GeminiDirectService:
+    return GeminiDirectService(
+        api_key="",
+        model=models["standard"],
+        model_name="models/standard",
+        cache=cache,
+        retry_policy=RetryPolicy(max_attempts=1),
+        routing=_table(),
+        model_factory=lambda name: models[name.split("/")[-1]]
+    )
+
+
+class TestModelRoutingTable:
+    """Test the routing table itself"""
+
+    def test_unknown_operation_uses_default_tier(self):
+        table = _table()
+
+        assert table.tier_for("product_suggestions").name == "light"
+        assert table.tier_for("product_description").name == "standard"
+
+    def test_config_for_caps_output_tokens(self):
+        table = _table()
+        light = table.tier_for("product_suggestions")
+
+        assert table.config_for(light, GenerationConfig(max_output_tokens=640)).max_output_tokens == 100
+        assert table.config_for(light, GenerationConfig(max_output_tokens=50)).max_output_tokens == 50
+
+    def test_invalid_tables_are_rejected(self):
+        with pytest.raises(ValueError):
+            ModelRoutingTable([ModelTier("a", "m", 1.0)], {"op": "missing"}, "a")
+        with pytest.raises(ValueError):
+            ModelRoutingTable(
+                [ModelTier("a", "m", 1.0, fallback="b"), ModelTier("b", "m", 1.0, fallback="a")], {}, "a"
+            )
+
+    def test_slo_breaches_are_counted(self):
+        table = _table()
+
+        table.record_latency("light", 0.5, True)
+        table.record_latency("light", 2.0, True)
+
+        light = table.get_stats()["tiers"]["light"]
+        assert light["calls"] == 2
+        assert light["slo_breaches"] == 1
+
+
+class TestRoutedGeneration:
+    """Test GeminiDirectService with a routing table"""
+
+    def test_light_operations_use_light_model(self):
+        models = {"light": ScriptedModel("models/light", SUGGESTIONS), "standard": ScriptedModel("models/standard", "x")}
+        service = _service(models)
+
+        result = service.generate_product_suggestions("Laptops", 3)
+
+        assert result == SUGGESTIONS
+        assert (models["light"].calls, models["standard"].calls) == (1, 0)
+        assert service.get_stats()["routing"]["tiers"]["light"]["calls"] == 1
+
+    def test_default_operations_use_standard_model(self):
+        models = {"light": ScriptedModel("models/light", "x"), "standard": ScriptedModel("models/standard", "Texto")}
+        service = _service(models)
+
+        service.generate_product_description("Laptop", "Laptops", "Acme")
+
+        assert (models["light"].calls, models["standard"].calls) == (0, 1)
+
+    def test_invalid_answer_falls_back_and_is_not_cached(self):
+        """Too few suggestion lines from the light tier are retried on the standard tier"""
+        models = {
+            "light": ScriptedModel("models/light", "1. Solo uno"),
+            "standard": ScriptedModel("models/standard", SUGGESTIONS)
+        }
+        service = _service(models, cache=AIResponseCache(max_entries=10, ttl_seconds=60))
+
+        assert service.generate_product_suggestions("Laptops", 3) == SUGGESTIONS
+        assert service.generate_product_suggestions("Laptops", 3) == SUGGESTIONS
+
+        assert models["light"].calls == 2  # The rejected answer was never cached
+        assert models["standard"].calls == 1
+        routing = service.get_stats()["routing"]["tiers"]
+        assert routing["light"]["fallbacks"] == 2
+        assert routing["light"]["errors"] == 2
+        assert service.get_stats()["operations"]["product_suggestions"]["outcomes"]["rejected"] == 2
+
+    @pytest.mark.asyncio
+    async def test_async_empty_answer_falls_back(self):
+        models = {"light": ScriptedModel("models/light", ""), "standard": ScriptedModel("models/standard", "Mejorada")}
+        service = _service(models)
+
+        result = await service.improve_product_description_async("Vieja descripción")
+
+        assert result == "Mejorada"
+        assert models["standard"].calls == 1
+
+    def test_fake_model_tiers(self):
+        """A truncated light answer (fewer items than asked) is served by the standard tier"""
+        fake = lambda name: FakeGenerativeModel(FakeGeminiConfig(latency_ms=1, latency_sigma=0, seed=1), name)
+        service = GeminiDirectService(
+            api_key="",
+            model=fake("models/standard"),
+            model_name="models/standard",
+            retry_policy=RetryPolicy(max_attempts=1),
+            routing=_table(),
+            model_factory=fake
+        )
+
+        result = service.generate_product_suggestions("Laptops", 10)
+
+        assert len(result.splitlines()) == 10
+        assert service.get_stats()["routing"]["tiers"]["light"]["fallbacks"] == 1
@@ -0,0 +1,107 @@
+"""
+Unit tests for the priority scheduler of AI calls
+"""
+import asyncio
+import pytest
+from types import SimpleNamespace
+from app.infrastructure.ai_scheduler import (
+    BACKGROUND, BATCH, INTERACTIVE, PriorityScheduler, ai_priority, get_current_priority
+)
+from app.infrastructure.ai_services import GeminiDirectService
+from app.infrastructure.exceptions import AIConcurrencyLimitError
+
+
+class EchoModel:
+    model_name = "models/echo"
+
+    def generate_content(self, prompt, generation_config=None, **kwargs):
+        return SimpleNamespace(text="Texto", usage_metadata=None)
+
+    async def generate_content_async(self, prompt, generation_config=None, **kwargs):
+        return self.generate_content(prompt)
+
+
+class TestPriorityScheduler:
+    """Test admission, fairness and accounting"""
+
+    def test_reserved_slots_are_kept_for_interactive_calls(self):
+        scheduler = PriorityScheduler(max_concurrency=2, interactive_reserved=1, max_wait_seconds=0.05)
+
+        scheduler.acquire(BATCH)
+        with pytest.raises(AIConcurrencyLimitError):
+            scheduler.acquire(BACKGROUND)
+        scheduler.acquire(INTERACTIVE)
+
+        stats = scheduler.get_stats()
+        assert stats["in_flight"] == 2
+        assert stats["classes"][BACKGROUND]["rejected"] == 1
+        assert stats["classes"][BACKGROUND]["queue_depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_weighted_fair_dequeueing(self):
+        """With weights 2:1 interactive gets two slots for each batch slot while both are queued"""
+        scheduler = PriorityScheduler(
+            max_concurrency=1,
+            weights={INTERACTIVE: 2.0, BATCH: 1.0, BACKGROUND: 1.0},
+            interactive_reserved=0
+        )
+        await scheduler.acquire_async(INTERACTIVE)
+        granted = []
+
+        async def call(priority):
+            await scheduler.acquire_async(priority)
+            granted.append(priority)
+
+        tasks = [asyncio.create_task(call(p)) for p in [INTERACTIVE] * 4 + [BATCH] * 4]
+        await asyncio.sleep(0)
+        assert scheduler.get_stats()["classes"][BATCH]["queue_depth"] == 4
+
+        held = INTERACTIVE
+        for _ in range(8):
+            scheduler.release(held)
+            await asyncio.sleep(0.01)
+            held = granted[-1]
+        await asyncio.gather(*tasks)
+
+        assert granted == [INTERACTIVE, BATCH, INTERACTIVE, INTERACTIVE, BATCH, INTERACTIVE, BATCH, BATCH]
+        assert scheduler.get_stats()["classes"][BATCH]["wait_seconds"]["count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        scheduler = PriorityScheduler(max_concurrency=1, interactive_reserved=0)
+        scheduler.acquire(INTERACTIVE)
+
+        waiter = asyncio.create_task(scheduler.acquire_async(BATCH))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        scheduler.release(INTERACTIVE)
+
+        stats = scheduler.get_stats()
+        assert stats["in_flight"] == 0
+        assert stats["classes"][BATCH]["queue_depth"] == 0
+
+    def test_priority_context(self):
+        assert get_current_priority() == INTERACTIVE
+        with ai_priority(BACKGROUND):
+            assert get_current_priority() == BACKGROUND
+            with ai_priority(None):
+                assert get_current_priority() == BACKGROUND
+        assert get_current_priority() == INTERACTIVE
+        with pytest.raises(ValueError):
+            with ai_priority("urgent"):
+                pass
+
+    def test_service_calls_take_a_slot_of_their_priority(self):
+        scheduler = PriorityScheduler(max_concurrency=4, interactive_reserved=1)
+        service = GeminiDirectService(api_key="", model=EchoModel(), scheduler=scheduler)
+
+        with ai_priority(BATCH):
+            service.generate_product_suggestions("Laptops", 1)
+        service.improve_product_description("Vieja")
+
+        stats = service.get_stats()["scheduler"]
+        assert stats["in_flight"] == 0
+        assert stats["classes"][BATCH]["dispatched"] == 1
+        assert stats["classes"][INTERACTIVE]["dispatched"] == 1
@@ -0,0 +1,276 @@
+"""
+Unit tests for the AI service base implementation
+"""
+import asyncio
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+from app.infrastructure.ai_scheduler import BACKGROUND, INTERACTIVE, ai_priority
+from app.infrastructure.ai_services import AsyncSingleFlight, BaseAIService, SingleFlight
+from app.infrastructure.exceptions import AIGenerationError, AIValidationError
+
+
+class StubAIService(BaseAIService):
+    """BaseAIService with a mocked Gemini model"""
+
+    def __init__(self, text: str = "Generated text"):
+        super().__init__("Stub")
+        self._model = MagicMock()
+        self._model.generate_content.return_value = MagicMock(text=text)
+        self._model.generate_content_async = AsyncMock(return_value=MagicMock(text=text))
+
+
+class TestBaseAIServiceAsync:
+    """Test the native async generation path"""
+
+    @pytest.mark.asyncio
+    async def test_generate_description_async_uses_async_sdk(self):
+        """Async methods must await generate_content_async, not the blocking call"""
+        service = StubAIService("  Async description  ")
+
+        result = await service.generate_product_description_async(
+            name="iPhone 15",
+            category="Smartphones",
+            brand="Apple"
+        )
+
+        assert result == "Async description"
+        service._model.generate_content_async.assert_awaited_once()
+        service._model.generate_content.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_generate_suggestions_async(self):
+        """Test async suggestions generation"""
+        service = StubAIService("1. Product - Brand - Desc")
+
+        result = await service.generate_product_suggestions_async("Laptops", 3)
+
+        assert result == "1. Product - Brand - Desc"
+
+    @pytest.mark.asyncio
+    async def test_async_validation_error(self):
+        """Validation errors are raised before calling the model"""
+        service = StubAIService()
+
+        with pytest.raises(AIValidationError):
+            await service.improve_product_description_async("   ")
+
+        service._model.generate_content_async.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_generation_error_is_wrapped(self):
+        """SDK errors surface as AIGenerationError"""
+        service = StubAIService()
+        service._model.generate_content_async.side_effect = RuntimeError("boom")
+
+        with pytest.raises(AIGenerationError):
+            await service.improve_product_description_async("Basic description")
+
+
+class TestSingleFlight:
+    """Test coalescing of identical concurrent generations"""
+
+    def test_concurrent_threads_share_one_call(self):
+        """Concurrent identical prompts trigger a single model call"""
+        service = StubAIService()
+        release = threading.Event()
+
+        def slow_generate(*args, **kwargs):
+            release.wait(timeout=2)
+            return MagicMock(text="Shared suggestions")
+
+        service._model.generate_content.side_effect = slow_generate
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [
+                executor.submit(service.generate_product_suggestions, "Laptops", 3)
+                for _ in range(5)
+            ]
+            time.sleep(0.1)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert results == ["Shared suggestions"] * 5
+        assert service._model.generate_content.call_count == 1
+        stats = service.get_stats()["single_flight"]["sync"]
+        assert stats["collapsed"] == 4
+        assert stats["executions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_coroutines_share_one_call(self):
+        """Concurrent identical coroutines await a single model call"""
+        service = StubAIService()
+
+        async def slow_generate(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return MagicMock(text="Shared suggestions")
+
+        service._model.generate_content_async = AsyncMock(side_effect=slow_generate)
+
+        results = await asyncio.gather(*[
+            service.generate_product_suggestions_async("Laptops", 3) for _ in range(5)
+        ])
+
+        assert results == ["Shared suggestions"] * 5
+        assert service._model.generate_content_async.await_count == 1
+        assert service.get_stats()["single_flight"]["async"]["collapsed"] == 4
+
+    def test_interactive_call_does_not_join_background_call(self):
+        """A caller never waits on an identical call queued at a lower priority"""
+        service = StubAIService()
+        release = threading.Event()
+
+        def slow_generate(*args, **kwargs):
+            release.wait(timeout=2)
+            return MagicMock(text="Shared suggestions")
+
+        def generate(priority):
+            with ai_priority(priority):
+                return service.generate_product_suggestions("Laptops", 3)
+
+        service._model.generate_content.side_effect = slow_generate
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(generate, BACKGROUND) for _ in range(2)]
+            time.sleep(0.05)
+            futures.append(executor.submit(generate, INTERACTIVE))
+            time.sleep(0.05)
+            release.set()
+            results = [f.result() for f in futures]
+
+        assert results == ["Shared suggestions"] * 3
+        assert service._model.generate_content.call_count == 2
+        assert service.get_stats()["single_flight"]["sync"]["collapsed"] == 1
+
+    def test_errors_are_shared_and_not_cached(self):
+        """Errors are not remembered: the next call for the key runs again"""
+        flight = SingleFlight()
+
+        def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            flight.do("k", failing)
+
+        assert flight.do("k", lambda: "ok") == "ok"
+
+    @pytest.mark.asyncio
+    async def test_async_error_propagates(self):
+        """Async leader errors propagate to the caller"""
+        flight = AsyncSingleFlight()
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await flight.do("k", failing)
+        assert flight.get_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        """A follower still gets the shared result when the first caller is cancelled"""
+        flight = AsyncSingleFlight()
+        calls = 0
+
+        async def slow():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "shared"
+
+        leader = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await asyncio.wait_for(follower, timeout=2) == "shared"
+        assert leader.cancelled()
+        assert calls == 1
+
+
+class TestBatchDescriptions:
+    """Test multi-product generation and per-product parsing"""
+
+    def test_batch_response_is_split_per_product(self):
+        """Each JSON section is routed back to its product"""
+        service = StubAIService(
+            '[{"index": 1, "description": "Second"}, {"index": 0, "description": "First"}]'
+        )
+
+        result = service.generate_product_descriptions([
+            {"name": "A", "category": "C", "brand": "B"},
+            {"name": "D", "category": "C", "brand": "B"}
+        ])
+
+        assert result == ["First", "Second"]
+        assert service._model.generate_content.call_count == 1
+
+    def test_missing_section_is_none(self):
+        """Products without a parseable section come back as None"""
+        service = StubAIService('```json\n[{"index": 0, "description": "Only one"}]\n```')
+
+        result = service.generate_product_descriptions([
+            {"name": "A", "category": "C", "brand": "B"},
+            {"name": "D", "category": "C", "brand": "B"}
+        ])
+
+        assert result == ["Only one", None]
+
+    def test_invalid_json_returns_all_none(self):
+        """A non-JSON response yields None for every product"""
+        service = StubAIService("not json")
+
+        result = service.generate_product_descriptions([{"name": "A", "category": "C", "brand": "B"}])
+
+        assert result == [None]
+
+    def test_empty_batch_is_rejected(self):
+        """An empty batch is a validation error"""
+        with pytest.raises(AIValidationError):
+            StubAIService().generate_product_descriptions([])
+
+
+class _FakeStream:
+    """Async iterator mimicking the SDK's streamed response"""
+
+    def __init__(self, *texts):
+        self._chunks = [MagicMock(text=t) for t in texts]
+
+    def __aiter__(self):
+        return self._aiter()
+
+    async def _aiter(self):
+        for chunk in self._chunks:
+            yield chunk
+
+
+class TestStreaming:
+    """Test streamed generation"""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_chunks_and_caches_full_text(self):
+        """Chunks are relayed as they arrive and the full text is cached"""
+        from app.infrastructure.ai_cache import AIResponseCache
+        service = StubAIService()
+        service._cache = AIResponseCache()
+        service._model.generate_content_async = AsyncMock(return_value=_FakeStream("1. A", " - B", " - C"))
+
+        chunks = [c async for c in service.stream_product_suggestions_async("Laptops", 1)]
+
+        assert chunks == ["1. A", " - B", " - C"]
+        assert service._model.generate_content_async.await_args.kwargs["stream"] is True
+        assert await service.generate_product_suggestions_async("Laptops", 1) == "1. A - B - C"
+        assert service._model.generate_content_async.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_error_is_wrapped(self):
+        """SDK errors during streaming surface as AIGenerationError"""
+        service = StubAIService()
+        service._model.generate_content_async = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(AIGenerationError):
+            async for _ in service.stream_improve_product_description_async("Basic description"):
+                pass
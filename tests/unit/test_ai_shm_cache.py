@@ -0,0 +1,131 @@
+"""
+Unit tests for the shared-memory AI response store
+"""
+import multiprocessing
+import os
+import struct
+import time
+import pytest
+from app.infrastructure.ai_cache import AIResponseCache
+from app.infrastructure.ai_shm_cache import HEADER_SIZE, WAYS, SharedMemoryCacheStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "ai-cache")
+
+
+def _write_from_other_process(path: str) -> None:
+    store = SharedMemoryCacheStore(path, slot_count=64, slot_size=256)
+    store.set("key", "desde otro worker", time.time() + 60)
+    store.close()
+
+
+class TestSharedMemoryCacheStore:
+    """Test slots, eviction and sharing between processes"""
+
+    def test_set_and_get(self, path):
+        store = SharedMemoryCacheStore(path, slot_count=64, slot_size=256)
+        expires_at = time.time() + 60
+
+        store.set("key", "descripción", expires_at)
+
+        assert store.get("key") == ("descripción", expires_at)
+        assert store.get("missing") is None
+        assert store.get_stats()["used_slots"] == 1
+
+    def test_entries_are_shared_between_processes(self, path):
+        store = SharedMemoryCacheStore(path, slot_count=64, slot_size=256)
+
+        worker = multiprocessing.get_context("fork").Process(target=_write_from_other_process, args=(path,))
+        worker.start()
+        worker.join(10)
+
+        assert worker.exitcode == 0
+        assert store.get("key")[0] == "desde otro worker"
+
+    def test_least_recently_used_slot_is_evicted(self, path):
+        """With a single set, the slot not read for the longest time is replaced"""
+        store = SharedMemoryCacheStore(path, slot_count=WAYS, slot_size=256)
+        expires_at = time.time() + 60
+        for i in range(WAYS):
+            store.set(f"key-{i}", f"value-{i}", expires_at)
+        for i in range(1, WAYS):
+            store.get(f"key-{i}")
+
+        store.set("new", "value", expires_at)
+
+        assert store.get("key-0") is None
+        assert store.get("key-1") is not None
+        assert store.get("new") is not None
+        assert store.get_stats()["evictions"] == 1
+
+    def test_expired_slots_are_reused_first(self, path):
+        store = SharedMemoryCacheStore(path, slot_count=WAYS, slot_size=256)
+        for i in range(WAYS):
+            store.set(f"key-{i}", "value", time.time() + (-1 if i == 3 else 60))
+
+        store.set("new", "value", time.time() + 60)
+
+        assert store.get_stats()["evictions"] == 0
+        assert store.get("key-3") is None
+
+    def test_values_larger_than_a_slot_are_skipped(self, path):
+        store = SharedMemoryCacheStore(path, slot_count=64, slot_size=128)
+
+        store.set("key", "x" * 100, time.time() + 60)
+
+        assert store.get("key") is None
+        assert store.get_stats()["too_large"] == 1
+
+    def test_slot_being_written_is_not_read(self, path):
+        """An odd sequence number (writer in progress) makes the reader give up"""
+        store = SharedMemoryCacheStore(path, slot_count=WAYS, slot_size=256)
+        store.set("key", "value", time.time() + 60)
+        for way in range(WAYS):
+            offset = HEADER_SIZE + way * 256
+            seq = struct.unpack_from("<I", store._mm, offset)[0]
+            if seq:
+                struct.pack_into("<I", store._mm, offset, seq | 1)
+
+        assert store.get("key") is None
+        assert store.get_stats()["read_conflicts"] == 1
+
+    def test_other_geometry_uses_its_own_segment(self, path):
+        """A worker with other settings never resizes the segment the others have mapped"""
+        first = SharedMemoryCacheStore(path, slot_count=64, slot_size=256)
+        first.set("key", "value", time.time() + 60)
+
+        second = SharedMemoryCacheStore(path, slot_count=128, slot_size=256)
+
+        assert second.path != first.path
+        assert second.get("key") is None
+        assert first.get("key")[0] == "value"
+
+    def test_segment_with_another_layout_is_not_attached(self, path):
+        store = SharedMemoryCacheStore(path, slot_count=64, slot_size=256)
+        store.set("key", "value", time.time() + 60)
+        with open(store.path, "r+b") as f:
+            f.write(b"OTHERFMT")
+
+        with pytest.raises(ValueError):
+            SharedMemoryCacheStore(path, slot_count=64, slot_size=256)
+        assert os.path.getsize(store.path) == store._size
+
+    def test_clear(self, path):
+        store = SharedMemoryCacheStore(path, slot_count=64, slot_size=256)
+        store.set("key", "value", time.time() + 60)
+
+        store.clear()
+
+        assert store.get("key") is None
+        assert store.get_stats()["used_slots"] == 0
+
+    def test_response_cache_reads_other_workers_entries(self, path):
+        first = AIResponseCache(store=SharedMemoryCacheStore(path, slot_count=64, slot_size=256))
+        second = AIResponseCache(store=SharedMemoryCacheStore(path, slot_count=64, slot_size=256))
+
+        first.set("key", "generado una vez")
+
+        assert second.get("key") == "generado una vez"
+        assert second.get_stats()["store_hits"] == 1
@@ -0,0 +1,86 @@
+"""
+Unit tests for speculative description pre-generation
+"""
+from unittest.mock import MagicMock
+from app.infrastructure.ai_cache import AIResponseCache
+from app.infrastructure.ai_services import GeminiDirectService
+from app.infrastructure.ai_speculation import SpeculativeDescriptionGenerator, parse_suggested_products
+from app.infrastructure.fake_gemini import FakeGeminiConfig, FakeGenerativeModel
+
+
+def _service() -> GeminiDirectService:
+    return GeminiDirectService(
+        api_key="",
+        cache=AIResponseCache(max_entries=100, ttl_seconds=60),
+        model=FakeGenerativeModel(FakeGeminiConfig(latency_ms=1, latency_sigma=0, seed=1))
+    )
+
+
+class TestParseSuggestedProducts:
+    """Test extraction of (name, brand) from suggestion lines"""
+
+    def test_numbered_lines_are_parsed(self):
+        text = (
+            "Aquí tienes algunas ideas:\n"
+            "1. ThinkPad X1 - Lenovo - Ultraligero\n"
+            "2) **MacBook Air** - **Apple** - Portátil fino\n"
+            "3. Sin marca\n"
+        )
+
+        assert parse_suggested_products(text) == [("ThinkPad X1", "Lenovo"), ("MacBook Air", "Apple")]
+
+
+class TestSpeculativeDescriptionGenerator:
+    """Test background generation into the response cache"""
+
+    def test_create_after_suggestions_is_served_from_cache(self):
+        service = _service()
+        suggestions = service.generate_product_suggestions("Laptops", 3)
+        speculator = SpeculativeDescriptionGenerator(service)
+
+        assert speculator.submit("Laptops", suggestions) == 3
+        speculator.shutdown()
+
+        name, brand = parse_suggested_products(suggestions)[1]
+        calls = service._model.calls
+        description = service.generate_product_description(name, "Laptops", brand)
+
+        assert description
+        assert service._model.calls == calls
+        assert speculator.get_stats()["generated"] == 3
+        assert speculator.get_stats()["pending"] == 0
+
+    def test_cached_products_are_not_generated_again(self):
+        service = _service()
+        suggestions = service.generate_product_suggestions("Laptops", 2)
+        speculator = SpeculativeDescriptionGenerator(service)
+        speculator.submit("Laptops", suggestions)
+        speculator.shutdown()
+
+        calls = service._model.calls
+        misses = service._cache.get_stats()["misses"]
+
+        again = SpeculativeDescriptionGenerator(service)
+        again.submit("Laptops", suggestions)
+        again.shutdown()
+
+        assert again.get_stats()["already_cached"] == 2
+        assert again.get_stats()["generated"] == 0
+        assert service._model.calls == calls
+        assert service._cache.get_stats()["misses"] == misses
+
+    def test_nothing_is_scheduled_while_unavailable(self):
+        ai_service = MagicMock()
+        ai_service.is_available.return_value = False
+        speculator = SpeculativeDescriptionGenerator(ai_service)
+
+        assert speculator.submit("Laptops", "1. A - B - C") == 0
+        ai_service.generate_product_descriptions.assert_not_called()
+
+    def test_excess_items_are_dropped(self):
+        ai_service = MagicMock()
+        speculator = SpeculativeDescriptionGenerator(ai_service, max_pending=1)
+        speculator._executor.submit = MagicMock()
+
+        assert speculator.submit("Laptops", "1. A - B - C\n2. D - E - F") == 1
+        assert speculator.get_stats()["dropped"] == 1
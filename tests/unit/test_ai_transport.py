@@ -0,0 +1,134 @@
+"""
+Unit tests for the Gemini transport configuration and connection warm-up
+"""
+from unittest.mock import MagicMock
+import pytest
+from app.infrastructure.ai_services import GeminiDirectService
+from app.infrastructure.ai_transport import TransportConfig, _TimeoutAdapter, build_generative_client
+from app.infrastructure.exceptions import AIConfigurationError
+from app.infrastructure.fake_gemini import FakeGeminiConfig, FakeGenerativeModel
+from app.infrastructure.transport_benchmark import run_benchmark
+
+
+def _fake_model(**kwargs) -> FakeGenerativeModel:
+    return FakeGenerativeModel(FakeGeminiConfig(latency_ms=1, latency_sigma=0, seed=1, **kwargs))
+
+
+class TestTransportConfig:
+    """Test validation and the options sent with each call"""
+
+    def test_unknown_kind_is_rejected(self):
+        with pytest.raises(ValueError):
+            TransportConfig(kind="http3")
+
+    def test_pool_size_must_be_positive(self):
+        with pytest.raises(ValueError):
+            TransportConfig(pool_size=0)
+
+    def test_read_timeout_is_sent_as_request_option(self):
+        assert TransportConfig(read_timeout_seconds=12).request_options() == {"timeout": 12}
+        assert TransportConfig(read_timeout_seconds=None).request_options() == {}
+
+    def test_rest_client_mounts_keepalive_pool_with_connect_timeout(self):
+        client = build_generative_client("key", TransportConfig(kind="rest", pool_size=7, connect_timeout_seconds=3))
+
+        adapter = client._transport._session.get_adapter("https://generativelanguage.googleapis.com")
+
+        assert isinstance(adapter, _TimeoutAdapter)
+        assert adapter.connect_timeout == 3
+        assert adapter._pool_maxsize == 7
+
+
+class TestConnectionReuse:
+    """Test the fake model's keep-alive pool and the service warm-up"""
+
+    def test_idle_connections_are_reused(self):
+        model = _fake_model(connect_latency_ms=0)
+
+        for _ in range(3):
+            model.generate_content("hola")
+
+        assert model.connections_opened == 1
+
+    def test_pool_size_zero_opens_a_connection_per_call(self):
+        model = _fake_model(connection_pool_size=0)
+
+        for _ in range(3):
+            model.generate_content("hola")
+
+        assert model.connections_opened == 3
+
+    def test_warm_up_opens_connections_before_the_first_call(self):
+        model = _fake_model(connect_latency_ms=20)
+        service = GeminiDirectService(api_key="", model=model, transport=TransportConfig(kind="rest", pool_size=3))
+
+        results = service.warm_up()
+        service.generate_product_description("Portátil", "Laptops", "Marca")
+
+        assert model.connections_opened == 3
+        assert "seconds" in results["models/gemini-fake"]
+        assert service.get_stats()["transport"]["warmup"] == results
+
+    def test_warm_up_failure_is_reported_not_raised(self):
+        model = MagicMock()
+        model.count_tokens.side_effect = RuntimeError("unreachable")
+        service = GeminiDirectService(api_key="", model=model, transport=TransportConfig())
+
+        results = service.warm_up()
+
+        assert list(results.values()) == [{"error": "unreachable"}]
+
+    def test_read_timeout_is_passed_to_the_model(self):
+        model = MagicMock(wraps=_fake_model())
+        service = GeminiDirectService(api_key="", model=model, transport=TransportConfig(read_timeout_seconds=9))
+
+        service.generate_product_description("Portátil", "Laptops", "Marca")
+
+        assert model.generate_content.call_args.kwargs["request_options"] == {"timeout": 9}
+
+
+class TestTransportBenchmark:
+    """Test that the benchmark shows the overhead saved by reuse"""
+
+    def test_keepalive_saves_the_connect_latency(self):
+        report = run_benchmark(calls=8, concurrency=2, latency_ms=1, connect_latency_ms=20)
+        scenarios = report["scenarios"]
+
+        assert scenarios["no_reuse"]["connections_opened"] == 8
+        assert scenarios["keepalive_warmup"]["connections_opened"] == 0
+        assert scenarios["keepalive_warmup"]["overhead_saved_ms"] > 10
+
+
+class TestUnsupportedSdk:
+    """Test the fallback when the SDK no longer exposes the private client attributes"""
+
+    def test_missing_rest_session_falls_back_to_global_client(self, monkeypatch):
+        import google.generativeai as genai
+        from app.infrastructure import ai_pool
+
+        def unsupported(api_key, config):
+            raise AttributeError("GenerativeServiceRestTransport has no _session")
+
+        configure = MagicMock()
+        monkeypatch.setattr(genai, "configure", configure)
+        monkeypatch.setattr(ai_pool, "build_generative_client", unsupported)
+
+        model = ai_pool.create_gemini_member_model("key", "gemini-2.0-flash", TransportConfig(kind="rest"))
+
+        configure.assert_called_once_with(api_key="key", transport="rest")
+        assert not hasattr(model, "_member_async_client_factory")
+
+    def test_multi_key_pool_refuses_the_global_client(self, monkeypatch):
+        import google.generativeai as genai
+        from app.infrastructure import ai_pool
+
+        def unsupported(api_key, config):
+            raise AttributeError("GenerativeServiceRestTransport has no _session")
+
+        configure = MagicMock()
+        monkeypatch.setattr(genai, "configure", configure)
+        monkeypatch.setattr(ai_pool, "build_generative_client", unsupported)
+
+        with pytest.raises(AIConfigurationError):
+            ai_pool.build_gemini_pool(["key-1", "key-2"], ["gemini-2.0-flash"], transport=TransportConfig(kind="rest"))
+        configure.assert_not_called()
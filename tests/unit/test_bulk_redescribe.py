@@ -0,0 +1,102 @@
+"""
+Unit tests for the bulk re-description job
+"""
+import json
+import pytest
+from decimal import Decimal
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.domain.entities import Product
+from app.infrastructure.database import ProductRepository
+from app.infrastructure.exceptions import AIGenerationError
+from app.workers.bulk_redescribe import BulkRedescriptionJob
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    # File database: the job's threads each use their own connection
+    engine = create_engine(f"sqlite:///{tmp_path / 'products.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    repo = ProductRepository(factory())
+    for i in range(1, 8):
+        repo.save(Product(
+            name=f"Laptop {i}", price=Decimal("1"), category="Laptops", brand="X", description=f"Basic {i}"
+        ))
+    repo.save(Product(name="Phone", price=Decimal("1"), category="Phones", brand="X", description="Basic"))
+    yield factory
+    engine.dispose()
+
+
+def _ai_service(fail_on: str = None) -> MagicMock:
+    def improve(description):
+        if description == fail_on:
+            raise AIGenerationError("quota", "Stub")
+        return f"Improved {description}"
+
+    ai_service = MagicMock()
+    ai_service.improve_product_description.side_effect = improve
+    return ai_service
+
+
+class TestProductPaging:
+    """Test keyset paging used by bulk jobs"""
+
+    def test_get_page_after_id(self, session_factory):
+        repo = ProductRepository(session_factory())
+
+        first = repo.get_page(0, 3, "Laptops")
+        second = repo.get_page(first[-1].id, 10, "Laptops")
+
+        assert [p.name for p in first] == ["Laptop 1", "Laptop 2", "Laptop 3"]
+        assert len(second) == 4
+        assert repo.count_active("Laptops") == 7
+        assert repo.count_active() == 8
+
+
+class TestBulkRedescriptionJob:
+    """Test chunking, failure reporting and resume"""
+
+    def test_improves_category_and_reports_failures(self, session_factory, tmp_path):
+        job = BulkRedescriptionJob(
+            session_factory, _ai_service(fail_on="Basic 3"), category="Laptops",
+            chunk_size=3, concurrency=2, checkpoint_path=str(tmp_path / "checkpoint.json")
+        )
+
+        report = job.run()
+
+        assert report["completed"]
+        assert (report["processed"], report["succeeded"], report["failed"]) == (7, 6, 1)
+        assert report["failures"][0]["name"] == "Laptop 3"
+        products = ProductRepository(session_factory()).get_all_active()
+        assert sum(p.description.startswith("Improved") for p in products) == 6
+
+    def test_resume_continues_from_checkpoint(self, session_factory, tmp_path):
+        """A stopped run writes its checkpoint; a new job with it skips finished chunks"""
+        checkpoint = str(tmp_path / "checkpoint.json")
+        ai_service = _ai_service()
+        job = BulkRedescriptionJob(session_factory, ai_service, category="Laptops", chunk_size=3, checkpoint_path=checkpoint)
+        ai_service.improve_product_description.side_effect = lambda d: job.stop() or f"Improved {d}"
+
+        stopped = job.run()
+
+        assert not stopped["completed"]
+        assert json.load(open(checkpoint))["processed"] == 3
+
+        resumed_ai = _ai_service()
+        report = BulkRedescriptionJob(
+            session_factory, resumed_ai, category="Laptops", chunk_size=3, checkpoint_path=checkpoint
+        ).run()
+
+        assert report["completed"]
+        assert report["processed"] == 7
+        assert resumed_ai.improve_product_description.call_count == 4
+
+    def test_checkpoint_of_other_category_is_rejected(self, session_factory, tmp_path):
+        checkpoint = tmp_path / "checkpoint.json"
+        checkpoint.write_text(json.dumps({"category": "Phones"}))
+
+        with pytest.raises(ValueError):
+            BulkRedescriptionJob(session_factory, _ai_service(), category="Laptops", checkpoint_path=str(checkpoint))
@@ -0,0 +1,208 @@
+"""
+Unit tests for precomputed category suggestions
+"""
+import fcntl
+import hashlib
+import os
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.application.product_service import ProductService
+from app.domain.entities import CategorySuggestions, Product
+from app.infrastructure.database import CategorySuggestionRepository, ProductRepository
+from app.workers.suggestion_refresher import CategorySuggestionRefresher
+
+SUGGESTIONS = "\n".join(f"{i}. Producto {i} - Marca - Descripción" for i in range(1, 11))
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def _service(session_factory, ai_service, revalidator=None) -> ProductService:
+    session = session_factory()
+    return ProductService(
+        ProductRepository(session),
+        ai_service,
+        suggestion_repo=CategorySuggestionRepository(session),
+        suggestion_revalidator=revalidator
+    )
+
+
+class TestCategorySuggestions:
+    """Test the precomputed suggestions entity"""
+
+    def test_truncate_keeps_first_items(self):
+        entry = CategorySuggestions(
+            category="Laptops", suggestions=SUGGESTIONS, count=10, generated_at=datetime.utcnow()
+        )
+
+        truncated = entry.truncate(3)
+
+        assert truncated.splitlines() == [
+            "1. Producto 1 - Marca - Descripción",
+            "2. Producto 2 - Marca - Descripción",
+            "3. Producto 3 - Marca - Descripción"
+        ]
+
+    def test_is_stale(self):
+        entry = CategorySuggestions(
+            category="Laptops", suggestions=SUGGESTIONS, count=10,
+            generated_at=datetime.utcnow() - timedelta(seconds=120)
+        )
+
+        assert entry.is_stale(60)
+        assert not entry.is_stale(600)
+
+
+class TestPrecomputedSuggestions:
+    """Test ProductService reads and the background refresher"""
+
+    def test_miss_generates_max_and_serves_smaller_counts(self, session_factory):
+        """The first read stores the full list; later reads of any count use it"""
+        ai_service = MagicMock()
+        ai_service.generate_product_suggestions.return_value = SUGGESTIONS
+        service = _service(session_factory, ai_service)
+
+        first = service.get_category_suggestions("Laptops", 5)
+        second = service.get_category_suggestions("Laptops", 2)
+
+        assert len(first.splitlines()) == 5
+        assert len(second.splitlines()) == 2
+        ai_service.generate_product_suggestions.assert_called_once_with("Laptops", 10)
+
+    def test_short_answer_is_stored_with_its_item_count(self, session_factory):
+        """An answer with fewer items than asked for only serves counts it can fill"""
+        ai_service = MagicMock()
+        ai_service.generate_product_suggestions.return_value = "\n".join(SUGGESTIONS.splitlines()[:3])
+        service = _service(session_factory, ai_service)
+
+        service.get_category_suggestions("Laptops", 2)
+        stored = CategorySuggestionRepository(session_factory()).find_by_category("Laptops")
+        service.get_category_suggestions("Laptops", 5)
+
+        assert stored.count == 3
+        assert ai_service.generate_product_suggestions.call_count == 2
+
+    def test_failed_save_rolls_back_the_session(self, session_factory):
+        ai_service = MagicMock()
+        ai_service.generate_product_suggestions.return_value = SUGGESTIONS
+        suggestion_repo = MagicMock()
+        suggestion_repo.find_by_category.return_value = None
+        suggestion_repo.save.side_effect = RuntimeError("database is locked")
+        service = ProductService(ProductRepository(session_factory()), ai_service, suggestion_repo=suggestion_repo)
+
+        result = service.get_category_suggestions("Laptops", 3)
+
+        assert len(result.splitlines()) == 3
+        suggestion_repo.session.rollback.assert_called_once()
+
+    def test_long_category_is_not_stored(self, session_factory):
+        ai_service = MagicMock()
+        ai_service.generate_product_suggestions.return_value = SUGGESTIONS
+        service = _service(session_factory, ai_service)
+
+        service.get_category_suggestions("x" * 150, 3)
+
+        ai_service.generate_product_suggestions.assert_called_once_with("x" * 150, 3)
+
+    @pytest.mark.asyncio
+    async def test_async_read_is_served_from_storage(self, session_factory):
+        ai_service = MagicMock()
+        ai_service.generate_product_suggestions_async = AsyncMock(return_value=SUGGESTIONS)
+        service = _service(session_factory, ai_service)
+
+        await service.get_category_suggestions_async("Laptops", 4)
+        result = await service.get_category_suggestions_async("Laptops", 10)
+
+        assert len(result.splitlines()) == 10
+        ai_service.generate_product_suggestions_async.assert_awaited_once()
+
+    def test_stale_entry_is_served_and_revalidated(self, session_factory):
+        """Stale suggestions are returned immediately and handed to the revalidator"""
+        CategorySuggestionRepository(session_factory()).save(CategorySuggestions(
+            category="Laptops", suggestions=SUGGESTIONS, count=10,
+            generated_at=datetime.utcnow() - timedelta(days=2)
+        ))
+        ai_service = MagicMock()
+        revalidator = MagicMock()
+        service = _service(session_factory, ai_service, revalidator)
+
+        result = service.get_category_suggestions("Laptops", 3)
+
+        assert len(result.splitlines()) == 3
+        ai_service.generate_product_suggestions.assert_not_called()
+        assert revalidator.call_args.args[0].category == "Laptops"
+
+    def test_refresher_fills_known_categories(self, session_factory):
+        """refresh_all precomputes every category that has products"""
+        products = ProductRepository(session_factory())
+        for name, category in (("A", "Laptops"), ("B", "Phones")):
+            products.save(Product(name=name, price=Decimal("1"), category=category, brand="X"))
+        ai_service = MagicMock()
+        ai_service.generate_product_suggestions.return_value = SUGGESTIONS
+        refresher = CategorySuggestionRefresher(session_factory, ai_service)
+
+        assert refresher.refresh_all() == 2
+        assert refresher.refresh_all() == 0
+
+        stored = CategorySuggestionRepository(session_factory()).find_by_category("Phones")
+        assert stored.count == 10
+
+    def test_revalidate_ignores_fresh_entries(self, session_factory):
+        refresher = CategorySuggestionRefresher(session_factory, MagicMock(), max_age_seconds=60)
+
+        refresher.revalidate(CategorySuggestions(
+            category="Laptops", suggestions=SUGGESTIONS, count=10, generated_at=datetime.utcnow()
+        ))
+
+        assert refresher.get_stats()["revalidations"] == 0
+
+    def test_category_locked_by_another_worker_is_skipped(self, session_factory, tmp_path):
+        ai_service = MagicMock()
+        refresher = CategorySuggestionRefresher(session_factory, ai_service, lock_dir=str(tmp_path))
+        name = hashlib.sha1("Laptops".encode("utf-8")).hexdigest()
+
+        with open(os.path.join(tmp_path, f"{name}.lock"), "a") as other_worker:
+            fcntl.flock(other_worker, fcntl.LOCK_EX)
+            assert refresher.refresh("Laptops") is False
+
+        ai_service.generate_product_suggestions.assert_not_called()
+        assert refresher.get_stats()["skipped"] == 1
+
+    def test_category_refreshed_by_another_worker_is_not_regenerated(self, session_factory, tmp_path):
+        """Staleness is checked again once the lock is held"""
+        ai_service = MagicMock()
+        refresher = CategorySuggestionRefresher(session_factory, ai_service, lock_dir=str(tmp_path))
+        CategorySuggestionRepository(session_factory()).save(CategorySuggestions(
+            category="Laptops", suggestions=SUGGESTIONS, count=10, generated_at=datetime.utcnow()
+        ))
+
+        assert refresher.refresh("Laptops") is False
+        ai_service.generate_product_suggestions.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_streamed_suggestions_are_stored(self, session_factory):
+        async def stream(category, count):
+            for line in SUGGESTIONS.splitlines(keepends=True)[:count]:
+                yield line
+
+        ai_service = MagicMock()
+        ai_service.stream_product_suggestions_async = stream
+        service = _service(session_factory, ai_service)
+
+        streamed = "".join([chunk async for chunk in service.stream_category_suggestions_async("Laptops", 4)])
+        stored = CategorySuggestionRepository(session_factory()).find_by_category("Laptops")
+
+        assert stored.count == 4
+        assert stored.suggestions == streamed.strip()
+        assert len(service.get_category_suggestions("Laptops", 3).splitlines()) == 3
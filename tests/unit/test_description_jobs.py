@@ -0,0 +1,159 @@
+"""
+Unit tests for the description job queue and its worker
+"""
+import pytest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.application.product_service import ProductService
+from app.domain.entities import DescriptionJob
+from app.infrastructure.database import DescriptionJobRepository, ProductRepository
+from app.infrastructure.exceptions import AIGenerationError
+from app.models.description_job import DescriptionJob as DescriptionJobModel
+from app.workers.description_worker import DescriptionJobWorker
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def _create_deferred(session_factory, ai_service=None):
+    session = session_factory()
+    service = ProductService(
+        ProductRepository(session),
+        ai_service or MagicMock(),
+        job_repo=DescriptionJobRepository(session)
+    )
+    product, job = service.create_product_deferred(
+        name="iPhone 15", price=Decimal("999.99"), category="Smartphones", brand="Apple"
+    )
+    session.close()
+    return product, job
+
+
+class TestDescriptionJobRepository:
+    """Test claiming, leases and retries"""
+
+    def test_deferred_create_saves_fallback_and_enqueues(self, session_factory):
+        """The product is stored at once with the fallback description and a pending job"""
+        product, job = _create_deferred(session_factory)
+
+        assert product.description == "Apple iPhone 15 - Smartphones"
+        assert job.product_id == product.id
+        assert job.status == DescriptionJob.PENDING
+
+    def test_claimed_job_is_not_claimed_twice(self, session_factory):
+        """A leased job is invisible to other workers"""
+        _create_deferred(session_factory)
+        jobs = DescriptionJobRepository(session_factory())
+
+        claimed = jobs.claim_next(lease_seconds=60)
+
+        assert claimed.status == DescriptionJob.RUNNING
+        assert claimed.attempts == 1
+        assert jobs.claim_next(lease_seconds=60) is None
+
+    def test_expired_lease_is_reclaimed(self, session_factory):
+        """A job whose worker died is picked up again when the lease expires"""
+        _create_deferred(session_factory)
+        session = session_factory()
+        jobs = DescriptionJobRepository(session)
+        claimed = jobs.claim_next(lease_seconds=60)
+
+        db_job = session.get(DescriptionJobModel, claimed.id)
+        db_job.locked_until = datetime.utcnow() - timedelta(seconds=1)
+        session.commit()
+
+        reclaimed = jobs.claim_next(lease_seconds=60)
+        assert reclaimed.id == claimed.id
+        assert reclaimed.attempts == 2
+
+    def test_retry_delay_postpones_the_job(self, session_factory):
+        """A failed attempt with a retry delay is not runnable before it elapses"""
+        _create_deferred(session_factory)
+        jobs = DescriptionJobRepository(session_factory())
+        claimed = jobs.claim_next(lease_seconds=60)
+
+        jobs.mark_failed(claimed.id, "boom", retry_delay=60)
+
+        assert jobs.claim_next(lease_seconds=60) is None
+        assert jobs.find_latest_by_product(claimed.product_id).status == DescriptionJob.PENDING
+
+
+class TestDescriptionJobWorker:
+    """Test the worker writing results back"""
+
+    def test_successful_job_updates_description(self, session_factory):
+        """The generated description replaces the fallback"""
+        product, _ = _create_deferred(session_factory)
+        ai_service = MagicMock()
+        ai_service.generate_product_description.return_value = "AI description"
+        worker = DescriptionJobWorker(session_factory, ai_service)
+
+        assert worker.run_once() is True
+        assert worker.run_once() is False
+
+        session = session_factory()
+        assert ProductRepository(session).find_by_id(product.id).description == "AI description"
+        assert DescriptionJobRepository(session).find_latest_by_product(product.id).status == DescriptionJob.SUCCEEDED
+
+    def test_failed_job_is_retried_then_failed(self, session_factory):
+        """AI errors are retried until max_attempts, leaving the fallback in place"""
+        product, _ = _create_deferred(session_factory)
+        ai_service = MagicMock()
+        ai_service.generate_product_description.side_effect = AIGenerationError("down", "Stub")
+        worker = DescriptionJobWorker(session_factory, ai_service, max_attempts=2, retry_base_delay=0)
+
+        assert worker.run_once() is True
+        assert worker.run_once() is True
+
+        session = session_factory()
+        job = DescriptionJobRepository(session).find_latest_by_product(product.id)
+        assert job.status == DescriptionJob.FAILED
+        assert job.attempts == 2
+        assert ProductRepository(session).find_by_id(product.id).description == "Apple iPhone 15 - Smartphones"
+        assert worker.get_stats()["retried"] == 1
+
+    def test_failed_save_is_rolled_back_and_retried(self, session_factory, monkeypatch):
+        """A database error while storing the description still records the attempt"""
+        product, _ = _create_deferred(session_factory)
+        ai_service = MagicMock()
+        ai_service.generate_product_description.return_value = "AI description"
+
+        def failing_save(self, product):
+            self.session.add(DescriptionJobModel(product_id=None))
+            self.session.commit()
+
+        monkeypatch.setattr(ProductRepository, "save", failing_save)
+        worker = DescriptionJobWorker(session_factory, ai_service, max_attempts=3, retry_base_delay=0)
+
+        assert worker.run_once() is True
+
+        job = DescriptionJobRepository(session_factory()).find_latest_by_product(product.id)
+        assert job.status == DescriptionJob.PENDING
+        assert job.attempts == 1
+        assert "NOT NULL" in job.last_error
+        assert worker.get_stats()["retried"] == 1
+
+    def test_edited_description_is_kept(self, session_factory):
+        """A description edited before the job ran is not overwritten"""
+        product, _ = _create_deferred(session_factory)
+        session = session_factory()
+        repo = ProductRepository(session)
+        edited = repo.find_by_id(product.id)
+        edited.description = "Hand written"
+        repo.save(edited)
+        ai_service = MagicMock()
+
+        DescriptionJobWorker(session_factory, ai_service).run_once()
+
+        ai_service.generate_product_description.assert_not_called()
+        assert ProductRepository(session_factory()).find_by_id(product.id).description == "Hand written"
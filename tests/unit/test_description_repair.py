@@ -0,0 +1,123 @@
+"""
+Unit tests for description sources and the fallback repair worker
+"""
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.application.product_service import ProductService
+from app.domain.entities import Product
+from app.infrastructure.database import ProductRepository
+from app.models.product import Product as ProductModel
+from app.infrastructure.exceptions import AIGenerationError
+from app.workers.description_repair import FallbackDescriptionRepairer
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def _create(session_factory, name: str, description: str, source: str) -> Product:
+    return ProductRepository(session_factory()).save(Product(
+        name=name, price=Decimal("1"), category="C", brand="B",
+        description=description, description_source=source
+    ))
+
+
+def _repairer(session_factory, ai_service, **options) -> FallbackDescriptionRepairer:
+    # min_age_seconds < 0: rows saved during the test already qualify
+    options.setdefault("min_age_seconds", -60)
+    return FallbackDescriptionRepairer(session_factory, ai_service, per_minute=60000, **options)
+
+
+class TestDescriptionSource:
+    """Test how ProductService marks descriptions"""
+
+    def test_sources_of_created_and_updated_products(self, session_factory):
+        ai_service = MagicMock()
+        ai_service.generate_product_description.side_effect = [AIGenerationError("down", "Stub"), "AI text"]
+        service = ProductService(ProductRepository(session_factory()), ai_service)
+
+        fallback = service.create_product(name="A", price=Decimal("1"), category="C", brand="B")
+        generated = service.create_product(name="D", price=Decimal("1"), category="C", brand="B")
+        manual = service.create_product(
+            name="E", price=Decimal("1"), category="C", brand="B", basic_info="Mine", auto_generate_description=False
+        )
+        edited = service.update_product(generated.id, description="Edited")
+
+        assert fallback.description_source == Product.DESCRIPTION_FALLBACK
+        assert manual.description_source == Product.DESCRIPTION_MANUAL
+        assert edited.description_source == Product.DESCRIPTION_MANUAL
+        stored = ProductRepository(session_factory()).find_by_id(fallback.id)
+        assert stored.description_source == Product.DESCRIPTION_FALLBACK
+
+
+class TestFallbackDescriptionRepairer:
+    """Test the rate-limited repair of fallback descriptions"""
+
+    def test_repairs_only_fallback_descriptions(self, session_factory):
+        fallback = _create(session_factory, "A", "B A - C", Product.DESCRIPTION_FALLBACK)
+        with_info = _create(session_factory, "D", "Basic info", Product.DESCRIPTION_FALLBACK)
+        _create(session_factory, "E", "Written by hand", Product.DESCRIPTION_MANUAL)
+        ai_service = MagicMock()
+        ai_service.is_available.return_value = True
+        ai_service.generate_product_description.return_value = "AI text"
+
+        assert _repairer(session_factory, ai_service).run_once() == 2
+
+        repo = ProductRepository(session_factory())
+        assert repo.find_by_id(fallback.id).description_source == Product.DESCRIPTION_AI
+        assert repo.find_by_id(with_info.id).description == "AI text"
+        calls = ai_service.generate_product_description.call_args_list
+        assert [call.kwargs["basic_info"] for call in calls] == [None, "Basic info"]
+
+    def test_waits_while_ai_is_unavailable(self, session_factory):
+        _create(session_factory, "A", "B A - C", Product.DESCRIPTION_FALLBACK)
+        ai_service = MagicMock()
+        ai_service.is_available.return_value = False
+        repairer = _repairer(session_factory, ai_service)
+
+        assert repairer.run_once() == 0
+        ai_service.generate_product_description.assert_not_called()
+        assert repairer.get_stats()["skipped_unhealthy"] == 1
+
+    def test_first_failure_stops_the_pass(self, session_factory):
+        """Still-failing AI is not hammered with the rest of the batch"""
+        for name in ("A", "D", "E"):
+            _create(session_factory, name, f"B {name} - C", Product.DESCRIPTION_FALLBACK)
+        ai_service = MagicMock()
+        ai_service.is_available.return_value = True
+        ai_service.generate_product_description.side_effect = AIGenerationError("down", "Stub")
+
+        assert _repairer(session_factory, ai_service).run_once() == 0
+        assert ai_service.generate_product_description.call_count == 1
+
+    def test_recent_fallbacks_are_left_for_late_generation(self, session_factory):
+        _create(session_factory, "A", "B A - C", Product.DESCRIPTION_FALLBACK)
+        ai_service = MagicMock()
+        ai_service.is_available.return_value = True
+
+        assert _repairer(session_factory, ai_service, min_age_seconds=3600).run_once() == 0
+
+    def test_claimed_rows_are_not_claimed_again(self, session_factory):
+        """Another instance skips rows already claimed (leased until they age again)"""
+        product = _create(session_factory, "A", "B A - C", Product.DESCRIPTION_FALLBACK)
+        session = session_factory()
+        session.execute(
+            update(ProductModel).where(ProductModel.id == product.id).values(updated_at=datetime(2000, 1, 1))
+        )
+        session.commit()
+
+        first = ProductRepository(session_factory()).claim_fallback_descriptions(10, 60)
+        second = ProductRepository(session_factory()).claim_fallback_descriptions(10, 60)
+
+        assert [p.id for p in first] == [product.id]
+        assert second == []
@@ -0,0 +1,107 @@
+"""
+Unit tests for the local Gemini stand-in
+"""
+import json
+import pytest
+from google.api_core import exceptions as google_exceptions
+from app.core.config import Settings, settings
+from app.infrastructure.ai_services import GeminiDirectService, RetryPolicy
+from app.infrastructure.exceptions import AIGenerationError
+from app.infrastructure.external_services import GeminiAIService
+from app.infrastructure.fake_gemini import FakeGeminiConfig, FakeGenerativeModel
+from app.infrastructure.prompts import (
+    format_batch_product_description_prompt,
+    format_product_description_prompt,
+    format_product_suggestions_prompt
+)
+
+
+def _fake(**options) -> FakeGenerativeModel:
+    return FakeGenerativeModel(FakeGeminiConfig(latency_ms=1, latency_sigma=0, seed=7, **options))
+
+
+class TestFakeGenerativeModel:
+    """Test the fake model responses and fault injection"""
+
+    def test_text_is_deterministic_per_prompt(self):
+        """The same prompt always yields the same text and usage metadata"""
+        prompt = format_product_description_prompt("iPhone 15", "Smartphones", "Apple")
+
+        first = _fake().generate_content(prompt)
+        second = _fake().generate_content(prompt)
+
+        assert first.text == second.text
+        assert "iPhone 15" in first.text
+        assert first.usage_metadata.total_token_count == (
+            first.usage_metadata.prompt_token_count + first.usage_metadata.candidates_token_count
+        )
+
+    def test_suggestions_have_requested_lines(self):
+        response = _fake().generate_content(format_product_suggestions_prompt("Laptops", 4))
+
+        assert len(response.text.splitlines()) == 4
+
+    def test_batch_prompt_returns_json_per_product(self):
+        prompt = format_batch_product_description_prompt([
+            {"name": "A", "category": "C", "brand": "B"},
+            {"name": "D", "category": "C", "brand": "B"}
+        ])
+
+        sections = json.loads(_fake().generate_content(prompt).text)
+
+        assert [section["index"] for section in sections] == [0, 1]
+
+    def test_injected_errors(self):
+        """429 and 500 rates raise the SDK's exceptions"""
+        with pytest.raises(google_exceptions.ResourceExhausted):
+            _fake(error_429_rate=1.0).generate_content("prompt")
+        with pytest.raises(google_exceptions.InternalServerError):
+            _fake(error_500_rate=1.0).generate_content("prompt")
+
+    def test_timeout_waits_then_raises(self):
+        with pytest.raises(google_exceptions.DeadlineExceeded):
+            _fake(timeout_rate=1.0, timeout_seconds=0.01).generate_content("prompt")
+
+    @pytest.mark.asyncio
+    async def test_async_stream_reassembles_text(self):
+        model = _fake(stream_chunk_chars=10)
+        prompt = format_product_description_prompt("iPhone 15", "Smartphones", "Apple")
+
+        stream = await model.generate_content_async(prompt, stream=True)
+        chunks = [chunk async for chunk in stream]
+
+        assert len(chunks) > 1
+        assert "".join(chunk.text for chunk in chunks) == model.generate_content(prompt).text
+        assert chunks[-1].usage_metadata is not None
+
+
+class TestGeminiDirectServiceWithFake:
+    """GeminiDirectService code paths running against the fake"""
+
+    def test_service_uses_injected_model(self):
+        service = GeminiDirectService(api_key="", model=_fake())
+
+        description = service.generate_product_description(name="iPhone 15", category="Smartphones", brand="Apple")
+
+        assert "iPhone 15" in description
+        assert service.get_stats()["operations"]["product_description"]["total_output_tokens"] > 0
+
+    def test_fake_backend_needs_no_api_key(self, monkeypatch):
+        monkeypatch.setattr(Settings, "get_google_api_key", lambda self: "")
+        monkeypatch.setattr(settings, "ai_backend", "fake")
+
+        service = GeminiAIService()
+
+        assert service.generate_product_description(name="iPhone 15", category="Smartphones", brand="Apple")
+
+    @pytest.mark.asyncio
+    async def test_errors_surface_through_retries(self):
+        service = GeminiDirectService(
+            api_key="",
+            model=_fake(error_500_rate=1.0),
+            retry_policy=RetryPolicy(max_attempts=2, base_delay=0.001, max_delay=0.001)
+        )
+
+        with pytest.raises(AIGenerationError):
+            await service.generate_product_suggestions_async("Laptops", 3)
+        assert service._model.calls == 2
@@ -0,0 +1,176 @@
+"""
+Unit tests for ProductService batch creation and latency budgets
+"""
+import asyncio
+import threading
+import pytest
+from contextlib import contextmanager
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from app.application.product_service import ProductService
+from app.infrastructure.exceptions import AIGenerationError
+
+
+def _product_data(name: str, **overrides) -> dict:
+    data = {
+        "name": name,
+        "price": Decimal("10.00"),
+        "category": "Electronics",
+        "brand": "TestBrand",
+        "stock_quantity": 1,
+        "basic_info": None,
+        "auto_generate_description": True
+    }
+    data.update(overrides)
+    return data
+
+
+def _service(ai_service: MagicMock) -> ProductService:
+    repo = MagicMock()
+    repo.find_by_name.return_value = None
+    repo.save.side_effect = lambda product: product
+    return ProductService(repo, ai_service)
+
+
+class TestCreateProducts:
+    """Test ProductService.create_products"""
+
+    def test_descriptions_are_generated_in_one_batch(self):
+        """All products share a single batch generation call"""
+        ai_service = MagicMock()
+        ai_service.generate_product_descriptions.return_value = ["Desc A", "Desc B"]
+        service = _service(ai_service)
+
+        created, errors = service.create_products([_product_data("A"), _product_data("B")])
+
+        assert [p.description for p in created] == ["Desc A", "Desc B"]
+        assert {p.description_source for p in created} == {"ai"}
+        assert errors == []
+        ai_service.generate_product_descriptions.assert_called_once()
+        ai_service.generate_product_description.assert_not_called()
+
+    def test_unparsed_section_falls_back_individually(self):
+        """A product whose section failed gets its own generation call"""
+        ai_service = MagicMock()
+        ai_service.generate_product_descriptions.return_value = ["Desc A", None]
+        ai_service.generate_product_description.return_value = "Single B"
+        service = _service(ai_service)
+
+        created, _ = service.create_products([_product_data("A"), _product_data("B")])
+
+        assert [p.description for p in created] == ["Desc A", "Single B"]
+        ai_service.generate_product_description.assert_called_once()
+
+    def test_batch_failure_uses_plain_fallback(self):
+        """If the whole batch fails no per-product AI calls are made"""
+        ai_service = MagicMock()
+        ai_service.generate_product_descriptions.side_effect = AIGenerationError("down", "Stub")
+        service = _service(ai_service)
+
+        created, _ = service.create_products([_product_data("A", basic_info="Basic A")])
+
+        assert created[0].description == "Basic A"
+        assert created[0].description_source == "fallback"
+        ai_service.generate_product_description.assert_not_called()
+
+    def test_duplicates_are_reported_per_item(self):
+        """Duplicate names are reported without aborting the batch"""
+        ai_service = MagicMock()
+        ai_service.generate_product_descriptions.return_value = ["Desc A"]
+        service = _service(ai_service)
+
+        created, errors = service.create_products([_product_data("A"), _product_data("A")])
+
+        assert len(created) == 1
+        assert errors == [{"index": 1, "name": "A", "detail": "Product 'A' already exists"}]
+
+
+class TestLatencyBudget:
+    """Test create_product with a latency budget and background completion"""
+
+    def _service_with_scope(self, ai_service: MagicMock):
+        stored = MagicMock()
+        late_repo = MagicMock()
+        late_repo.find_by_id.return_value = stored
+        applied = threading.Event()
+        late_repo.save.side_effect = lambda product: applied.set()
+
+        @contextmanager
+        def scope():
+            yield late_repo
+
+        service = _service(ai_service)
+        service.product_repo.save.side_effect = lambda product: setattr(product, "id", 7) or product
+        service.repository_scope = scope
+        return service, stored, late_repo, applied
+
+    def test_fast_generation_is_used_directly(self):
+        """Within budget the AI description is saved as usual"""
+        ai_service = MagicMock()
+        ai_service.generate_product_description.return_value = "AI description"
+        service = _service(ai_service)
+
+        product = service.create_product(
+            name="A", price=Decimal("1"), category="C", brand="B", latency_budget=1.0
+        )
+
+        assert product.description == "AI description"
+
+    def test_slow_generation_saves_fallback_and_updates_later(self):
+        """An expired budget returns the fallback and the row is updated when AI finishes"""
+        release = threading.Event()
+        ai_service = MagicMock()
+        ai_service.generate_product_description.side_effect = lambda **kwargs: release.wait(2) and "Late description"
+        service, stored, late_repo, applied = self._service_with_scope(ai_service)
+        stored.description = "B A - C"
+
+        product = service.create_product(
+            name="A", price=Decimal("1"), category="C", brand="B", latency_budget=0.05
+        )
+
+        assert product.description == "B A - C"
+        assert product.description_source == "fallback"
+        release.set()
+        assert applied.wait(2)
+        late_repo.find_by_id.assert_called_once_with(7)
+        assert stored.description == "Late description"
+        assert stored.description_source == "ai"
+
+    def test_edited_description_is_not_overwritten(self):
+        """A description changed after creation is left alone"""
+        release = threading.Event()
+        ai_service = MagicMock()
+        ai_service.generate_product_description.side_effect = lambda **kwargs: release.wait(2) and "Late description"
+        service, stored, late_repo, _ = self._service_with_scope(ai_service)
+        stored.description = "Edited by a user"
+        looked_up = threading.Event()
+        late_repo.find_by_id.side_effect = lambda product_id: looked_up.set() or stored
+
+        service.create_product(
+            name="A", price=Decimal("1"), category="C", brand="B", latency_budget=0.05
+        )
+        release.set()
+
+        assert looked_up.wait(2)
+        late_repo.save.assert_not_called()
+        assert stored.description == "Edited by a user"
+
+    @pytest.mark.asyncio
+    async def test_async_slow_generation_completes_in_background(self):
+        """The async path returns the fallback and applies the description afterwards"""
+        async def slow(**kwargs):
+            await asyncio.sleep(0.1)
+            return "Late description"
+
+        ai_service = MagicMock()
+        ai_service.generate_product_description_async = AsyncMock(side_effect=slow)
+        service, stored, _, applied = self._service_with_scope(ai_service)
+        stored.description = "B A - C"
+
+        product = await service.create_product_async(
+            name="A", price=Decimal("1"), category="C", brand="B", latency_budget=0.01
+        )
+
+        assert product.description == "B A - C"
+        assert await asyncio.to_thread(applied.wait, 2)
+        assert stored.description == "Late description"
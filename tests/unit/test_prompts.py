@@ -6,6 +6,11 @@ from app.infrastructure.prompts import (
     format_product_description_prompt,
     format_product_suggestions_prompt,
     format_improve_description_prompt,
+    format_batch_product_description_prompt,
+    estimate_tokens,
+    trim_to_token_budget,
+    PromptBudget,
+    TRUNCATION_MARK,
     PRODUCT_DESCRIPTION_BASE_PROMPT,
     PRODUCT_SUGGESTIONS_PROMPT,
     IMPROVE_DESCRIPTION_PROMPT
@@ -53,6 +58,20 @@ class TestPromptFormatting:
         assert "iPhone 15" in prompt
         assert "Información adicional:" not in prompt
     
+    def test_batch_product_description_prompt(self):
+        """Test multi-product prompt packs every product with its index"""
+        prompt = format_batch_product_description_prompt([
+            {"name": "iPhone 15", "category": "Smartphones", "brand": "Apple", "basic_info": "A17 Pro chip"},
+            {"name": "Galaxy S24", "category": "Smartphones", "brand": "Samsung"}
+        ])
+        
+        assert "2 productos" in prompt
+        assert "iPhone 15" in prompt
+        assert "Galaxy S24" in prompt
+        assert "A17 Pro chip" in prompt
+        assert '"index": 1' in prompt
+        assert "array JSON" in prompt
+    
     def test_product_suggestions_prompt(self):
         """Test product suggestions prompt formatting"""
         prompt = format_product_suggestions_prompt(
@@ -115,4 +134,66 @@ class TestPromptConstants:
         """Test that prompt constants are not empty"""
         assert len(PRODUCT_DESCRIPTION_BASE_PROMPT.strip()) > 0
         assert len(PRODUCT_SUGGESTIONS_PROMPT.strip()) > 0
-        assert len(IMPROVE_DESCRIPTION_PROMPT.strip()) > 0
\ No newline at end of file
+        assert len(IMPROVE_DESCRIPTION_PROMPT.strip()) > 0
+
+
+class TestTokenBudget:
+    """Test prompt token estimation and input trimming"""
+    
+    def test_estimate_tokens(self):
+        """Test the local token approximation"""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens(None) == 0
+        assert estimate_tokens("a" * 400) == 101
+    
+    def test_short_text_is_untouched(self):
+        """Test that text within budget is returned as is"""
+        assert trim_to_token_budget("Short text", 100) == "Short text"
+        assert trim_to_token_budget("Short text", None) == "Short text"
+    
+    def test_trim_at_sentence_boundary(self):
+        """Test that long text is cut at the last full sentence"""
+        text = "Primera frase completa. " * 40
+        
+        trimmed = trim_to_token_budget(text, 50)
+        
+        assert estimate_tokens(trimmed) <= 50
+        assert trimmed.endswith(".")
+    
+    def test_trim_at_word_boundary(self):
+        """Test that text without sentences is cut between words and marked"""
+        trimmed = trim_to_token_budget("palabra " * 200, 20)
+        
+        assert estimate_tokens(trimmed) <= 20
+        assert trimmed.endswith("palabra" + TRUNCATION_MARK)
+    
+    def test_improve_prompt_does_not_grow(self):
+        """Test that a long generated description is trimmed before being fed back"""
+        budget = PromptBudget(current_description_tokens=100)
+        long_description = "Descripción generada muy detallada. " * 200
+        
+        prompt = format_improve_description_prompt(long_description, budget)
+        
+        assert estimate_tokens(prompt) < estimate_tokens(IMPROVE_DESCRIPTION_PROMPT) + 110
+    
+    def test_basic_info_is_trimmed(self):
+        """Test that basic_info is trimmed in single and batch prompts"""
+        budget = PromptBudget(basic_info_tokens=10)
+        info = "detalle " * 100
+        
+        single = format_product_description_prompt("iPhone 15", "Smartphones", "Apple", info, budget)
+        batch = format_batch_product_description_prompt(
+            [{"name": "iPhone 15", "category": "Smartphones", "brand": "Apple", "basic_info": info}], budget
+        )
+        
+        assert info not in single
+        assert info.strip() not in batch
+    
+    def test_max_output_tokens_per_prompt_type(self):
+        """Test that output limits depend on the prompt type and item count"""
+        budget = PromptBudget()
+        
+        assert budget.max_output_tokens("product_suggestions", 3) < budget.max_output_tokens("product_suggestions", 10)
+        assert budget.max_output_tokens("product_description") == budget.description_output_tokens
+        assert budget.max_output_tokens("improve_description") == budget.improve_output_tokens
+        assert budget.max_output_tokens("product_descriptions_batch", 100) == budget.max_output_tokens_limit